@@ -1,28 +1,154 @@
 """
 Configuration settings for the Insider Test Automation project
+
+Every setting can be overridden without editing this file, from a JSON file
+named by the INSIDER_CONFIG_FILE environment variable and then from
+INSIDER_<SETTING> environment variables (e.g. INSIDER_HEADLESS=false).
+Importing this module has no side effects; output directories are created
+on first use with ensure_dir.
 """
 
+import json
+import os
 from pathlib import Path
 
+ENV_PREFIX = "INSIDER_"
+
+
+def _load_overrides():
+    """Read overrides once, environment variables taking precedence over the file"""
+    overrides = {}
+    config_file = os.environ.get(f"{ENV_PREFIX}CONFIG_FILE")
+    if config_file:
+        with open(config_file, encoding="utf-8") as f:
+            overrides.update(json.load(f))
+    for name, value in os.environ.items():
+        if name.startswith(ENV_PREFIX):
+            overrides[name[len(ENV_PREFIX):]] = value
+    return overrides
+
+
+_OVERRIDES = _load_overrides()
+
+
+def _setting(name, default):
+    """
+    Resolve a setting, converting string overrides to the type of the default
+
+    Args:
+        name (str): Setting name
+        default: Value used when no override is given
+
+    Returns:
+        Resolved value
+    """
+    if name not in _OVERRIDES:
+        return default
+    value = _OVERRIDES[name]
+    if not isinstance(value, str) or isinstance(default, str) or default is None:
+        return Path(value) if isinstance(default, Path) else value
+    if isinstance(default, bool):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    if isinstance(default, Path):
+        return Path(value)
+    return json.loads(value)
+
+
+def ensure_dir(path):
+    """
+    Create a directory if it does not exist yet
+
+    Args:
+        path (Path): Directory to create
+
+    Returns:
+        Path: The same directory
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 # Base URLs
-BASE_URL = "https://useinsider.com"
-CAREERS_URL = f"{BASE_URL}/careers"
-QA_CAREERS_URL = f"{BASE_URL}/careers/quality-assurance"
+BASE_URL = _setting("BASE_URL", "https://useinsider.com")
+CAREERS_URL = _setting("CAREERS_URL", f"{BASE_URL}/careers")
+QA_CAREERS_URL = _setting("QA_CAREERS_URL", f"{BASE_URL}/careers/quality-assurance")
 
 # Browser Configuration
-BROWSER = "chrome"
-HEADLESS = True
-IMPLICIT_WAIT = 10
-PAGE_LOAD_TIMEOUT = 30
+BROWSER = _setting("BROWSER", "chrome")
+DRIVER_BACKEND = _setting("DRIVER_BACKEND", "webdriver")  # webdriver (chromedriver over HTTP) or cdp (DevTools over WebSocket)
+HEADLESS = _setting("HEADLESS", True)
+EMULATION_PROFILE = _setting("EMULATION_PROFILE", "desktop")  # Network/CPU profile from utils/emulation.py
+IMPLICIT_WAIT = _setting("IMPLICIT_WAIT", 10)
+PAGE_LOAD_TIMEOUT = _setting("PAGE_LOAD_TIMEOUT", 30)
+
+# Performance Metrics Configuration
+METRICS_ENABLED = _setting("METRICS_ENABLED", True)
+METRICS_BUFFER_SIZE = _setting("METRICS_BUFFER_SIZE", 500)  # Samples kept per driver, oldest are dropped first
+
+# Process Reaper Configuration
+REAPER_QUIT_TIMEOUT = _setting("REAPER_QUIT_TIMEOUT", 60)  # Seconds to wait for background quits at session end
+REAPER_KILL_GRACE = _setting("REAPER_KILL_GRACE", 5)  # Seconds between SIGTERM and SIGKILL for leftover processes
+
+# Link Checker Configuration
+LINK_CHECK_CONCURRENCY = _setting("LINK_CHECK_CONCURRENCY", 10)
+LINK_CHECK_TIMEOUT = _setting("LINK_CHECK_TIMEOUT", 15)
+LINK_CHECK_MAX_REDIRECTS = _setting("LINK_CHECK_MAX_REDIRECTS", 10)
+LINK_CHECK_BROWSER_SAMPLE = _setting("LINK_CHECK_BROWSER_SAMPLE", 1)  # Number of checked links also opened in the browser
+
+# Static DOM Check Configuration
+STATIC_CHECK_CONCURRENCY = _setting("STATIC_CHECK_CONCURRENCY", 20)
+STATIC_CHECK_TIMEOUT = _setting("STATIC_CHECK_TIMEOUT", 15)
+
+# Synthetic Monitor Configuration
+MONITOR_INTERVAL = _setting("MONITOR_INTERVAL", 300)  # Seconds between flow runs per worker
+MONITOR_WORKERS = _setting("MONITOR_WORKERS", 1)
+MONITOR_METRICS_PORT = _setting("MONITOR_METRICS_PORT", 9464)
+MONITOR_WINDOW_SECONDS = _setting("MONITOR_WINDOW_SECONDS", 3600)
+MONITOR_WINDOW_SLICES = _setting("MONITOR_WINDOW_SLICES", 12)
+MONITOR_MAX_ERROR_RATE = _setting("MONITOR_MAX_ERROR_RATE", 0.05)
+MONITOR_SLO_P95_MS = _setting("MONITOR_SLO_P95_MS", {
+    "flow": 60000,
+    "home_load": 10000,
+    "careers_navigation": 10000,
+    "qa_jobs_filter": 20000,
+    "lever_redirect": 15000,
+})
 
 # Test Configuration
-SCREENSHOT_DIR = Path("screenshots")
-REPORT_DIR = Path("reports")
+SCREENSHOT_DIR = _setting("SCREENSHOT_DIR", Path("screenshots"))
+REPORT_DIR = _setting("REPORT_DIR", Path("reports"))
+IMPORT_TIME_BUDGET_MS = _setting("IMPORT_TIME_BUDGET_MS", 100)  # Project import time allowed while collecting the suite
 
-# Test Data
-TEST_LOCATION = "Istanbul, Turkiye"
-TEST_DEPARTMENT = "Quality Assurance"
+# Duration Scheduling Configuration
+DURATION_STORE = _setting("DURATION_STORE", REPORT_DIR / ".durations.json")
+DURATION_DECAY = _setting("DURATION_DECAY", 0.3)  # Weight of the newest run in the per-test average
+DURATION_DEFAULT = _setting("DURATION_DEFAULT", 30)  # Seconds assumed for tests with no history at all
+
+# Streaming Report Configuration
+STREAM_REPORT_MAX_LONGREPR = _setting("STREAM_REPORT_MAX_LONGREPR", 20000)  # Characters of failure output kept per record
+
+# Failure Trace Configuration
+TRACE_ENABLED = _setting("TRACE_ENABLED", True)
+TRACE_BUFFER_SIZE = _setting("TRACE_BUFFER_SIZE", 2000)  # Commands and console/network events kept per driver
+TRACE_MAX_FRAMES = _setting("TRACE_MAX_FRAMES", 60)  # Screencast frames kept per driver
+TRACE_FPS = _setting("TRACE_FPS", 1)
+TRACE_FRAME_QUALITY = _setting("TRACE_FRAME_QUALITY", 40)
+TRACE_WEBDRIVER_FRAMES = _setting("TRACE_WEBDRIVER_FRAMES", False)  # chromedriver only: screenshot after page-changing commands
+TRACE_DIR = _setting("TRACE_DIR", REPORT_DIR / "traces")
 
-# Ensure directories exist
-SCREENSHOT_DIR.mkdir(exist_ok=True)
-REPORT_DIR.mkdir(exist_ok=True)
+# Step Retry Configuration
+STEP_RETRY_BUDGET = _setting("STEP_RETRY_BUDGET", 2)  # Step retries allowed per test flow
+STEP_RETRY_DELAY = _setting("STEP_RETRY_DELAY", 1)  # Seconds before a failed step is retried
+
+# Preflight Health Check Configuration
+PREFLIGHT_TIMEOUT = _setting("PREFLIGHT_TIMEOUT", 5)  # Seconds per probe request
+PREFLIGHT_TTL = _setting("PREFLIGHT_TTL", 120)  # Seconds a health verdict is shared before probing again
+BREAKER_FILE = _setting("BREAKER_FILE", REPORT_DIR / ".circuit_breaker.json")
+
+# Test Data
+TEST_LOCATION = _setting("TEST_LOCATION", "Istanbul, Turkiye")
+TEST_DEPARTMENT = _setting("TEST_DEPARTMENT", "Quality Assurance")
@@ -3,62 +3,276 @@ Pytest configuration file for Insider Test Automation project
 Handles WebDriver lifecycle + screenshot on failure
 """
 
+from pathlib import Path
+
+import sys
+import uuid
+
 import pytest
 
-from pages.home_page import HomePage
-from utils.driver_factory import DriverFactory
-from utils.screenshot_utils import take_screenshot
-from config.config import BROWSER, HEADLESS
+from config.config import BROWSER, HEADLESS, DRIVER_BACKEND, DURATION_STORE, EMULATION_PROFILE, BREAKER_FILE
+
+
+def pytest_addoption(parser):
+    """Register command line options"""
+    parser.addoption(
+        "--driver-backend",
+        action="store",
+        default=DRIVER_BACKEND,
+        help="Driver backend to run the suite on: webdriver or cdp",
+    )
+    parser.addoption(
+        "--emulation-profile",
+        action="append",
+        default=None,
+        help="Run browser tests under this network/CPU profile; repeat to run each test per profile",
+    )
+    parser.addoption(
+        "--no-preflight",
+        action="store_true",
+        default=False,
+        help="Do not probe the target site or short-circuit tests while it is unhealthy",
+    )
+    parser.addoption(
+        "--jsonl-report",
+        action="store",
+        default=None,
+        help="Stream results as JSON Lines to this file",
+    )
+    parser.addoption(
+        "--duration-schedule",
+        action="store_true",
+        default=False,
+        help="With -n, place tests on workers longest-first using recorded durations",
+    )
+    parser.addoption(
+        "--duration-store",
+        action="store",
+        default=str(DURATION_STORE),
+        help="JSON file holding per-test duration history",
+    )
+
+
+def pytest_configure(config):
+    """Register markers and the streaming reporter on the controller process"""
+    config.addinivalue_line(
+        "markers",
+        "needs_rendering: test drives a real browser; everything else runs browserless",
+    )
+    from utils.emulation import get_profile
+
+    for name in config.getoption("emulation_profile") or []:
+        try:
+            get_profile(name)
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+
+    path = config.getoption("jsonl_report")
+    if path and not hasattr(config, "workerinput"):
+        from utils.streaming_report import StreamingReporter
+
+        config.pluginmanager.register(StreamingReporter(path), "streaming_reporter")
+
+    # Preflight verdicts are keyed by session: workers share the controller's, other runs keep their own
+    if hasattr(config, "workerinput"):
+        config.breaker_session = config.workerinput["breaker_session"]
+    else:
+        config.breaker_session = uuid.uuid4().hex
+
+    if not hasattr(config, "workerinput"):
+        from utils.step_report import StepRetryReport, StepTimingReport
+
+        config.pluginmanager.register(StepTimingReport(), "step_timing_report")
+        config.pluginmanager.register(StepRetryReport(), "step_retry_report")
+
+    # Durations only matter for distributing tests, serial runs neither use nor record them
+    if not hasattr(config, "workerinput") and config.getoption("numprocesses", None):
+        # pytest-xdist is only needed by the controller
+        from utils.duration_scheduler import DurationScheduler, DurationStore
+
+        store = DurationStore(Path(config.getoption("duration_store")))
+        config.pluginmanager.register(
+            DurationScheduler(store, enabled=config.getoption("duration_schedule")), "duration_scheduler"
+        )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the controller's preflight session to xdist workers"""
+    node.workerinput["breaker_session"] = node.config.breaker_session
+
+
+def pytest_generate_tests(metafunc):
+    """Repeat browser tests once per requested emulation profile"""
+    profiles = metafunc.config.getoption("emulation_profile")
+    if profiles and "emulation_profile" in metafunc.fixturenames:
+        metafunc.parametrize("emulation_profile", profiles, indirect=True, ids=profiles)
+
+
+@pytest.fixture
+def emulation_profile(request):
+    """Name of the emulation profile the driver is created with"""
+    return getattr(request, "param", EMULATION_PROFILE)
+
+
+@pytest.fixture
+def live_site(request):
+    """Fail fast with the preflight verdict while the target site is unhealthy"""
+    if request.config.getoption("no_preflight"):
+        return
+    from utils.health import CircuitBreaker
+
+    verdict = CircuitBreaker(BREAKER_FILE).check(request.config.breaker_session)
+    if verdict["open"]:
+        pytest.fail(verdict["reason"], pytrace=False)
 
 
 @pytest.fixture(scope="function")
-def driver():
+def driver(request, emulation_profile, live_site):
     """
     WebDriver fixture: creates a new driver instance for each test
-    and quits safely after test finishes
+    and hands it to the background reaper after the test finishes
     """
+    if request.node.get_closest_marker("needs_rendering") is None:
+        pytest.fail(
+            "Test requests a browser but is not marked needs_rendering; "
+            "use utils.static_dom for markup-only checks or add @pytest.mark.needs_rendering"
+        )
+
     driver = None
     try:
-        # Create driver
-        driver = DriverFactory.get_driver(BROWSER, HEADLESS)
+        # Create driver, importing the driver stack only when a test needs a browser
+        from utils.driver_factory import DriverFactory
+
+        backend = request.config.getoption("driver_backend")
+        driver = DriverFactory.get_driver(BROWSER, HEADLESS, backend, emulation_profile)
         yield driver
     except Exception as e:
         print(f"[!] Error during driver setup: {e}")
-        if driver:
-            driver.quit()
         raise
     finally:
         if driver:
-            try:
-                driver.quit()
-            except Exception as e:
-                print(f"[!] Error closing driver: {e}")
+            # Chrome shuts down on the reaper thread while the next test starts
+            from utils.process_reaper import get_reaper
+
+            get_reaper().quit_later(driver)
+
+
+@pytest.fixture
+def steps(driver):
+    """Checkpointed step runner: failed steps are retried on the same driver instead of the whole test"""
+    from utils.steps import StepFlow
+
+    return StepFlow(driver)
+
+
+def pytest_sessionfinish(session):
+    """Wait for background teardown and kill browser processes left behind"""
+    # Only drivers import the reaper (and psutil), a session that started none has nothing to reap
+    process_reaper = sys.modules.get("utils.process_reaper")
+    if process_reaper is None:
+        return
+    stats = process_reaper.get_reaper().reap()
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["reaper"] = stats
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect reaper stats from xdist workers"""
+    stats = getattr(node, "workeroutput", {}).get("reaper")
+    if stats:
+        from utils.process_reaper import get_reaper
+
+        get_reaper().merge(stats)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report background teardown and reclaimed memory"""
+    process_reaper = sys.modules.get("utils.process_reaper")
+    if process_reaper is None:
+        return
+    stats = process_reaper.get_reaper().stats
+    if not stats["quits"] and not stats["quit_errors"] and not stats["killed"]:
+        return
+    terminalreporter.write_sep("-", "process reaper")
+    terminalreporter.write_line(
+        f"{stats['quits']} drivers quit in background ({stats['quit_errors']} errors), "
+        f"{stats['killed']} leftover processes killed, {stats['reclaimed_bytes'] / 2 ** 20:.1f} MiB reclaimed"
+    )
 
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
-    Automatically take screenshot if a test fails
+    Automatically take screenshot and write the trace buffer if a test fails
     """
     outcome = yield
     result = outcome.get_result()
 
+    if result.when == "call":
+        driver = item.funcargs.get("driver", None)
+        from utils.performance_metrics import get_recorder
+
+        recorder = get_recorder(driver) if driver else None
+        page_metrics = recorder.snapshot() if recorder else None
+        if page_metrics:
+            result.user_properties.append(("page_metrics", page_metrics))
+            pytest_html = item.config.pluginmanager.getplugin("html")
+            if pytest_html:
+                extras = getattr(result, "extras", [])
+                extras.append(pytest_html.extras.json(page_metrics, name="Page metrics"))
+                result.extras = extras
+        element_cache = getattr(driver, "element_cache", None)
+        if element_cache:
+            result.user_properties.append(("element_cache", element_cache.stats))
+        steps = item.funcargs.get("steps", None)
+        if steps and steps.stats:
+            result.user_properties.append(("step_retries", steps.report()))
+
+    if result.when == "call" and result.failed and "live_site" in item.fixturenames:
+        # A site that degrades after the preflight would otherwise cost every test a full page load timeout
+        if call.excinfo is not None and not item.config.getoption("no_preflight"):
+            from utils.health import CircuitBreaker
+
+            CircuitBreaker(BREAKER_FILE).record_failure(item.name, call.excinfo.value, item.config.breaker_session)
+
     if result.when == "call" and result.failed:
         driver = item.funcargs.get("driver", None)
         if driver:
+            from utils.screenshot_utils import take_screenshot
+
             test_name = item.name
             try:
-                take_screenshot(driver, test_name)
+                screenshot = take_screenshot(driver, test_name)
+                if screenshot:
+                    result.user_properties.append(("screenshot", screenshot))
                 print(f"\n[!] Screenshot taken for failed test: {test_name}")
             except Exception as e:
                 print(f"[!] Failed to take screenshot: {e}")
 
+            from utils.trace_recorder import get_tracer
+
+            tracer = get_tracer(driver)
+            if tracer:
+                try:
+                    trace = tracer.dump(test_name)
+                    result.user_properties.append(("trace", trace))
+                    print(f"[!] Trace written for failed test: {trace}")
+                except Exception as e:
+                    print(f"[!] Failed to write trace: {e}")
+
 @pytest.fixture(autouse=True)
-def accept_cookies_before_test(driver):
+def accept_cookies_before_test(request):
     """
     Her test başlamadan önce cookie banner varsa kabul eder
     """
-    home_page = HomePage(driver)
+    if "driver" not in request.fixturenames:
+        # Browserless tests never open the home page
+        return
+    from pages.home_page import HomePage
+
+    home_page = HomePage(request.getfixturevalue("driver"))
     home_page.goto_home_page()
     home_page.wait_for_page_load()
     try:
@@ -2,11 +2,21 @@
 Base Page Object class that provides common functionality
 """
 
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import (
+    WebDriverException,
+    TimeoutException,
+    StaleElementReferenceException,
+    ElementNotInteractableException,
+    ElementClickInterceptedException,
+)
 
 from utils.screenshot_utils import wait_for_element, wait_for_element_clickable, scroll_to_element
+from utils.performance_metrics import measured, get_recorder
+from utils.element_cache import get_element_cache
+
+
+class PageLoadTimeout(TimeoutException):
+    """The browser did not finish loading a page, unlike an element wait timing out"""
 
 
 class BasePage:
@@ -19,8 +29,90 @@ class BasePage:
         Args:
             driver: WebDriver instance
         """
+        # selenium.webdriver loads every browser module, keep it out of test collection
+        from selenium.webdriver.support.ui import WebDriverWait
+
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
+        self.element_cache = get_element_cache(driver)
+    
+    def _with_element(self, locator, resolve, use):
+        """
+        Run an action on the cached element for a locator, resolving it on a miss
+        
+        A cached handle that turns out to be stale (or not yet interactable) is
+        dropped and re-resolved once, so callers never see the cache.
+        
+        Args:
+            locator: Element locator tuple (By, value)
+            resolve: Callable locating the element when it is not cached
+            use: Callable receiving the element
+            
+        Returns:
+            Result of use
+        """
+        element = self.element_cache.get("one", locator)
+        if element is not None:
+            try:
+                return use(element)
+            except (StaleElementReferenceException, ElementNotInteractableException,
+                    ElementClickInterceptedException):
+                self.element_cache.discard("one", locator)
+        element = resolve()
+        self.element_cache.put("one", locator, element)
+        return use(element)
+    
+    def open(self, url):
+        """
+        Navigate to a URL, starting a new element cache generation
+        
+        Args:
+            url (str): URL to open
+        """
+        self._read_page_metrics()
+        self.element_cache.invalidate()
+        try:
+            self.driver.get(url)
+        except TimeoutException as e:
+            # Tagged so the circuit breaker can tell a slow site from a broken locator
+            raise PageLoadTimeout(f"Page {url} did not load: {e.msg}") from e
+    
+    def switch_to_window(self, handle):
+        """
+        Switch to another window, starting a new element cache generation
+        
+        Args:
+            handle (str): Window handle
+        """
+        self._read_page_metrics()
+        self.element_cache.invalidate()
+        self.driver.switch_to.window(handle)
+        # Emulation is scoped to a single target, throttle the new window like the first one
+        # unless the backend already did when the window was created
+        profile = getattr(self.driver, "emulation_profile", None)
+        if profile and not getattr(self.driver, "emulates_new_targets", False):
+            profile.apply(self.driver)
+    
+    def open_new_tab(self):
+        """Open a blank tab and switch to it, filing pending metrics under the page being left"""
+        self._read_page_metrics()
+        self.element_cache.invalidate()
+        self.driver.switch_to.new_window("tab")
+    
+    def close_window(self):
+        """Close the current window, reading its metrics while the page is still there"""
+        self._read_page_metrics()
+        self.element_cache.invalidate()
+        self.driver.close()
+    
+    def get_element_cache_stats(self):
+        """
+        Get element cache counters for this driver
+        
+        Returns:
+            dict: Hits, misses, stale retries and invalidations
+        """
+        return self.element_cache.stats
     
     def find_element(self, locator):
         """
@@ -32,7 +124,7 @@ class BasePage:
         Returns:
             WebElement: Found element
         """
-        return self.driver.find_element(*locator)
+        return self._with_element(locator, lambda: self.driver.find_element(*locator), lambda element: element)
     
     def find_elements(self, locator):
         """
@@ -44,8 +136,15 @@ class BasePage:
         Returns:
             list: List of found elements
         """
-        return self.driver.find_elements(*locator)
+        # Always resolved again: a cached list cannot see items a re-render added.
+        # Kept only for element_cache.peek
+        elements = self.driver.find_elements(*locator)
+        # An empty result usually means the list has not rendered yet, never cache it
+        if elements:
+            self.element_cache.put("all", locator, elements)
+        return list(elements)
     
+    @measured
     def click_element(self, locator, timeout = 10):
         """
         Click on an element
@@ -54,13 +153,21 @@ class BasePage:
             locator: Element locator tuple (By, value)
             timeout: Timeout for click
         """
-        try:
-            element = wait_for_element_clickable(self.driver, locator, timeout)
+        def _click(element):
             scroll_to_element(self.driver, element)
             element.click()
-        except Exception as e:
-            raise Exception(f"Failed to click element {locator}: {e}")
+
+        try:
+            self._with_element(locator, lambda: wait_for_element_clickable(self.driver, locator, timeout), _click)
+        except WebDriverException as e:
+            # Keep the original type so step retries still see a browser failure
+            e.msg = f"Failed to click element {locator}: {e.msg}"
+            raise
+        finally:
+            # The click may navigate or re-render the page
+            self.element_cache.invalidate()
     
+    @measured
     def send_keys_to_element(self, locator, text):
         """
         Send text to an element
@@ -69,9 +176,12 @@ class BasePage:
             locator: Element locator tuple (By, value)
             text (str): Text to send
         """
-        element = wait_for_element(self.driver, locator)
-        element.clear()
-        element.send_keys(text)
+        def _type(element):
+            element.clear()
+            element.send_keys(text)
+
+        self._with_element(locator, lambda: wait_for_element(self.driver, locator), _type)
+        self.element_cache.invalidate()
     
     def get_element_text(self, locator):
         """
@@ -83,9 +193,9 @@ class BasePage:
         Returns:
             str: Element text
         """
-        element = wait_for_element(self.driver, locator)
-        print(element.text)
-        return element.text.strip()
+        text = self._with_element(locator, lambda: wait_for_element(self.driver, locator), lambda element: element.text)
+        print(text)
+        return text.strip()
     
     def is_element_present(self, locator, timeout=5):
         """
@@ -99,10 +209,12 @@ class BasePage:
             bool: True if element is present, False otherwise
         """
         try:
-            wait_for_element(self.driver, locator, timeout)
-            return True
+            element = wait_for_element(self.driver, locator, timeout)
         except TimeoutException:
             return False
+        # Always asks the page: a cached handle cannot tell whether its node is still there
+        self.element_cache.put("one", locator, element)
+        return True
     
     def is_element_visible(self, locator, timeout=5):
         """
@@ -116,11 +228,12 @@ class BasePage:
             bool: True if element is visible, False otherwise
         """
         try:
-            element = wait_for_element(self.driver, locator, timeout)
-            return element.is_displayed()
+            return self._with_element(locator, lambda: wait_for_element(self.driver, locator, timeout),
+                                      lambda element: element.is_displayed())
         except TimeoutException:
             return False
     
+    @measured
     def wait_for_page_load(self):
         """Wait for page to load completely"""
         self.wait.until(
@@ -145,6 +258,7 @@ class BasePage:
         """
         return self.driver.title
     
+    @measured
     def hover_over_element(self, locator):
         """
         Hover over an element
@@ -152,10 +266,15 @@ class BasePage:
         Args:
             locator: Element locator tuple (By, value)
         """
-        element = wait_for_element(self.driver, locator)
-        actions = ActionChains(self.driver)
-        actions.move_to_element(element).perform()
+        from selenium.webdriver.common.action_chains import ActionChains
+
+        def _hover(element):
+            actions = ActionChains(self.driver)
+            actions.move_to_element(element).perform()
+
+        self._with_element(locator, lambda: wait_for_element(self.driver, locator), _hover)
     
+    @measured
     def select_dropdown_option(self, dropdown_locator, option_text):
         """
         Select an option from dropdown by text
@@ -166,9 +285,29 @@ class BasePage:
         """
         from selenium.webdriver.support.ui import Select
         
-        dropdown = wait_for_element(self.driver, dropdown_locator)
-        select = Select(dropdown)
-        select.select_by_visible_text(option_text)
+        def _select(dropdown):
+            select = Select(dropdown)
+            select.select_by_visible_text(option_text)
+
+        self._with_element(dropdown_locator, lambda: wait_for_element(self.driver, dropdown_locator), _select)
+        # Changing a filter re-renders the content it controls
+        self.element_cache.invalidate()
+
+    def _read_page_metrics(self):
+        """Read the metrics of the page being left, once for all actions taken on it"""
+        recorder = get_recorder(self.driver)
+        if recorder:
+            recorder.read_page()
+
+    def get_action_metrics(self):
+        """
+        Get performance metrics of the pages visited, with the page object actions taken on each
+
+        Returns:
+            list: Metrics samples, oldest first (empty if metrics are disabled)
+        """
+        recorder = get_recorder(self.driver)
+        return recorder.snapshot() if recorder else []
 
     def scroll_down(self):
         self.driver.execute_script("window.scrollTo(0, 600);")
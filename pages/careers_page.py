@@ -2,7 +2,7 @@
 Careers Page Object for Insider website
 """
 
-from selenium.webdriver.common.by import By
+from pages.locators import By
 from pages.base_page import BasePage
 
 
@@ -19,6 +19,9 @@ class CareersPage(BasePage):
     TEAMS_HEADER = (By.CLASS_NAME, "#career-find-our-calling .category-title-media")
     LIFE_HEADER = (By.CLASS_NAME, "elementor-widget-wrap.elementor-element-populated.e-swiper-container .elementor-widget-heading")
     
+    # Markup-only checks that can run without a browser (see utils/static_dom.py)
+    STRUCTURAL_LOCATORS = {"locations": LOCATIONS_SECTION, "teams": TEAMS_SECTION}
+
     # Page title and URL verification
     PAGE_TITLE_CONTAINS = "Careers"
     URL_CONTAINS = "/careers"
@@ -2,7 +2,7 @@
 Home Page Object for Insider website
 """
 
-from selenium.webdriver.common.by import By
+from pages.locators import By
 
 from config.config import BASE_URL
 from pages.base_page import BasePage
@@ -17,6 +17,9 @@ class HomePage(BasePage):
     LOGO = (By.CSS_SELECTOR, ".navbar-brand img")
     NAVIGATION_BAR = (By.CSS_SELECTOR, ".navbar-nav:first-child")
     COOKIE_ACCEPT_BUTTON = (By.ID, "wt-cli-accept-all-btn")
+
+    # Markup-only checks that can run without a browser (see utils/static_dom.py)
+    STRUCTURAL_LOCATORS = {"logo": LOGO, "navigation_bar": NAVIGATION_BAR}
     
     def __init__(self, driver):
         """Initialize HomePage with driver"""
@@ -24,7 +27,7 @@ class HomePage(BasePage):
 
     def goto_home_page(self):
         """Go to home page"""
-        self.driver.get(BASE_URL)
+        self.open(BASE_URL)
     
     def is_home_page_opened(self):
         """
@@ -25,10 +25,30 @@ class LeverApplicationPage(BasePage):
 
         # Wait for page to load
         windows = self.driver.window_handles
-        self.driver.switch_to.window(windows[-1])
+        self.switch_to_window(windows[-1])
 
         self.wait_for_page_load()
 
         current_url = self.get_current_url()
 
-        return self.LEVER_URL_CONTAINS in current_url
\ No newline at end of file
+        return self.LEVER_URL_CONTAINS in current_url
+
+    def verify_lever_url_in_new_tab(self, url):
+        """
+        Open a View Role URL in a new tab and verify it lands on Lever
+
+        Args:
+            url (str): View Role URL collected from the job list
+
+        Returns:
+            bool: True if the page loaded on Lever, False otherwise
+        """
+        original_window = self.driver.current_window_handle
+        self.open_new_tab()
+        try:
+            self.open(url)
+            self.wait_for_page_load()
+            return self.LEVER_URL_CONTAINS in self.get_current_url()
+        finally:
+            self.close_window()
+            self.switch_to_window(original_window)
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Locator strategies for page object locators
+"""
+
+
+class By:
+    """
+    Same strategy strings as selenium.webdriver.common.by.By
+
+    Importing anything from selenium.webdriver loads every browser module
+    through the package __init__, so page objects declare their locators with
+    this class and collection stays free of the driver stack.
+    """
+
+    ID = "id"
+    XPATH = "xpath"
+    LINK_TEXT = "link text"
+    PARTIAL_LINK_TEXT = "partial link text"
+    NAME = "name"
+    TAG_NAME = "tag name"
+    CLASS_NAME = "class name"
+    CSS_SELECTOR = "css selector"
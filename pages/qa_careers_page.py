@@ -1,8 +1,7 @@
 """
 QA Careers Page Object for Insider website
 """
-from selenium.webdriver import ActionChains
-from selenium.webdriver.common.by import By
+from pages.locators import By
 from pages.base_page import BasePage
 from config.config import TEST_LOCATION, TEST_DEPARTMENT, QA_CAREERS_URL
 
@@ -28,6 +27,7 @@ class QACareersPage(BasePage):
     
     # Job detail locators
     VIEW_ROLE_BUTTON = (By.XPATH, ".//a[contains(text(), 'View Role') or contains(@class, 'apply') or contains(@class, 'view')]")
+    VIEW_ROLE_LINKS = (By.XPATH, "//div[contains(@class, 'position-list-item')]//a[contains(text(), 'View Role') or contains(@class, 'apply') or contains(@class, 'view')]")
 
     # Page verification
     PAGE_TITLE_CONTAINS = "Quality Assurance"
@@ -39,7 +39,7 @@ class QACareersPage(BasePage):
 
     def goto_careers_page(self):
         """Go to QA Careers page"""
-        self.driver.get(QA_CAREERS_URL)
+        self.open(QA_CAREERS_URL)
 
     def is_qa_careers_page_opened(self):
         """
@@ -147,11 +147,35 @@ class QACareersPage(BasePage):
             list: List of job item elements
         """
         try:
+            # Reuse the cards get_job_items already resolved in this page state
+            job_items = self.element_cache.peek("all", self.JOB_ITEMS)
+            if job_items:
+                return job_items[0]
             return self.find_element(self.JOB_ITEM_FIRST)
         except Exception as e:
             print(f"Error getting job item: {e}")
             return []
 
+    def get_view_role_links(self):
+        """
+        Collect the View Role href of every job item, reading all hrefs in a single script call
+
+        Returns:
+            list: Unique View Role URLs in page order
+        """
+        script = """
+            const links = [];
+            for (const link of arguments[0]) {
+                if (link.href && !links.includes(link.href)) links.push(link.href);
+            }
+            return links;
+        """
+        try:
+            return self.driver.execute_script(script, self.find_elements(self.VIEW_ROLE_LINKS))
+        except Exception as e:
+            print(f"Error collecting View Role links: {e}")
+            return []
+
     def click_view_role_button(self, job_item):
         """
         Click View Role button for a specific job item
@@ -162,10 +186,13 @@ class QACareersPage(BasePage):
         try:
             view_role_button = job_item.find_element(*self.VIEW_ROLE_BUTTON)
             view_role_button.click()
+            self.element_cache.invalidate()
         except Exception as e:
             print(f"Error clicking View Role button: {e}")
 
     def hover_over_application_card(self, element):
         """Hover over the Company menu"""
+        from selenium.webdriver.common.action_chains import ActionChains
+
         actions = ActionChains(self.driver)
         actions.move_to_element(element).perform()
@@ -0,0 +1,191 @@
+"""
+Tests for the DevTools protocol driver backend, run against a local fake endpoint
+"""
+import asyncio
+import json
+import threading
+
+import pytest
+import websockets
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from utils.cdp_driver import CDPConnection, CDPDriver, CDPElement, CDPError, _SwitchTo, to_css_locator
+from utils.driver_factory import DriverBackend
+from utils.emulation import get_profile
+
+
+async def fake_devtools(websocket):
+    """Answer commands only once three are queued, proving they were pipelined"""
+    queued = []
+    async for raw in websocket:
+        message = json.loads(raw)
+        if message["method"] == "Test.emit":
+            await websocket.send(json.dumps({"method": "Page.loadEventFired", "params": {"timestamp": 1},
+                                             "sessionId": message.get("sessionId")}))
+            await websocket.send(json.dumps({"id": message["id"], "result": {}}))
+        elif message["method"] == "Runtime.callFunctionOn":
+            await websocket.send(json.dumps({"id": message["id"], "error": {
+                "code": -32000, "message": "Could not find object with given id"}}))
+        elif message["method"] == "Test.fail":
+            await websocket.send(json.dumps({"id": message["id"], "error": {"code": -32601, "message": "nope"}}))
+        else:
+            queued.append(message)
+            if len(queued) == 3:
+                for queued_message in reversed(queued):
+                    await websocket.send(json.dumps({"id": queued_message["id"],
+                                                     "result": {"method": queued_message["method"]}}))
+                queued.clear()
+
+
+class RecordingConnection:
+    """Answers every command and records (method, session) pairs"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, method, params=None, session_id=None):
+        self.sent.append((method, session_id))
+        self.params = params
+        if method == "Target.attachToTarget":
+            return {"sessionId": f"session-{params['targetId']}"}
+        if method.startswith("Runtime."):
+            return {"result": {"type": "undefined"}}
+        return {}
+
+    async def pipeline(self, commands, session_id=None):
+        return [await self.send(method, params, session_id) for method, params in commands]
+
+
+def offline_driver(tmp_path):
+    """CDPDriver wired to a recording connection instead of a launched Chrome"""
+    driver = CDPDriver.__new__(CDPDriver)
+    driver.connection = RecordingConnection()
+    driver.process = None
+    driver.session_id = None
+    driver.switch_to = _SwitchTo(driver)
+    driver._handles = ["tab-1", "tab-2"]
+    driver._sessions = {}
+    driver._ready = {}
+    driver._session_setup = []
+    driver._user_data_dir = str(tmp_path / "profile")
+    driver._loop = asyncio.new_event_loop()
+    driver._thread = threading.Thread(target=driver._loop.run_forever, daemon=True)
+    driver._thread.start()
+    return driver
+
+
+def run_against_fake(scenario):
+    async def _main():
+        async with websockets.serve(fake_devtools, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            connection = await CDPConnection.connect(f"ws://127.0.0.1:{port}")
+            try:
+                return await asyncio.wait_for(scenario(connection), 5)
+            finally:
+                await connection.close()
+    return asyncio.run(_main())
+
+
+class TestCDPDriver:
+    """Test class for the CDP backend"""
+
+    def test_pipeline_returns_results_in_command_order(self):
+        async def scenario(connection):
+            return await connection.pipeline([("A.one", None), ("A.two", None), ("A.three", {"x": 1})])
+
+        results = run_against_fake(scenario)
+
+        assert [r["method"] for r in results] == ["A.one", "A.two", "A.three"]
+
+    def test_event_wait_registered_before_trigger(self):
+        async def scenario(connection):
+            loaded = connection.expect_event("Page.loadEventFired", session_id="S1")
+            await connection.send("Test.emit", session_id="S1")
+            return await loaded
+
+        assert run_against_fake(scenario) == {"timestamp": 1}
+
+    def test_event_wait_times_out(self):
+        async def scenario(connection):
+            await connection.wait_for_event("Page.loadEventFired", timeout=0.1)
+
+        with pytest.raises(TimeoutException):
+            run_against_fake(scenario)
+
+    def test_protocol_errors_are_mapped(self):
+        async def scenario(connection):
+            with pytest.raises(StaleElementReferenceException):
+                await connection.send("Runtime.callFunctionOn")
+            with pytest.raises(CDPError):
+                await connection.send("Test.fail")
+
+        run_against_fake(scenario)
+
+    def test_locators_translated_like_selenium(self):
+        assert to_css_locator(By.ID, "career-our-location") == (By.CSS_SELECTOR, '[id="career-our-location"]')
+        assert to_css_locator(By.CLASS_NAME, "position-list .position-list-item") == \
+            (By.CSS_SELECTOR, ".position-list .position-list-item")
+        assert to_css_locator(By.XPATH, "//a") == (By.XPATH, "//a")
+
+    def test_sessions_cached_per_tab_and_setup_replayed(self, tmp_path):
+        driver = offline_driver(tmp_path)
+        connection = driver.connection
+        driver._run(driver._attach("tab-1"))
+        driver.execute_cdp_cmd("Performance.enable", {})
+        driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "1"})
+
+        driver.switch_to.window("tab-2")
+        driver.switch_to.window("tab-1")
+        driver.switch_to.window("tab-2")
+        driver.close()
+        driver.connection = None
+        driver.quit()
+
+        attaches = [sent for sent in connection.sent if sent[0] == "Target.attachToTarget"]
+        assert len(attaches) == 2
+        assert ("Performance.enable", "session-tab-2") in connection.sent
+        assert ("Runtime.evaluate", "session-tab-2") not in connection.sent
+        assert connection.sent[-2:] == [("Target.detachFromTarget", None), ("Target.closeTarget", None)]
+        assert "tab-2" not in driver._sessions
+        assert driver._loop.is_closed()
+
+    def test_tab_opened_by_page_emulated_before_it_runs(self, tmp_path):
+        driver = offline_driver(tmp_path)
+        connection = driver.connection
+        driver._run(driver._attach("tab-1"))
+        get_profile("3g-mobile").apply(driver)
+
+        async def open_lever_tab():
+            driver._on_event("Target.attachedToTarget", {
+                "sessionId": "session-lever", "targetInfo": {"targetId": "lever", "type": "page"},
+                "waitingForDebugger": True}, None)
+        driver._run(open_lever_tab())
+        driver.switch_to.window("lever")
+        driver.connection = None
+        driver.quit()
+
+        lever = [method for method, session in connection.sent if session == "session-lever"]
+        assert lever[-2:] == ["Runtime.runIfWaitingForDebugger", "Target.activateTarget"]
+        assert lever.index("Network.emulateNetworkConditions") < lever.index("Runtime.runIfWaitingForDebugger")
+        assert lever.index("Emulation.setCPUThrottlingRate") < lever.index("Runtime.runIfWaitingForDebugger")
+        # The switch reuses the session Chrome attached, only the first tab was attached by hand
+        assert [method for method, _ in connection.sent].count("Target.attachToTarget") == 1
+        assert driver.window_handles == ["tab-1", "tab-2", "lever"]
+
+    def test_element_lists_passed_to_scripts_as_nodes(self, tmp_path):
+        driver = offline_driver(tmp_path)
+        links = [CDPElement(driver, f"link-{i}", "session-tab-1") for i in range(2)]
+
+        driver.execute_script("return arguments[1].map((a) => a.href)", "x", links)
+        params = driver.connection.params
+        driver.connection = None
+        driver.quit()
+
+        assert params["objectId"] == "link-0"
+        assert params["arguments"] == [{"value": [-1, 2]}, {"value": "x"}, {"objectId": "link-0"},
+                                       {"objectId": "link-1"}]
+
+    def test_backend_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            DriverBackend()
@@ -0,0 +1,82 @@
+"""
+Tests for the duration store and the LPT work-stealing scheduler, driven with fake xdist nodes
+"""
+from types import SimpleNamespace
+
+from utils.duration_scheduler import DurationAwareScheduling, DurationStore, lpt_partition
+
+
+class FakeNode:
+    """Records what the scheduler sends to an xdist worker"""
+
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent = []
+        self.steal_requests = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def send_steal(self, indices):
+        self.steal_requests.append(list(indices))
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def make_scheduler(tmp_path, durations, workers):
+    store = DurationStore(tmp_path / "durations.json")
+    for nodeid, duration in durations.items():
+        store.update(nodeid, duration)
+    config = SimpleNamespace(getvalue=lambda name: ["popen"] * workers if name == "tx" else None)
+    scheduler = DurationAwareScheduling(config, store=store)
+    nodes = [FakeNode(f"gw{i}") for i in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, list(durations))
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+class TestDurationScheduler:
+    """Test class for duration-aware scheduling"""
+
+    def test_store_decays_towards_recent_runs_and_persists(self, tmp_path):
+        store = DurationStore(tmp_path / "reports" / "durations.json", decay=0.5)
+        store.update("test_a", 10.0)
+        store.update("test_a", 20.0)
+        store.update("test_b", 4.0)
+        store.save()
+
+        reloaded = DurationStore(tmp_path / "reports" / "durations.json", decay=0.5)
+        assert reloaded.estimate("test_a") == 15.0
+        assert reloaded.tests["test_a"]["runs"] == 2
+        assert reloaded.estimate("unknown") == 9.5
+
+    def test_lpt_partition_balances_makespan(self):
+        bins, loads = lpt_partition({"a": 7, "b": 5, "c": 4, "d": 3, "e": 1}, 2)
+
+        assert bins == [["a", "d"], ["b", "c", "e"]]
+        assert max(loads) == 10
+
+    def test_initial_placement_follows_lpt_bins(self, tmp_path):
+        durations = {"test_01": 5, "test_02": 20, "test_03": 40, "test_04": 60, "test_05": 65}
+        scheduler, (gw0, gw1) = make_scheduler(tmp_path, durations, 2)
+
+        assert gw0.sent == [4, 1, 0]
+        assert gw1.sent == [3, 2]
+        assert scheduler.predicted_makespan == 100
+
+    def test_idle_worker_steals_time_from_most_loaded_queue(self, tmp_path):
+        durations = {f"test_{i}": d for i, d in enumerate([50, 40, 30, 10, 9, 8, 7, 1])}
+        scheduler, (gw0, gw1) = make_scheduler(tmp_path, durations, 2)
+        busy, idle = (gw0, gw1) if len(gw0.sent) > len(gw1.sent) else (gw1, gw0)
+
+        for index in list(scheduler.node2pending[idle]):
+            scheduler.mark_test_complete(idle, index, 0.1)
+
+        stolen = busy.steal_requests[0]
+        assert stolen and set(stolen) <= set(busy.sent[2:])
+        scheduler.remove_pending_tests_from_node(busy, stolen)
+        assert idle.sent[-len(stolen):] == sorted(stolen, key=lambda i: -scheduler.estimates[i])
@@ -0,0 +1,112 @@
+"""
+Tests for the BasePage element handle cache, run against an in-memory fake driver
+"""
+from selenium.common.exceptions import StaleElementReferenceException
+from pages.base_page import BasePage
+from pages.locators import By
+from utils.element_cache import DOM_CHANGED_BINDING, WATCH_JS, ElementCache
+
+HEADER = (By.ID, "header")
+ITEMS = (By.CSS_SELECTOR, ".item")
+
+
+class FakeElement:
+    def __init__(self, text):
+        self.text = text
+        self.stale = False
+
+    def is_displayed(self):
+        if self.stale:
+            raise StaleElementReferenceException("stale element reference")
+        return True
+
+
+class FakeDriver:
+    """Counts lookups and scripts the way a remote driver would count round trips"""
+
+    def __init__(self):
+        self.lookups = 0
+        self.scripts = []
+        self.current_url = "https://useinsider.com/"
+        self.elements = {}
+        self.items = 3
+
+    def find_element(self, by, value):
+        self.lookups += 1
+        self.elements[value] = FakeElement(value)
+        return self.elements[value]
+
+    def find_elements(self, by, value):
+        self.lookups += 1
+        return [FakeElement(f"{value}-{i}") for i in range(self.items)]
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+
+    def get(self, url):
+        self.current_url = url
+
+
+class TestElementCache:
+    """Test class for the element cache"""
+
+    def test_hits_cost_no_round_trips(self):
+        driver = FakeDriver()
+        page = BasePage(driver)
+
+        page.find_element(HEADER)
+        assert page.is_element_visible(HEADER)
+        assert page.get_element_text(HEADER) == "header"
+
+        assert driver.lookups == 1 and driver.scripts == []
+        assert page.get_element_cache_stats()["hits"] == 2
+
+    def test_lists_see_items_added_by_rerender(self):
+        driver = FakeDriver()
+        page = BasePage(driver)
+        assert len(page.find_elements(ITEMS)) == 3
+
+        driver.items = 5
+        assert len(page.find_elements(ITEMS)) == 5
+
+    def test_cache_is_shared_across_page_objects_and_reset_on_navigation(self):
+        driver = FakeDriver()
+        BasePage(driver).find_element(HEADER)
+        other_page = BasePage(driver)
+        other_page.find_element(HEADER)
+        assert driver.lookups == 1
+
+        other_page.open("https://useinsider.com/careers/")
+        other_page.find_element(HEADER)
+        assert driver.lookups == 2
+
+    def test_stale_handle_is_re_resolved_and_presence_asks_the_page(self):
+        driver = FakeDriver()
+        page = BasePage(driver)
+        page.find_element(HEADER)
+
+        driver.elements["header"].stale = True
+        assert page.is_element_visible(HEADER)
+        assert driver.lookups == 2
+        assert page.get_element_cache_stats()["stale_retries"] == 1
+
+        assert page.is_element_present(HEADER)
+        assert driver.lookups == 3
+
+    def test_devtools_watch_starts_at_put_and_drops_only_changed_entry(self):
+        driver = FakeDriver()
+        listeners = []
+        driver.execute_cdp_cmd = lambda cmd, args: None
+        driver.add_event_listener = listeners.append
+        cache = ElementCache(driver)
+        cache.put("one", HEADER, FakeElement("header"))
+        cache.put("all", ITEMS, [FakeElement("item")])
+        assert [script for script, _ in driver.scripts] == [WATCH_JS, WATCH_JS]
+        token = driver.scripts[1][1][1]
+
+        # Reported before the entry was ever read back
+        listeners[0]("Runtime.bindingCalled", {"name": DOM_CHANGED_BINDING, "payload": token}, "tab")
+
+        assert cache.peek("all", ITEMS) is None
+        assert cache.peek("one", HEADER) is not None
+        assert len(driver.scripts) == 2
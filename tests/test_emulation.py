@@ -0,0 +1,91 @@
+"""
+Tests for the emulation profiles, run against a driver that records CDP commands
+"""
+import pytest
+
+from pages.base_page import BasePage
+from utils.emulation import PROFILES, covers_new_windows, get_profile
+from utils.step_report import StepTimingReport
+
+
+class RecordingDriver:
+    """Records CDP commands per window the way Chrome scopes emulation per target"""
+
+    def __init__(self):
+        self.current_window = "main"
+        self.commands = []
+        self.switch_to = self
+
+    def window(self, handle):
+        self.current_window = handle
+
+    def execute_cdp_cmd(self, method, params):
+        self.commands.append((self.current_window, method, params))
+        return {}
+
+
+class TestEmulation:
+    """Test class for emulation profiles"""
+
+    def test_profiles_translate_to_cdp_units(self):
+        driver = RecordingDriver()
+        get_profile("3g-mobile").apply(driver)
+
+        commands = {method: params for _, method, params in driver.commands}
+        assert commands["Network.emulateNetworkConditions"] == {
+            "offline": False, "latency": 300, "downloadThroughput": 200000, "uploadThroughput": 93750,
+        }
+        assert commands["Emulation.setCPUThrottlingRate"] == {"rate": 4}
+        assert get_profile("desktop").commands() == []
+        assert [method for method, _ in get_profile("4x-cpu").commands()] == ["Emulation.setCPUThrottlingRate"]
+        assert PROFILES["slow-4g-laptop"].commands()[-1][1]["width"] == 1366
+
+    def test_profile_follows_window_switches(self):
+        driver = RecordingDriver()
+        get_profile("slow-4g-laptop").apply(driver)
+
+        BasePage(driver).switch_to_window("lever")
+
+        windows = {window for window, _, _ in driver.commands}
+        assert windows == {"main", "lever"}
+
+    def test_backend_emulating_new_tabs_is_not_reapplied(self):
+        driver = RecordingDriver()
+        get_profile("3g-mobile").apply(driver)
+        assert not covers_new_windows(driver)
+
+        driver.emulates_new_targets = True
+        BasePage(driver).switch_to_window("lever")
+
+        assert covers_new_windows(driver)
+        assert {window for window, _, _ in driver.commands} == {"main"}
+
+    def test_unknown_profile_rejected(self):
+        with pytest.raises(ValueError, match="3g-mobile"):
+            get_profile("edge")
+
+    def test_step_timings_summarised_per_profile(self):
+        report = StepTimingReport()
+        for profile, home_load in (("desktop", 900), ("desktop", 1100), ("3g-mobile", 4000)):
+            report.pytest_runtest_logreport(type("Report", (), {
+                "when": "call",
+                "user_properties": [("step_timings", {"profile": profile, "steps": {"home_load": home_load}})],
+            }))
+
+        assert report.timings == {"desktop": {"home_load": [900, 1100]}, "3g-mobile": {"home_load": [4000]}}
+
+    def test_unthrottled_steps_flagged_in_summary(self):
+        report = StepTimingReport()
+        for profile, unthrottled in (("desktop", []), ("3g-mobile", ["lever_redirect"])):
+            report.pytest_runtest_logreport(type("Report", (), {
+                "when": "call",
+                "user_properties": [("step_timings", {"profile": profile, "unthrottled": unthrottled,
+                                                      "steps": {"home_load": 900, "lever_redirect": 1500}})],
+            }))
+        lines = []
+        report.pytest_terminal_summary(type("Reporter", (), {"write_sep": lambda *args: None,
+                                                             "write_line": lambda self, line: lines.append(line)})())
+
+        assert lines[1].split() == ["desktop", "900", "1500"]
+        assert lines[2].split() == ["3g-mobile", "900", "1500*"]
+        assert lines[-1].startswith("*")
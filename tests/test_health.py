@@ -0,0 +1,114 @@
+"""
+Tests for the preflight probe and shared circuit breaker, run against a local stub server
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from pages.base_page import BasePage, PageLoadTimeout
+from pages.locators import By
+from utils.fixture_server import FixtureServer
+from utils.health import CircuitBreaker
+from utils.screenshot_utils import wait_for_element
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ROUTES = {
+    "/": (200, "<html></html>"),
+    "/careers/": (200, "<html></html>", 0.3),
+    "/down/": (503, "Service Unavailable"),
+    "/hanging/": (200, "<html></html>", 3),
+}
+
+
+def breaker(tmp_path, server, *paths, ttl=60):
+    return CircuitBreaker(tmp_path / "breaker.json", urls=tuple(server.url(path) for path in paths),
+                          timeout=1, ttl=ttl)
+
+
+class StalledBrowser:
+    """Fake driver whose page loads time out and whose elements never appear"""
+
+    current_url = "about:blank"
+
+    def get(self, url):
+        raise TimeoutException("timeout: Timed out receiving message from renderer")
+
+    def find_element(self, by, value):
+        raise TimeoutException("no such element")
+
+
+class TestCircuitBreaker:
+    """Test class for the target health circuit breaker"""
+
+    def test_healthy_target_keeps_breaker_closed(self, tmp_path):
+        with FixtureServer(FIXTURES, routes=ROUTES) as server:
+            verdict = breaker(tmp_path, server, "/", "/careers/").check()
+
+        assert not verdict["open"]
+        assert [result["status"] for result in verdict["results"]] == [200, 200]
+
+    def test_failing_and_slow_targets_open_breaker_with_reason(self, tmp_path):
+        with FixtureServer(FIXTURES, routes=ROUTES) as server:
+            start = time.monotonic()
+            verdict = breaker(tmp_path, server, "/", "/down/", "/hanging/").check()
+            elapsed = time.monotonic() - start
+
+        assert verdict["open"]
+        assert "/down/ HTTP 503" in verdict["reason"]
+        assert "/hanging/" in verdict["reason"]
+        # Probes run concurrently, so the slow page costs one timeout in total
+        assert elapsed < 2.5
+
+    def test_workers_share_one_probe(self, tmp_path):
+        with FixtureServer(FIXTURES, routes=ROUTES) as server:
+            workers = [breaker(tmp_path, server, "/careers/") for _ in range(4)]
+            with ThreadPoolExecutor(len(workers)) as pool:
+                verdicts = list(pool.map(CircuitBreaker.check, workers))
+            probes = [hit for hit in server.hits if hit[1] == "/careers/"]
+
+        assert len(probes) == 1
+        assert len({verdict["checked_at"] for verdict in verdicts}) == 1
+
+    def test_verdict_expires_and_sessions_probe_separately(self, tmp_path):
+        with FixtureServer(FIXTURES, routes=ROUTES) as server:
+            first = breaker(tmp_path, server, "/down/", ttl=0.2)
+            assert first.check("run-1")["open"]
+            assert breaker(tmp_path, server, "/", ttl=0.2).check("run-1")["open"]
+            # A concurrent run neither reuses nor replaces the first run's verdict
+            assert not breaker(tmp_path, server, "/", ttl=0.2).check("run-2")["open"]
+            assert first.check("run-1")["open"]
+
+            time.sleep(0.3)
+            assert not breaker(tmp_path, server, "/", ttl=0.2).check("run-1")["open"]
+
+    def test_trip_opens_breaker_until_verdict_expires(self, tmp_path):
+        with FixtureServer(FIXTURES, routes=ROUTES) as server:
+            healthy = breaker(tmp_path, server, "/", ttl=0.2)
+            assert not healthy.check("run-1")["open"]
+
+            healthy.trip("test_search timed out", "run-1")
+            verdict = healthy.check("run-1")
+            assert verdict["open"] and "test_search timed out" in verdict["reason"]
+            assert len([hit for hit in server.hits if hit[1] == "/"]) == 1
+
+            time.sleep(0.3)
+            assert not healthy.check("run-1")["open"]
+
+    def test_only_page_load_timeouts_trip_breaker(self, tmp_path):
+        browser = StalledBrowser()
+        with pytest.raises(TimeoutException) as wait_timeout:
+            wait_for_element(browser, (By.ID, "missing"), timeout=0.1)
+        with pytest.raises(PageLoadTimeout) as load_timeout:
+            BasePage(browser).open("https://useinsider.com/careers/")
+
+        with FixtureServer(FIXTURES, routes=ROUTES) as server:
+            healthy = breaker(tmp_path, server, "/")
+            assert not healthy.record_failure("test_filters", wait_timeout.value, "run-1")
+            assert not healthy.check("run-1")["open"]
+
+            assert healthy.record_failure("test_careers", load_timeout.value, "run-1")
+            verdict = healthy.check("run-1")
+        assert verdict["open"] and "https://useinsider.com/careers/ did not load" in verdict["reason"]
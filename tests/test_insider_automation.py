@@ -9,21 +9,58 @@ from pages.home_page import HomePage
 from pages.careers_page import CareersPage
 from pages.qa_careers_page import QACareersPage
 from pages.lever_application_page import LeverApplicationPage
-from config.config import TEST_LOCATION, TEST_DEPARTMENT
+from config.config import TEST_LOCATION, TEST_DEPARTMENT, LINK_CHECK_BROWSER_SAMPLE, BASE_URL, CAREERS_URL
 
-class TestInsiderAutomation:
-    """Test class for Insider automation test cases"""
+
+def open_qa_jobs(qa_careers_page):
+    """Step: open the QA careers page and its full job list"""
+    qa_careers_page.goto_careers_page()
+    qa_careers_page.wait_for_page_load()
+
+    qa_careers_page.click_see_all_qa_jobs()
+    qa_careers_page.wait_for_page_load()
+
+
+def filter_jobs(qa_careers_page):
+    """Step: filter the job list by the test location and department, returning the job items"""
+    qa_careers_page.apply_filters(TEST_LOCATION, TEST_DEPARTMENT)
+    time.sleep(3)
+    return qa_careers_page.get_job_items()
+
+
+class TestInsiderStructure:
+    """Test class for browserless structural checks of the Insider pages"""
+
+    @staticmethod
+    def check_structure(page_class, url):
+        # aiohttp and lxml are only needed here, keep them out of collection
+        from utils.static_dom import StaticDOMEngine
+
+        result, = StaticDOMEngine().check_pages([(page_class, url)])
+        return result
 
     @pytest.mark.home_page
-    def test_01_home_page_opened(self, driver):
+    def test_01_home_page_opened(self, live_site):
         """
-        Test Case 1: Visit https://useinsider.com/ and check Insider home page is opened or not
+        Test Case 1: Visit https://useinsider.com/ and check Insider home page is opened or not,
+        from its logo and navigation bar in the served HTML, without starting a browser
         """
-        home_page = HomePage(driver)
+        result = self.check_structure(HomePage, BASE_URL)
 
-        is_home_page_opened = home_page.is_home_page_opened()
+        assert result.ok, f"Insider home page is not opened: {result}"
 
-        assert is_home_page_opened, "Insider home page is not opened"
+    def test_careers_structure_present(self, live_site):
+        """
+        Check the careers page Locations and Teams blocks straight from the served HTML
+        """
+        result = self.check_structure(CareersPage, CAREERS_URL)
+
+        assert result.ok, f"Structural checks failed: {result}"
+
+
+@pytest.mark.needs_rendering
+class TestInsiderAutomation:
+    """Test class for Insider automation test cases"""
 
     @pytest.mark.carreers_page
     def test_02_careers_page_sections(self, driver):
@@ -72,7 +109,7 @@ class TestInsiderAutomation:
         assert job_list_present, "Job list is not present after filtering"
 
     @pytest.mark.carreers_page
-    def test_04_job_details_verification(self, driver):
+    def test_04_job_details_verification(self, driver, steps):
         """
         Test Case 4: Check that all jobs' Position contains "Quality Assurance", 
         Department contains "Quality Assurance", and Location contains "Istanbul, Turkey"
@@ -81,39 +118,57 @@ class TestInsiderAutomation:
         # Navigate to QA careers page
         qa_careers_page = QACareersPage(driver)
 
-        qa_careers_page.goto_careers_page()
-        qa_careers_page.wait_for_page_load()
-
-        qa_careers_page.click_see_all_qa_jobs()
-        qa_careers_page.wait_for_page_load()
-
-        qa_careers_page.apply_filters(TEST_LOCATION, TEST_DEPARTMENT)
-        time.sleep(3)
-
-        job_items = qa_careers_page.get_job_items()
-        assert len(job_items) > 0, "No job items found to test"
+        steps.run("open_qa_jobs", lambda: open_qa_jobs(qa_careers_page))
+        job_items = steps.run("filter_jobs", lambda: filter_jobs(qa_careers_page), check=len,
+                              message="No job items found to test")
 
-        qa_careers_page.scroll_down()
-        time.sleep(2)
+        def read_job_details():
+            qa_careers_page.scroll_down()
+            time.sleep(2)
+            # get_job_items resolves the cards again, a retry may have re-rendered the list
+            return [(job.find_element('css selector', ".position-department").text,
+                     job.find_element('css selector', ".position-location").text)
+                    for job in qa_careers_page.get_job_items()]
 
-        departments = []
-        locations = []
-        for job in job_items:
-            department = job.find_element('css selector', ".position-department").text
-            location = job.find_element('css selector', ".position-location").text
-            departments.append(department)
-            locations.append(location)
+        details = steps.run("read_job_details", read_job_details)
+        departments = [department for department, _ in details]
+        locations = [location for _, location in details]
 
         assert len(departments) == len(job_items), "Departments do not match job items"
         assert len(locations) == len(job_items), "Locations do not match job items"
 
     @pytest.mark.carreers_page
-    def test_05_lever_application_redirection(self, driver):
+    def test_05_lever_application_redirection(self, driver, steps):
         """
         Test Case 5: Click the "View Role" button and check that this action 
         redirects us to the Lever Application form page
         """
         qa_careers_page = QACareersPage(driver)
+        lever_page = LeverApplicationPage(driver)
+
+        steps.run("open_qa_jobs", lambda: open_qa_jobs(qa_careers_page))
+        steps.run("filter_jobs", lambda: filter_jobs(qa_careers_page), check=len,
+                  message="No job items found to test")
+
+        def open_first_role():
+            qa_careers_page.scroll_down()
+            first_job = qa_careers_page.get_first_job_item()
+            qa_careers_page.hover_over_application_card(first_job)
+            time.sleep(2)
+            qa_careers_page.click_view_role_button(qa_careers_page.get_first_job_item())
+            return lever_page.verify_lever_redirection()
+
+        # A retry closes the half-opened Lever tab and clicks again from the filtered list
+        steps.run("lever_redirect", open_first_role, check=bool,
+                  message="Redirection to Lever application form failed")
+
+    @pytest.mark.carreers_page
+    def test_06_all_view_role_links_reach_lever(self, driver):
+        """
+        Test Case 6: Collect every "View Role" link in the filtered job list, check that all of them
+        resolve to the Lever Application form over HTTP and open a sample of them in the browser
+        """
+        qa_careers_page = QACareersPage(driver)
 
         qa_careers_page.goto_careers_page()
         qa_careers_page.wait_for_page_load()
@@ -124,18 +179,36 @@ class TestInsiderAutomation:
         qa_careers_page.apply_filters(TEST_LOCATION, TEST_DEPARTMENT)
         time.sleep(3)
 
-        job_items = qa_careers_page.get_job_items()
-        assert len(job_items) > 0, "No job items found to test"
-        first_job = job_items[0]
-
-        qa_careers_page.scroll_down()
+        links = qa_careers_page.get_view_role_links()
+        assert len(links) > 0, "No View Role links found to test"
 
-        qa_careers_page.hover_over_application_card(first_job)
-        time.sleep(2)
-        qa_careers_page.click_view_role_button(qa_careers_page.get_first_job_item())
+        # aiohttp is only needed here, keep it out of collection
+        from utils.link_checker import check_links
 
         lever_page = LeverApplicationPage(driver)
+        results = check_links(links)
+
+        broken = [result for result in results if not result.ok]
+        assert not broken, f"Broken View Role links: {broken}"
+
+        not_lever = [result for result in results if lever_page.LEVER_URL_CONTAINS not in result.final_url]
+        assert not not_lever, f"View Role links not redirecting to Lever: {not_lever}"
+
+        for link in links[:LINK_CHECK_BROWSER_SAMPLE]:
+            assert lever_page.verify_lever_url_in_new_tab(link), f"Redirection to Lever failed in browser for {link}"
+
+    def test_07_careers_funnel_step_timings(self, driver, emulation_profile, record_property):
+        """
+        Test Case 7: Run the careers funnel end to end and report how long home load, careers navigation,
+        filter application and Lever redirect take under the emulation profile
+        """
+        from utils.emulation import covers_new_windows
+        from utils.monitor import CareersFlow, NEW_WINDOW_STEPS
+
+        flow = CareersFlow(driver)
+        # The autouse fixture already dismissed the cookie banner
+        flow.cookies_accepted = True
+        timings = flow.run()
 
-        redirection_successful = lever_page.verify_lever_redirection()
-        assert redirection_successful, "Redirection to Lever application form failed"
-            
+        unthrottled = [] if covers_new_windows(driver) else list(NEW_WINDOW_STEPS)
+        record_property("step_timings", {"profile": emulation_profile, "steps": timings, "unthrottled": unthrottled})
@@ -0,0 +1,73 @@
+"""
+Tests for the concurrent link checker, run against a local aiohttp server
+"""
+import asyncio
+
+from aiohttp import web
+
+from utils.link_checker import check_links_async
+
+
+def build_app():
+    app = web.Application()
+
+    async def final(request):
+        return web.Response(text="ok")
+
+    async def redirect(request):
+        raise web.HTTPFound("/hop")
+
+    async def hop(request):
+        raise web.HTTPMovedPermanently("/final")
+
+    async def no_head(request):
+        if request.method == "HEAD":
+            raise web.HTTPMethodNotAllowed("HEAD", ["GET"])
+        return web.Response(text="ok")
+
+    async def loop(request):
+        raise web.HTTPFound("/loop")
+
+    app.router.add_route("*", "/final", final)
+    app.router.add_route("*", "/redirect", redirect)
+    app.router.add_route("*", "/hop", hop)
+    app.router.add_route("*", "/no-head", no_head)
+    app.router.add_route("*", "/loop", loop)
+    return app
+
+
+def check_against_local_server(paths):
+    async def _main():
+        runner = web.AppRunner(build_app())
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            return await check_links_async([f"http://127.0.0.1:{port}{path}" for path in paths], concurrency=2)
+        finally:
+            await runner.cleanup()
+    return asyncio.run(_main())
+
+
+class TestLinkChecker:
+    """Test class for the link checker"""
+
+    def test_redirect_chain_is_traced(self):
+        result, = check_against_local_server(["/redirect"])
+
+        assert result.ok and result.method == "HEAD"
+        assert result.final_url.endswith("/final")
+        assert [status for status, _, _ in result.redirects] == [302, 301]
+
+    def test_get_fallback_when_head_rejected(self):
+        result, = check_against_local_server(["/no-head"])
+
+        assert result.ok and result.method == "GET" and result.status == 200
+
+    def test_failures_are_reported_in_input_order(self):
+        results = check_against_local_server(["/final", "/missing", "/loop"])
+
+        assert [r.ok for r in results] == [True, False, False]
+        assert results[1].status == 404
+        assert "redirects" in results[2].error
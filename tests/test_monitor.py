@@ -0,0 +1,71 @@
+"""
+Tests for the synthetic monitor's histograms and SLO tracking
+"""
+import random
+
+import pytest
+
+from utils.histogram import LatencyHistogram, RollingHistogram
+from utils.monitor import Monitor, StepFailed
+
+
+class TestMonitor:
+    """Test class for the synthetic monitor"""
+
+    def test_histogram_percentiles_within_precision(self):
+        histogram = LatencyHistogram(significant_digits=2)
+        values = sorted(random.uniform(1, 30000) for _ in range(20000))
+        for value in values:
+            histogram.record(value)
+
+        for percentile in (50, 95, 99):
+            expected = values[int(len(values) * percentile / 100) - 1]
+            assert abs(histogram.percentile(percentile) - expected) / expected < 0.02
+        assert histogram.total_count == len(values)
+
+    def test_histogram_memory_is_fixed(self):
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+        for value in range(0, 5_000_000, 997):
+            histogram.record(value)
+
+        assert len(histogram.counts) == size
+        assert histogram.percentile(100) == 3_600_000
+
+    def test_rolling_window_drops_old_slices(self):
+        rolling = RollingHistogram(window_seconds=60, slices=6)
+        start = rolling._slice_started
+        rolling.record(100, now=start)
+        rolling.record(200, now=start + 30)
+
+        assert rolling.snapshot(now=start + 30).total_count == 2
+        assert rolling.snapshot(now=start + 65).total_count == 1
+        assert rolling.snapshot(now=start + 200).total_count == 0
+
+    def test_slo_breach_and_recovery_alert_once(self, tmp_path):
+        alert_file = tmp_path / "alerts.jsonl"
+        monitor = Monitor(slo_p95_ms={"home_load": 1000}, max_error_rate=0.5, alert_file=alert_file)
+
+        monitor.record_run({"home_load": 5000})
+        monitor.record_run({"home_load": 5000})
+        assert monitor.breaches == {"home_load_p95"}
+
+        for _ in range(100):
+            monitor.record_run({"home_load": 100})
+        assert monitor.breaches == set()
+        assert [line.count('"breach"') for line in alert_file.read_text().splitlines()] == [1, 0]
+
+    def test_failures_are_counted_per_step(self, tmp_path):
+        monitor = Monitor(slo_p95_ms={}, alert_file=tmp_path / "alerts.jsonl")
+
+        monitor.record_run({"home_load": 100, "careers_navigation": 200}, StepFailed("sections missing"))
+
+        assert monitor.slo_p95_ms == {}
+        assert monitor.failures_by_step["careers_sections"] == 1
+        metrics = monitor.render_metrics()
+        assert 'insider_flow_failures_total{step="careers_sections"} 1' in metrics
+        assert 'insider_slo_breached{slo="error_rate"} 1' in metrics
+
+    def test_unknown_slo_step_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="home_lod"):
+            Monitor(slo_p95_ms={"home_lod": 1000}, alert_file=tmp_path / "alerts.jsonl")
@@ -0,0 +1,131 @@
+"""
+Tests for per-page performance metrics, run against an in-memory fake driver
+"""
+from selenium.webdriver.common.by import By
+
+from selenium.common.exceptions import NoSuchWindowException
+
+from pages.base_page import BasePage
+from pages.lever_application_page import LeverApplicationPage
+from utils.performance_metrics import COLLECT_METRICS_JS, attach_recorder
+
+HEADER = (By.ID, "header")
+
+
+class FakeElement:
+    text = "header"
+
+    def is_displayed(self):
+        return True
+
+    def click(self):
+        pass
+
+
+class FakeDriver:
+    """Counts the round trips a metrics read costs"""
+
+    def __init__(self):
+        self.reads = []
+        self.url = "about:blank"
+
+    def get(self, url):
+        self.url = url
+
+    def find_element(self, by, value):
+        return FakeElement()
+
+    def execute_script(self, script, *args):
+        if script == COLLECT_METRICS_JS:
+            self.reads.append("script")
+            return {"url": self.url, "lcp": 1200}
+        return "complete"
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.reads.append(cmd)
+        return {"metrics": [{"name": "JSHeapUsedSize", "value": 1024}]}
+
+    def get_log(self, log_type):
+        self.reads.append(log_type)
+        return [{"message": '{"message": {"method": "Network.requestWillBeSent"}}'}]
+
+
+class TabbedDriver(FakeDriver):
+    """Fake driver whose scripts fail once the current tab is closed"""
+
+    def __init__(self):
+        super().__init__()
+        self.windows = {"main": self.url}
+        self.current_window_handle = "main"
+        self.switch_to = self
+
+    @property
+    def current_url(self):
+        return self.url
+
+    def get(self, url):
+        super().get(url)
+        self.windows[self.current_window_handle] = url
+
+    def new_window(self, kind):
+        self.current_window_handle = f"tab-{len(self.windows)}"
+        self.windows[self.current_window_handle] = self.url = "about:blank"
+
+    def window(self, handle):
+        self.current_window_handle = handle
+        self.url = self.windows[handle]
+
+    def close(self):
+        self.windows[self.current_window_handle] = None
+
+    def execute_script(self, script, *args):
+        if self.windows[self.current_window_handle] is None:
+            raise NoSuchWindowException("tab closed")
+        return super().execute_script(script, *args)
+
+
+class TestMetricsRecorder:
+    """Test class for the page metrics recorder"""
+
+    def test_actions_cost_no_round_trips_until_page_is_left(self):
+        driver = FakeDriver()
+        attach_recorder(driver)
+        page = BasePage(driver)
+
+        page.open("https://useinsider.com/")
+        for _ in range(3):
+            page.wait_for_page_load()
+        assert driver.reads == []
+
+        page.open("https://useinsider.com/careers/")
+        assert driver.reads == ["script", "Performance.getMetrics", "performance"]
+
+        home, = page.get_action_metrics()
+        assert home["url"] == "https://useinsider.com/"
+        assert [action["action"] for action in home["actions"]] == ["wait_for_page_load"] * 3
+        assert home["js_heap_used"] == 1024 and home["request_count"] == 1
+
+    def test_snapshot_reads_current_page_once(self):
+        driver = FakeDriver()
+        recorder = attach_recorder(driver)
+        page = BasePage(driver)
+        page.open("https://useinsider.com/careers/")
+        page.wait_for_page_load()
+
+        assert len(recorder.snapshot()) == len(recorder.snapshot()) == 1
+        assert len(driver.reads) == 3
+
+    def test_closed_tab_is_read_before_closing(self):
+        driver = TabbedDriver()
+        recorder = attach_recorder(driver)
+        page = LeverApplicationPage(driver)
+        page.open("https://useinsider.com/careers/quality-assurance/")
+        page.wait_for_page_load()
+
+        assert page.verify_lever_url_in_new_tab("https://jobs.lever.co/useinsider/1")
+
+        samples = recorder.snapshot()
+        assert [sample["url"] for sample in samples] == [
+            "https://useinsider.com/careers/quality-assurance/", "https://jobs.lever.co/useinsider/1"
+        ]
+        assert not any("collect_error" in sample for sample in samples)
@@ -0,0 +1,95 @@
+"""
+Tests for background driver teardown and the orphaned process reaper, using real child processes
+"""
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import psutil
+
+from utils.process_reaper import PROCESS_GROUP_KWARGS, ProcessReaper
+
+# Stands in for chromedriver: starts a "browser" child and then idles
+SPAWN_BROWSER = (
+    "import subprocess, sys, time; "
+    "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+    "time.sleep(60)"
+)
+
+
+def gone(proc):
+    """Exited, or a zombie left to an init that does not reap orphans"""
+    try:
+        return proc.status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+
+
+class FakeDriver:
+    """Driver whose service process is a real process tree"""
+
+    def __init__(self, quit_delay=0.0, crash=False):
+        self.service = SimpleNamespace(process=subprocess.Popen([sys.executable, "-c", SPAWN_BROWSER],
+                                                                **PROCESS_GROUP_KWARGS))
+        self.quit_delay = quit_delay
+        self.crash = crash
+        self.quit_calls = 0
+        # Wait until the grandchild exists so it is part of the tracked tree
+        root = psutil.Process(self.service.process.pid)
+        while not root.children():
+            time.sleep(0.01)
+        self.browser = root.children()[0]
+
+    def quit(self):
+        self.quit_calls += 1
+        time.sleep(self.quit_delay)
+        if self.crash:
+            raise RuntimeError("chromedriver unreachable")
+        # A clean quit takes the browser down, then the driver process
+        self.browser.kill()
+        self.service.process.kill()
+        self.service.process.wait()
+
+
+class TestProcessReaper:
+    """Test class for the process reaper"""
+
+    def test_quit_runs_in_background(self):
+        reaper = ProcessReaper()
+        driver = FakeDriver(quit_delay=0.5)
+        reaper.track(driver)
+
+        started = time.perf_counter()
+        reaper.quit_later(driver)
+        assert time.perf_counter() - started < 0.1
+
+        stats = reaper.reap()
+        assert driver.quit_calls == 1
+        assert stats["quits"] == 1 and stats["killed"] == 0
+
+    def test_crashed_driver_tree_is_killed_with_its_orphans(self):
+        reaper = ProcessReaper(kill_grace=2)
+        driver = FakeDriver(crash=True)
+        reaper.track(driver)
+        # The driver process dies on its own, leaving the browser orphaned
+        driver.service.process.kill()
+        driver.service.process.wait()
+
+        reaper.quit_later(driver)
+        stats = reaper.reap()
+
+        assert gone(driver.browser)
+        assert stats["quit_errors"] == 1
+        assert stats["killed"] == 1 and stats["reclaimed_bytes"] > 0
+
+    def test_drivers_never_quit_are_killed_at_session_end(self):
+        reaper = ProcessReaper(kill_grace=2)
+        driver = FakeDriver()
+        reaper.track(driver)
+
+        stats = reaper.reap()
+
+        assert driver.service.process.wait(2) is not None
+        assert gone(driver.browser)
+        assert stats["killed"] == 2
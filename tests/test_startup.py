@@ -0,0 +1,74 @@
+"""
+Startup cost checks: conftest import budget and side-effect-free configuration
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from config.config import IMPORT_TIME_BUDGET_MS
+from pages.locators import By
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("selenium", "webdriver_manager", "aiohttp", "websockets")
+PROJECT_PACKAGES = ("conftest", "config", "pages", "utils")
+COLLECT_SUITE = """
+import json, sys, pytest
+pytest.main(["--collect-only", "-q", "-s", "-p", "no:cacheprovider", "tests/test_insider_automation.py"])
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def run_python(code, cwd=ROOT, env=None):
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, capture_output=True,
+                          text=True, check=True, env=dict(os.environ, PYTHONPATH=str(ROOT), **(env or {})))
+
+
+class TestStartup:
+    """Test class for interpreter startup and collection cost"""
+
+    def test_suite_collection_within_budget(self, tmp_path):
+        result = run_python(COLLECT_SUITE, env={"INSIDER_REPORT_DIR": str(tmp_path)})
+
+        # Top-level project imports only, their cumulative time already includes what they pull in
+        cumulative = {m.group(2): int(m.group(1)) for m in re.finditer(
+            r"\|\s+(\d+) \| ((?:%s)(?:\.\w+)*)$" % "|".join(PROJECT_PACKAGES), result.stderr, re.M)}
+        assert "pages.qa_careers_page" in cumulative, "page object import time not reported"
+        total_ms = sum(cumulative.values()) / 1000
+        assert total_ms < IMPORT_TIME_BUDGET_MS, \
+            f"Collecting the suite spent {total_ms:.1f}ms importing {cumulative}, budget is {IMPORT_TIME_BUDGET_MS}ms"
+
+        modules = json.loads(result.stdout.splitlines()[-1])
+        assert "selenium.webdriver.chrome" not in modules
+        assert "psutil" not in modules
+        # The preflight only touches the report dir once a live test asks for it
+        assert list(tmp_path.iterdir()) == []
+
+    def test_page_locator_strategies_match_selenium(self):
+        from selenium.webdriver.common.by import By as SeleniumBy
+
+        strategies = [name for name in vars(SeleniumBy) if name.isupper()]
+        assert {name: getattr(By, name) for name in strategies} == \
+            {name: getattr(SeleniumBy, name) for name in strategies}
+
+    def test_conftest_does_not_import_driver_stack(self):
+        result = run_python("import sys, json, pytest, conftest; print(json.dumps(sorted(sys.modules)))")
+
+        loaded = [m for m in json.loads(result.stdout) if m.split(".")[0] in HEAVY_MODULES]
+        assert not loaded, f"Heavy modules imported eagerly: {loaded}"
+
+    def test_config_has_no_side_effects_and_honours_overrides(self, tmp_path):
+        config_file = tmp_path / "insider.json"
+        config_file.write_text(json.dumps({"IMPLICIT_WAIT": 3, "HEADLESS": True}))
+
+        result = run_python(
+            "import json; from config import config as c; "
+            "print(json.dumps([c.CAREERS_URL, c.IMPLICIT_WAIT, c.HEADLESS, c.MONITOR_SLO_P95_MS]))",
+            cwd=tmp_path,
+            env={"INSIDER_CONFIG_FILE": str(config_file), "INSIDER_BASE_URL": "http://127.0.0.1:8000",
+                 "INSIDER_HEADLESS": "false", "INSIDER_MONITOR_SLO_P95_MS": '{"flow": 1}'})
+
+        assert json.loads(result.stdout) == ["http://127.0.0.1:8000/careers", 3, False, {"flow": 1}]
+        assert list(tmp_path.iterdir()) == [config_file]
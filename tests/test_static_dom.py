@@ -0,0 +1,50 @@
+"""
+Tests for the browserless static DOM engine, run against the local fixture server
+"""
+from pathlib import Path
+
+from pages.home_page import HomePage
+from pages.careers_page import CareersPage
+from pages.locators import By
+from utils.fixture_server import FixtureServer
+from utils.static_dom import StaticDOMEngine
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class TestStaticDOM:
+    """Test class for the static DOM engine"""
+
+    def test_page_object_locators_evaluated_without_browser(self):
+        with FixtureServer(FIXTURES) as server:
+            home, careers = StaticDOMEngine().check_pages([
+                (HomePage, server.url("/home.html")),
+                (CareersPage, server.url("/careers.html")),
+            ])
+
+        assert home.ok, home
+        assert careers.found == {"locations": False, "teams": True}
+        assert careers.missing == ["locations"]
+
+    def test_xpath_css_and_id_locators(self):
+        locators = {
+            "company": HomePage.COMPANY_MENU,
+            "careers": HomePage.CAREERS_LINK,
+            "brand": (By.CLASS_NAME, "navbar-brand"),
+            "missing": (By.ID, "wt-cli-accept-all-btn"),
+        }
+        with FixtureServer(FIXTURES) as server:
+            result, = StaticDOMEngine().check_many([(server.url("/home.html"), locators)])
+
+        assert result.found == {"company": True, "careers": True, "brand": True, "missing": False}
+
+    def test_http_errors_are_reported(self):
+        routes = {"/down.html": (503, "maintenance")}
+        with FixtureServer(FIXTURES, routes=routes) as server:
+            down, missing = StaticDOMEngine().check_many([
+                (server.url("/down.html"), HomePage.STRUCTURAL_LOCATORS),
+                (server.url("/nope.html"), HomePage.STRUCTURAL_LOCATORS),
+            ])
+
+        assert not down.ok and down.error == "HTTP 503"
+        assert not missing.ok and missing.status == 404
@@ -0,0 +1,151 @@
+"""
+Tests for checkpointed step retries, run against an in-memory fake browser
+"""
+import pytest
+from selenium.common.exceptions import ElementClickInterceptedException, TimeoutException
+
+from pages.base_page import BasePage
+from pages.locators import By
+from utils.steps import StepFailed, StepFlow
+
+
+class FakeBrowser:
+    """Tracks windows and URLs like a driver would"""
+
+    def __init__(self):
+        self.windows = {"main": "https://useinsider.com/careers/quality-assurance/"}
+        self.current_window_handle = "main"
+        self.switch_to = self
+        self.loads = []
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    @property
+    def current_url(self):
+        return self.windows[self.current_window_handle]
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def close(self):
+        del self.windows[self.current_window_handle]
+
+    def get(self, url):
+        self.loads.append(url)
+        self.windows[self.current_window_handle] = url
+
+    def find_element(self, by, value):
+        pass
+
+
+class CoveredButton:
+    """Button hidden behind a cookie banner for its first few clicks"""
+
+    def __init__(self, covered_clicks):
+        self.covered_clicks = covered_clicks
+        self.clicks = 0
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.clicks += 1
+        if self.clicks <= self.covered_clicks:
+            raise ElementClickInterceptedException("cookie banner in the way")
+
+
+def flaky(failures, result=True, error=StepFailed):
+    """Action failing a given number of times before succeeding"""
+    calls = []
+
+    def action():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error("transient")
+        return result
+    action.calls = calls
+    return action
+
+
+class TestStepFlow:
+    """Test class for the step runner"""
+
+    def test_retry_resumes_at_failed_step(self):
+        flow = StepFlow(FakeBrowser(), retry_budget=2, retry_delay=0)
+        open_jobs, apply_filters = flaky(0), flaky(1, error=TimeoutException)
+
+        flow.run("open_jobs", open_jobs)
+        flow.run("apply_filters", apply_filters)
+
+        assert len(open_jobs.calls) == 1 and len(apply_filters.calls) == 2
+        assert flow.report()["apply_filters"] == {"attempts": 2, "retries": 1, "passed": True}
+
+    def test_windows_opened_by_failed_step_are_closed(self):
+        browser = FakeBrowser()
+        flow = StepFlow(browser, retry_budget=1, retry_delay=0)
+        clicks = []
+
+        def open_lever_tab():
+            clicks.append(1)
+            browser.windows[f"lever-{len(clicks)}"] = "about:blank"
+            browser.current_window_handle = f"lever-{len(clicks)}"
+            return len(clicks) > 1
+
+        assert flow.run("lever_redirect", open_lever_tab, check=bool)
+        assert browser.window_handles == ["main", "lever-2"]
+
+    def test_lost_page_reloaded_and_same_page_steps_replayed(self):
+        browser = FakeBrowser()
+        flow = StepFlow(browser, retry_budget=1, retry_delay=0)
+        listing = "https://useinsider.com/careers/open-positions/?department=qualityassurance"
+        open_jobs = flaky(0)
+        filters = flaky(0)
+
+        def navigate():
+            open_jobs()
+            browser.get(listing)
+
+        def read_details():
+            if len(filters.calls) == 1:
+                browser.get("https://useinsider.com/error")
+                raise StepFailed("job list re-rendered")
+            return True
+
+        flow.run("open_jobs", navigate)
+        flow.run("apply_filters", filters)
+        flow.run("read_details", read_details)
+
+        assert browser.loads[-1] == listing
+        assert len(open_jobs.calls) == 1 and len(filters.calls) == 2
+        assert flow.report()["read_details"]["retries"] == 1
+
+    def test_budget_is_bounded_and_bugs_are_not_retried(self):
+        flow = StepFlow(FakeBrowser(), retry_budget=2, retry_delay=0)
+        always_failing = flaky(10)
+
+        with pytest.raises(StepFailed):
+            flow.run("filter_jobs", always_failing)
+        assert len(always_failing.calls) == 3
+
+        broken = flaky(1, error=TypeError)
+        with pytest.raises(TypeError):
+            StepFlow(FakeBrowser(), retry_delay=0).run("typo", broken)
+        assert len(broken.calls) == 1
+
+    def test_click_failure_inside_step_is_retried(self):
+        browser = FakeBrowser()
+        button = CoveredButton(covered_clicks=1)
+        browser.find_element = lambda by, value: button
+        browser.execute_script = lambda script, *args: None
+        page = BasePage(browser)
+
+        flow = StepFlow(browser, retry_budget=1, retry_delay=0)
+        flow.run("open_jobs", lambda: page.click_element((By.ID, "see-all")))
+
+        assert button.clicks == 2
+        assert flow.report()["open_jobs"]["retries"] == 1
@@ -0,0 +1,68 @@
+"""
+Tests for the streaming JSON Lines reporter
+"""
+import json
+from types import SimpleNamespace
+
+from utils.streaming_report import StreamingReporter, aggregate, render_html
+
+
+def make_report(nodeid, outcome, when="call", duration=1.5, user_properties=()):
+    return SimpleNamespace(nodeid=nodeid, outcome=outcome, when=when, duration=duration,
+                           passed=outcome == "passed", failed=outcome == "failed",
+                           user_properties=list(user_properties),
+                           longrepr="AssertionError: Job list is not present" if outcome == "failed" else None)
+
+
+def write_run(path, reports, run_id):
+    reporter = StreamingReporter(str(path), run_id=run_id)
+    for report in reports:
+        reporter.pytest_runtest_logreport(report)
+    reporter.pytest_sessionfinish(None)
+
+
+class TestStreamingReport:
+    """Test class for the streaming reporter"""
+
+    def test_records_are_appended_with_artifacts_by_path(self, tmp_path):
+        stream = tmp_path / "results.jsonl"
+        write_run(stream, [
+            make_report("t::test_01", "passed", when="setup"),
+            make_report("t::test_01", "passed"),
+            make_report("t::test_03", "failed", user_properties=[("screenshot", "screenshots/test_03.png")]),
+        ], "run1")
+
+        records = [json.loads(line) for line in stream.read_text().splitlines()]
+
+        assert [r["nodeid"] for r in records] == ["t::test_01", "t::test_03"]
+        assert records[1]["artifacts"] == {"screenshot": "screenshots/test_03.png"}
+        assert "Job list" in records[1]["longrepr"]
+
+    def test_aggregate_and_render_across_runs(self, tmp_path):
+        write_run(tmp_path / "a.jsonl", [make_report("t::test_04", "passed", duration=2)], "run1")
+        write_run(tmp_path / "b.jsonl", [make_report("t::test_04", "failed", duration=4)], "run2")
+        streams = [str(tmp_path / "a.jsonl"), str(tmp_path / "b.jsonl")]
+
+        tests, run_ids = aggregate(streams)
+        assert run_ids == {"run1", "run2"}
+        assert tests["t::test_04"].outcomes["failed"] == 1
+        assert tests["t::test_04"].runs == 2
+
+        output = tmp_path / "report.html"
+        render_html(streams, str(output), failures_only=True)
+        content = output.read_text()
+        assert content.count("<td class='failed'>failed</td>") == 1
+        assert "2 run(s)" in content
+
+    def test_setup_and_teardown_failures_count_once_per_run(self, tmp_path):
+        write_run(tmp_path / "results.jsonl", [
+            make_report("t::test_05", "failed", when="setup"),
+            make_report("t::test_05", "passed"),
+            make_report("t::test_05", "failed", when="teardown"),
+            make_report("t::test_05", "passed"),
+        ], "run1")
+
+        tests, _ = aggregate([str(tmp_path / "results.jsonl")])
+
+        assert tests["t::test_05"].runs == 3
+        assert tests["t::test_05"].outcomes == {"passed": 1, "failed": 2, "skipped": 0}
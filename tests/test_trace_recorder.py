@@ -0,0 +1,199 @@
+"""
+Tests for the failure trace ring buffer, run against in-memory fake drivers
+"""
+import asyncio
+import base64
+import json
+import threading
+import time
+import zipfile
+from collections import defaultdict, deque
+from concurrent.futures import Future
+
+import websockets
+
+from utils import trace_recorder
+from utils.cdp_driver import CDPConnection, CDPDriver
+from utils.performance_metrics import MetricsRecorder
+from utils.trace_recorder import TraceRecorder
+
+FRAME = base64.b64encode(b"\xff\xd8jpeg").decode()
+
+
+def perf_entry(method, params):
+    return {"level": "INFO", "timestamp": int(time.time() * 1000),
+            "message": json.dumps({"message": {"method": method, "params": params}, "webview": "tab"})}
+
+
+class FakeWebDriver:
+    """Answers WebDriver commands and buffers logs like chromedriver"""
+
+    def __init__(self):
+        self.logs = {"performance": [], "browser": []}
+        self.commands = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        if driver_command == "executeCdpCommand" and params["cmd"] == "Page.captureScreenshot":
+            return {"value": {"data": FRAME}}
+        return {"value": None}
+
+    def get_log(self, log_type):
+        entries, self.logs[log_type] = self.logs[log_type], []
+        return entries
+
+
+class FakeCDPDriver:
+    """Delivers DevTools events to listeners like the CDP backend"""
+
+    def __init__(self):
+        self.listeners = []
+        self.acks = []
+        self.cdp_commands = []
+        self.connection = self
+
+    async def send(self, method, params=None, session_id=None):
+        return {}
+
+    def send_nowait(self, method, params=None, session_id=None):
+        self.acks.append(params["sessionId"])
+        future = Future()
+        future.set_result({})
+        return future
+
+    def add_event_listener(self, callback):
+        self.listeners.append(callback)
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.cdp_commands.append((cmd, cmd_args))
+        return {}
+
+    def get_log(self, log_type):
+        return []
+
+
+async def echo_devtools(websocket):
+    """Answer every command at once"""
+    async for raw in websocket:
+        await websocket.send(json.dumps({"id": json.loads(raw)["id"], "result": {}}))
+
+
+def echo_cdp_driver():
+    """CDPDriver connected to a local endpoint answering every command, without a launched Chrome"""
+    driver = CDPDriver.__new__(CDPDriver)
+    driver.process = None
+    driver.session_id = "tab"
+    driver._session_setup = []
+    driver._logs = defaultdict(deque)
+    driver._loop = asyncio.new_event_loop()
+    driver._thread = threading.Thread(target=driver._loop.run_forever, daemon=True)
+    driver._thread.start()
+
+    async def _connect():
+        server = await websockets.serve(echo_devtools, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        return server, await CDPConnection.connect(f"ws://127.0.0.1:{port}")
+
+    driver.server, driver.connection = driver._run(_connect())
+    return driver
+
+
+class TestTraceRecorder:
+    """Test class for the trace recorder"""
+
+    def test_commands_and_frames_kept_in_bounded_buffers(self):
+        driver = FakeWebDriver()
+        tracer = TraceRecorder(driver, size=5, max_frames=3, fps=1000, webdriver_frames=True).start()
+
+        for _ in range(10):
+            driver.execute("findElement", {"using": "css selector", "value": ".navbar"})
+            driver.execute("clickElement", {"id": "view-role"})
+            time.sleep(0.002)
+        driver.execute("quit")
+
+        assert len(tracer.entries) == 5
+        assert tracer.entries[-1]["name"] == "quit"
+        assert len(tracer.frames) == 3
+        assert driver.commands.count("executeCdpCommand") == 10
+
+    def test_passing_test_costs_no_extra_commands(self):
+        driver = FakeWebDriver()
+        TraceRecorder(driver).start()
+
+        driver.execute("findElement", {"using": "css selector", "value": ".navbar"})
+        driver.execute("clickElement", {"id": "view-role"})
+        time.sleep(0.05)
+
+        assert driver.commands == ["findElement", "clickElement"]
+
+    def test_log_drains_are_shared_with_metrics(self):
+        driver = FakeWebDriver()
+        recorder = MetricsRecorder(driver)
+        tracer = TraceRecorder(driver, fps=0.001)
+        tracer.start()
+        tracer.stop()
+
+        driver.logs["performance"] = [perf_entry("Network.requestWillBeSent", {"requestId": "1",
+                                                                                "request": {"url": "https://useinsider.com"}})]
+        driver.logs["browser"] = [{"level": "SEVERE", "timestamp": 0, "message": "Uncaught TypeError"}]
+        tracer.flush()
+
+        assert recorder._count_requests() == 1
+        kinds = {entry["kind"]: entry for entry in tracer.entries}
+        assert kinds["network"]["url"] == "https://useinsider.com"
+        assert kinds["console"]["message"] == "Uncaught TypeError"
+
+    def test_screencast_throttled_at_source(self):
+        driver = FakeCDPDriver()
+        tracer = TraceRecorder(driver, fps=20).start()
+        assert driver.cdp_commands[0][1]["everyNthFrame"] == 3
+
+        async def deliver_frames():
+            for session in range(3):
+                for listener in driver.listeners:
+                    listener("Page.screencastFrame", {"sessionId": session, "data": FRAME}, "tab")
+            # Chrome holds the next frame until the ack, which waits for the next frame to be due
+            held = list(driver.acks)
+            await asyncio.sleep(0.1)
+            return held
+
+        assert asyncio.run(deliver_frames()) == []
+        assert sorted(driver.acks) == [0, 1, 2]
+        assert len(tracer.frames) == 1
+
+    def test_pipelined_click_recorded_once(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(trace_recorder, "TRACE_DIR", tmp_path / "traces")
+        driver = echo_cdp_driver()
+        try:
+            tracer = TraceRecorder(driver).start()
+            driver._mouse_click(10, 20)
+            driver.execute_cdp_cmd("Page.bringToFront", {})
+            path = tracer.dump("test_05_lever_application_redirection")
+        finally:
+            driver._run(driver.connection.close())
+            driver.server.close()
+            driver._loop.call_soon_threadsafe(driver._loop.stop)
+
+        with zipfile.ZipFile(path) as archive:
+            entries = json.loads(archive.read("trace.json"))["entries"]
+        mouse_events = [json.loads(entry["params"])["type"] for entry in entries
+                        if entry["name"] == "Input.dispatchMouseEvent"]
+        assert mouse_events == ["mouseMoved", "mousePressed", "mouseReleased"]
+        assert [entry["name"] for entry in entries].count("Page.bringToFront") == 1
+
+    def test_written_only_on_dump(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(trace_recorder, "TRACE_DIR", tmp_path / "traces")
+        driver = FakeWebDriver()
+        tracer = TraceRecorder(driver).start()
+        driver.execute("get", {"url": "https://useinsider.com/careers/"})
+        driver.execute("clickElement", {"id": "view-role"})
+        assert not (tmp_path / "traces").exists()
+
+        path = tracer.dump("test_05_lever_application_redirection[3g-mobile]")
+
+        # The frame at the moment of failure is taken by the dump itself
+        with zipfile.ZipFile(path) as archive:
+            trace = json.loads(archive.read("trace.json"))
+            assert archive.read(trace["frames"][0]["file"]) == base64.b64decode(FRAME)
+        assert [entry["name"] for entry in trace["entries"]] == ["get", "clickElement"]
+        assert "[" not in path
@@ -0,0 +1,909 @@
+"""
+Chrome DevTools Protocol driver backend
+
+Talks to Chrome directly over a DevTools WebSocket with asyncio instead of
+going through chromedriver and the WebDriver JSON-over-HTTP protocol.
+CDPDriver exposes the subset of the Selenium WebDriver API used by the page
+objects, so they run unchanged on top of it.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+
+import websockets
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+LOG_BUFFER_SIZE = 10000
+
+# Commands scoped to one target session, replayed on every tab attached afterwards
+# so metrics, traces and emulation follow window switches and windows the page opens
+SESSION_SETUP_METHODS = ("Performance.enable", "Network.enable", "Page.addScriptToEvaluateOnNewDocument",
+                         "Page.startScreencast", "Runtime.addBinding", "Network.emulateNetworkConditions",
+                         "Emulation.setCPUThrottlingRate", "Emulation.setDeviceMetricsOverride")
+
+STALE_ERRORS = ("Could not find object with given id", "Cannot find context with specified id",
+                "Node with given id does not belong to the document")
+
+# Resolves (using, value) against `this` (document or element), waiting up to
+# `timeout` ms for a match by observing DOM mutations instead of polling
+FIND_ELEMENTS_JS = """
+function(using, value, timeout, single) {
+    const root = this;
+    const find = () => {
+        if (using === "xpath") {
+            const doc = root.ownerDocument || root;
+            const snapshot = doc.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const nodes = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+            return nodes;
+        }
+        return Array.from(root.querySelectorAll(value));
+    };
+    const done = (nodes) => single ? (nodes[0] || null) : nodes;
+    const found = find();
+    if (found.length || !timeout) return done(found);
+    return new Promise((resolve) => {
+        const observer = new MutationObserver(() => {
+            const nodes = find();
+            if (nodes.length) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(done(nodes));
+            }
+        });
+        const timer = setTimeout(() => { observer.disconnect(); resolve(done(find())); }, timeout);
+        observer.observe(root.ownerDocument || root, {childList: true, subtree: true, attributes: true});
+    });
+}
+"""
+
+ELEMENT_CENTER_JS = """
+function() {
+    this.scrollIntoView({block: "center", inline: "center"});
+    const rect = this.getBoundingClientRect();
+    return {x: rect.left + rect.width / 2, y: rect.top + rect.height / 2};
+}
+"""
+
+IS_DISPLAYED_JS = """
+function() {
+    const style = window.getComputedStyle(this);
+    const rect = this.getBoundingClientRect();
+    return style.visibility !== "hidden" && style.display !== "none" && rect.width > 0 && rect.height > 0;
+}
+"""
+
+SELECT_OPTION_JS = """
+function() {
+    const select = this.closest("select");
+    this.selected = true;
+    if (select) {
+        select.dispatchEvent(new Event("input", {bubbles: true}));
+        select.dispatchEvent(new Event("change", {bubbles: true}));
+    }
+}
+"""
+
+
+class CDPError(WebDriverException):
+    """Error returned by the browser for a DevTools command"""
+
+
+def to_css_locator(by, value):
+    """
+    Translate a locator the same way Selenium does before sending it to the browser
+
+    Args:
+        by (str): Locator strategy (By.*)
+        value (str): Locator value
+
+    Returns:
+        tuple: (using, value) where using is either "css selector" or "xpath"
+    """
+    if by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f".{value}"
+    if by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{value}"]'
+    if by == By.TAG_NAME:
+        return By.CSS_SELECTOR, value
+    if by == By.LINK_TEXT:
+        return By.XPATH, f".//a[normalize-space(.)={json.dumps(value)}]"
+    if by == By.PARTIAL_LINK_TEXT:
+        return By.XPATH, f".//a[contains(., {json.dumps(value)})]"
+    if by in (By.CSS_SELECTOR, By.XPATH):
+        return by, value
+    raise WebDriverException(f"Unsupported locator strategy: {by}")
+
+
+class CDPConnection:
+    """
+    Asynchronous DevTools connection multiplexing flattened target sessions
+
+    Commands are written to the socket as soon as they are issued, so several
+    of them can be in flight at once (see pipeline), and events are dispatched
+    to waiters instead of being polled for.
+    """
+
+    def __init__(self, websocket):
+        """
+        Initialize the connection
+
+        Args:
+            websocket: Open websocket client connection to the browser endpoint
+        """
+        self.websocket = websocket
+        self._next_id = 0
+        self._pending = {}
+        self._listeners = []
+        self._reader = asyncio.ensure_future(self._read_loop())
+
+    @classmethod
+    async def connect(cls, ws_url):
+        """
+        Open a connection to a DevTools websocket endpoint
+
+        Args:
+            ws_url (str): Browser or page websocket URL
+
+        Returns:
+            CDPConnection: Connected instance
+        """
+        websocket = await websockets.connect(ws_url, max_size=None, ping_interval=None)
+        return cls(websocket)
+
+    def send_nowait(self, method, params=None, session_id=None):
+        """
+        Write a command to the socket without waiting for its response
+
+        Args:
+            method (str): DevTools method, e.g. "Page.navigate"
+            params (dict): Command parameters
+            session_id (str): Target session to address, None for the browser
+
+        Returns:
+            asyncio.Future: Resolves with the command result
+        """
+        self._next_id += 1
+        message = {"id": self._next_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = (method, future)
+
+        def _on_written(write):
+            if not write.cancelled() and write.exception() and not future.done():
+                self._pending.pop(message["id"], None)
+                future.set_exception(WebDriverException(f"{method} not sent: {write.exception()}"))
+
+        asyncio.ensure_future(self.websocket.send(json.dumps(message))).add_done_callback(_on_written)
+        return future
+
+    async def send(self, method, params=None, session_id=None):
+        """
+        Send a command and wait for its result
+
+        Returns:
+            dict: Command result
+        """
+        return await self.send_nowait(method, params, session_id)
+
+    async def pipeline(self, commands, session_id=None):
+        """
+        Send several commands back to back and wait for all of them
+
+        Args:
+            commands (list): (method, params) tuples
+            session_id (str): Target session to address
+
+        Returns:
+            list: Results in the same order as commands
+        """
+        futures = [self.send_nowait(method, params, session_id) for method, params in commands]
+        return await asyncio.gather(*futures)
+
+    def add_listener(self, callback):
+        """
+        Register a callback invoked as callback(method, params, session_id) for every event
+
+        Args:
+            callback: Callable receiving each event
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Remove a callback registered with add_listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def expect_event(self, method, predicate=None, session_id=None):
+        """
+        Start waiting for an event before triggering the action that causes it
+
+        Args:
+            method (str): Event name, e.g. "Page.loadEventFired"
+            predicate: Optional callable(params) that must return True to match
+            session_id (str): Only match events from this session
+
+        Returns:
+            asyncio.Future: Resolves with the event params
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        def _listener(event_method, params, event_session):
+            if future.done() or event_method != method:
+                return
+            if session_id and event_session != session_id:
+                return
+            if predicate and not predicate(params):
+                return
+            future.set_result(params)
+
+        self.add_listener(_listener)
+        future.add_done_callback(lambda _: self.remove_listener(_listener))
+        return future
+
+    async def wait_for_event(self, method, predicate=None, session_id=None, timeout=None):
+        """
+        Wait for an event to be emitted
+
+        Raises:
+            TimeoutException: If the event is not received within timeout seconds
+        """
+        future = self.expect_event(method, predicate, session_id)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"Event {method} not received within {timeout} seconds")
+
+    async def close(self):
+        """Close the websocket and fail outstanding commands"""
+        self._reader.cancel()
+        await self.websocket.close()
+        self._fail_pending(WebDriverException("DevTools connection closed"))
+
+    async def _read_loop(self):
+        try:
+            async for raw in self.websocket:
+                message = json.loads(raw)
+                if "id" in message:
+                    method, future = self._pending.pop(message["id"], (None, None))
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(self._to_exception(method, message["error"]))
+                    else:
+                        future.set_result(message.get("result", {}))
+                else:
+                    for listener in list(self._listeners):
+                        listener(message.get("method"), message.get("params", {}), message.get("sessionId"))
+        except websockets.ConnectionClosed:
+            pass
+        self._fail_pending(WebDriverException("DevTools connection closed"))
+
+    def _fail_pending(self, error):
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    @staticmethod
+    def _to_exception(method, error):
+        text = error.get("message", "")
+        if any(stale in text for stale in STALE_ERRORS):
+            return StaleElementReferenceException(f"{method}: {text}")
+        return CDPError(f"{method} failed: {text} ({error.get('code')})")
+
+
+class CDPElement:
+    """WebElement-compatible handle backed by a DevTools remote object"""
+
+    def __init__(self, driver, object_id, session_id):
+        """
+        Initialize the element
+
+        Args:
+            driver (CDPDriver): Owning driver
+            object_id (str): Runtime.RemoteObject id of the DOM node
+            session_id (str): Session the object belongs to
+        """
+        self._driver = driver
+        self._object_id = object_id
+        self._session_id = session_id
+
+    @property
+    def id(self):
+        """Remote object id of the element"""
+        return self._object_id
+
+    def __eq__(self, other):
+        return isinstance(other, CDPElement) and other._object_id == self._object_id
+
+    def __hash__(self):
+        return hash(self._object_id)
+
+    def _call(self, function, *args, by_value=True):
+        return self._driver._run(self._driver._call_function(
+            self._object_id, function, args, by_value, self._session_id))
+
+    @property
+    def text(self):
+        """Visible text of the element"""
+        return self._call("function() { return this.innerText; }") or ""
+
+    @property
+    def tag_name(self):
+        """Lowercase tag name of the element"""
+        return self._call("function() { return this.tagName.toLowerCase(); }")
+
+    def get_attribute(self, name):
+        """Return the property or, failing that, the attribute with the given name"""
+        return self._call("function(n) { const p = this[n]; return p === undefined || p === null || typeof p === 'object' "
+                          "? this.getAttribute(n) : String(p); }", name)
+
+    def get_dom_attribute(self, name):
+        """Return the attribute with the given name as written in the markup"""
+        return self._call("function(n) { return this.getAttribute(n); }", name)
+
+    def is_displayed(self):
+        """Whether the element is rendered with a non-empty box"""
+        return self._call(IS_DISPLAYED_JS)
+
+    def is_enabled(self):
+        """Whether the element is not disabled"""
+        return self._call("function() { return !this.disabled; }")
+
+    def is_selected(self):
+        """Whether an option, checkbox or radio button is selected"""
+        return self._call("function() { return !!(this.selected || this.checked); }")
+
+    def click(self):
+        """Scroll the element into view and click its centre with real mouse events"""
+        if self.tag_name == "option":
+            self._call(SELECT_OPTION_JS)
+            return
+        center = self._call(ELEMENT_CENTER_JS)
+        self._driver._mouse_click(center["x"], center["y"])
+
+    def clear(self):
+        """Clear the value of a text input"""
+        self._call("function() { this.value = ''; this.dispatchEvent(new Event('input', {bubbles: true})); }")
+
+    def send_keys(self, *value):
+        """Focus the element and type text into it"""
+        self._call("function() { this.focus(); }")
+        self._driver._run(self._driver.connection.send(
+            "Input.insertText", {"text": "".join(str(v) for v in value)}, self._session_id))
+
+    def find_element(self, by=By.ID, value=None):
+        """Find the first descendant matching the locator"""
+        return self._driver._find(by, value, single=True, root=self)
+
+    def find_elements(self, by=By.ID, value=None):
+        """Find all descendants matching the locator"""
+        return self._driver._find(by, value, single=False, root=self)
+
+
+class _SwitchTo:
+    """Window switching API mirroring driver.switch_to"""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, window_name):
+        """Make the page target with the given handle current"""
+        self._driver._run(self._driver._attach(window_name))
+
+    def new_window(self, type_hint=None):
+        """Open a new tab and switch to it"""
+        result = self._driver._run(self._driver.connection.send("Target.createTarget", {
+            "url": "about:blank", "newWindow": type_hint == "window"}))
+        self.window(result["targetId"])
+
+
+class CDPDriver:
+    """
+    WebDriver-compatible driver that speaks DevTools Protocol to Chrome
+
+    All protocol traffic runs on a private asyncio loop in a background
+    thread; the synchronous methods below submit coroutines to it so page
+    objects can keep their blocking call style.
+    """
+
+    # New tabs start paused until the session setup, emulation included, is replayed on them
+    emulates_new_targets = True
+
+    def __init__(self, headless=True, window_size=(1920, 1080), binary=None, extra_args=None):
+        """
+        Launch Chrome and attach to its first tab
+
+        Args:
+            headless (bool): Whether to run in headless mode
+            window_size (tuple): Initial window width and height
+            binary (str): Chrome executable, looked up on PATH when omitted
+            extra_args (list): Additional command line switches
+        """
+        self.implicit_wait = 0
+        self.page_load_timeout = 30
+        self.process = None
+        self.connection = None
+        self.session_id = None
+        self.current_window_handle = None
+        self.switch_to = _SwitchTo(self)
+        self._handles = []
+        self._sessions = {}
+        self._ready = {}
+        self._session_setup = []
+        self._logs = {"performance": deque(maxlen=LOG_BUFFER_SIZE), "browser": deque(maxlen=LOG_BUFFER_SIZE)}
+        self._user_data_dir = tempfile.mkdtemp(prefix="insider-cdp-")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="cdp-driver", daemon=True)
+        self._thread.start()
+
+        args = [
+            binary or self.find_chrome_binary(),
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self._user_data_dir}",
+            f"--window-size={window_size[0]},{window_size[1]}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+        ]
+        if headless:
+            args.append("--headless=new")
+        args.extend(extra_args or [])
+        args.append("about:blank")
+        try:
+            self._run(self._start(args))
+        except Exception:
+            self.quit()
+            raise
+
+    @staticmethod
+    def find_chrome_binary():
+        """
+        Locate a Chrome or Chromium executable
+
+        Returns:
+            str: Path to the browser executable
+
+        Raises:
+            WebDriverException: If no browser is found
+        """
+        for name in CHROME_BINARIES:
+            path = shutil.which(name)
+            if path:
+                return path
+        raise WebDriverException(f"Chrome executable not found, tried: {', '.join(CHROME_BINARIES)}")
+
+    def _run(self, coro, timeout=None):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _start(self, args):
+        self.process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+            start_new_session=os.name == "posix")
+        ws_url = None
+        while ws_url is None:
+            line = await asyncio.wait_for(self.process.stderr.readline(), self.page_load_timeout)
+            if not line:
+                raise WebDriverException("Chrome exited before DevTools endpoint was available")
+            match = re.search(rb"DevTools listening on (ws://\S+)", line)
+            if match:
+                ws_url = match.group(1).decode()
+        # Keep draining stderr so a chatty browser never blocks on a full pipe
+        asyncio.ensure_future(self._drain(self.process.stderr))
+
+        self.connection = await CDPConnection.connect(ws_url)
+        self.connection.add_listener(self._on_event)
+        await self.connection.send("Target.setDiscoverTargets", {"discover": True})
+        await self.connection.send("Target.setAutoAttach", {
+            "autoAttach": True, "waitForDebuggerOnStart": True, "flatten": True})
+        targets = await self.connection.send("Target.getTargets")
+        self._handles = [t["targetId"] for t in targets["targetInfos"] if t["type"] == "page"]
+        await self._attach(self._handles[0])
+
+    @staticmethod
+    async def _drain(stream):
+        while await stream.readline():
+            pass
+
+    def _on_event(self, method, params, session_id):
+        timestamp = int(time.time() * 1000)
+        if session_id:
+            # Same entry shape as chromedriver's goog:loggingPrefs performance log
+            self._logs["performance"].append({"level": "INFO", "timestamp": timestamp, "message": json.dumps(
+                {"message": {"method": method, "params": params}, "webview": session_id})})
+        if method == "Runtime.consoleAPICalled":
+            text = " ".join(str(arg.get("value", arg.get("description", ""))) for arg in params.get("args", []))
+            level = "SEVERE" if params.get("type") == "error" else params.get("type", "log").upper()
+            self._logs["browser"].append({"level": level, "timestamp": timestamp, "message": text})
+        elif method == "Target.targetCreated" and params["targetInfo"]["type"] == "page":
+            target_id = params["targetInfo"]["targetId"]
+            if target_id not in self._handles:
+                self._handles.append(target_id)
+        elif method == "Target.attachedToTarget" and not session_id and params["targetInfo"]["type"] == "page":
+            self._adopt(params["targetInfo"]["targetId"], params["sessionId"])
+        elif method == "Target.targetDestroyed":
+            if params["targetId"] in self._handles:
+                self._handles.remove(params["targetId"])
+            self._sessions.pop(params["targetId"], None)
+            self._ready.pop(params["targetId"], None)
+
+    def _adopt(self, target_id, session_id):
+        """Take over a session Chrome attached automatically, preparing the tab before it runs"""
+        if target_id in self._sessions:
+            # Already attached by _attach, only let the tab go on
+            resume = asyncio.ensure_future(self.connection.send("Runtime.runIfWaitingForDebugger", None, session_id))
+            resume.add_done_callback(lambda future: future.cancelled() or future.exception())
+            return
+        if target_id not in self._handles:
+            self._handles.append(target_id)
+        self._sessions[target_id] = session_id
+        ready = self._ready[target_id] = asyncio.ensure_future(self._prepare(session_id))
+        # Awaited by _attach on a switch to the tab, errors surface there
+        ready.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+    async def _prepare(self, session_id):
+        """Replay the session setup on a paused tab, then let it start loading"""
+        try:
+            await self.connection.pipeline([("Page.enable", None), ("Runtime.enable", None)] + self._session_setup,
+                                           session_id)
+        finally:
+            await self.connection.send("Runtime.runIfWaitingForDebugger", None, session_id)
+
+    async def _attach(self, target_id):
+        if target_id not in self._handles:
+            raise NoSuchWindowException(f"No window with handle {target_id}")
+        session_id = self._sessions.get(target_id)
+        setup = []
+        ready = self._ready.pop(target_id, None)
+        if ready is not None:
+            await ready
+        if session_id is None:
+            result = await self.connection.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+            session_id = self._sessions[target_id] = result["sessionId"]
+            setup = [("Page.enable", None), ("Runtime.enable", None)] + self._session_setup
+        self.session_id = session_id
+        self.current_window_handle = target_id
+        await self.connection.pipeline(setup + [("Target.activateTarget", {"targetId": target_id})], session_id)
+
+    async def _close_target(self, target_id):
+        self._ready.pop(target_id, None)
+        session_id = self._sessions.pop(target_id, None)
+        if session_id:
+            await self.connection.send("Target.detachFromTarget", {"sessionId": session_id})
+        await self.connection.send("Target.closeTarget", {"targetId": target_id})
+
+    # WebDriver API used by the page objects
+
+    @property
+    def window_handles(self):
+        """Handles of all open tabs in creation order"""
+        return list(self._handles)
+
+    @property
+    def current_url(self):
+        """URL of the current tab"""
+        return self._evaluate("location.href")
+
+    @property
+    def title(self):
+        """Title of the current document"""
+        return self._evaluate("document.title")
+
+    def get(self, url):
+        """
+        Navigate the current tab and wait for its load event
+
+        Args:
+            url (str): URL to open
+
+        Raises:
+            TimeoutException: If the page does not load within the page load timeout
+        """
+        self._run(self._navigate(url))
+
+    async def _navigate(self, url):
+        loaded = self.connection.expect_event("Page.loadEventFired", session_id=self.session_id)
+        result = await self.connection.send("Page.navigate", {"url": url}, self.session_id)
+        if result.get("errorText"):
+            loaded.cancel()
+            raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+        try:
+            await asyncio.wait_for(loaded, self.page_load_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"Page {url} did not load within {self.page_load_timeout} seconds")
+
+    def find_element(self, by=By.ID, value=None):
+        """Find the first element matching the locator, honouring the implicit wait"""
+        return self._find(by, value, single=True)
+
+    def find_elements(self, by=By.ID, value=None):
+        """Find all elements matching the locator, honouring the implicit wait"""
+        return self._find(by, value, single=False)
+
+    def _find(self, by, value, single, root=None):
+        using, selector = to_css_locator(by, value)
+        args = ("xpath" if using == By.XPATH else "css", selector, int(self.implicit_wait * 1000), single)
+        if root is None:
+            result = self._run(self._evaluate_function("document", FIND_ELEMENTS_JS, args))
+        else:
+            result = self._run(self._call_function(root.id, FIND_ELEMENTS_JS, args, False, root._session_id))
+        if single:
+            if not isinstance(result, CDPElement):
+                raise NoSuchElementException(f"Unable to locate element: {{'method': '{by}', 'selector': '{value}'}}")
+            return result
+        return result
+
+    def execute_script(self, script, *args):
+        """
+        Run JavaScript in the current tab as the body of an anonymous function
+
+        Args:
+            script (str): Function body, may use `arguments` and `return`
+            *args: Arguments, CDPElement instances (also inside lists) are passed as DOM nodes
+
+        Returns:
+            Script return value, DOM nodes are returned as CDPElement
+        """
+        # Call arguments hold one node each, so element lists are spread and regrouped in the page
+        layout, flat = [], []
+        for arg in args:
+            if isinstance(arg, list) and any(isinstance(a, CDPElement) for a in arg):
+                layout.append(len(arg))
+                flat.extend(arg)
+            else:
+                layout.append(-1)
+                flat.append(arg)
+        function = (f"function(layout, ...flat) {{ const args = []; let i = 0; "
+                    f"for (const n of layout) {{ args.push(n < 0 ? flat[i] : flat.slice(i, i + n)); i += Math.max(n, 1); }} "
+                    f"return (function() {{ {script} }}).apply(window, args); }}")
+        element = next((a for a in flat if isinstance(a, CDPElement)), None)
+        if element is None:
+            return self._run(self._evaluate_function("window", function, [layout] + flat))
+        return self._run(self._call_function(element.id, function, [layout] + flat, False, element._session_id))
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """Send a raw DevTools command to the current tab, as Chrome WebDriver does"""
+        result = self._run(self.connection.send(cmd, cmd_args, self.session_id))
+        if cmd in SESSION_SETUP_METHODS:
+            self._session_setup.append((cmd, cmd_args))
+        return result
+
+    def pipeline(self, commands):
+        """
+        Send several DevTools commands to the current tab in one burst
+
+        Args:
+            commands (list): (method, params) tuples
+
+        Returns:
+            list: Results in command order
+        """
+        return self._run(self.connection.pipeline(commands, self.session_id))
+
+    def wait_for_event(self, method, predicate=None, timeout=None):
+        """
+        Block until the current tab emits an event
+
+        Args:
+            method (str): Event name, e.g. "Page.loadEventFired"
+            predicate: Optional callable(params) that must return True to match
+            timeout (float): Seconds to wait, defaults to the page load timeout
+
+        Returns:
+            dict: Event params
+        """
+        return self._run(self.connection.wait_for_event(
+            method, predicate, self.session_id, timeout or self.page_load_timeout))
+
+    def get_log(self, log_type):
+        """
+        Drain buffered log entries, as Chrome WebDriver does for goog:loggingPrefs
+
+        Args:
+            log_type (str): "performance" (all DevTools events) or "browser" (console)
+
+        Returns:
+            list: Entries received since the previous call
+        """
+        buffer = self._logs[log_type]
+        entries = []
+        while buffer:
+            entries.append(buffer.popleft())
+        return entries
+
+    def add_event_listener(self, callback):
+        """
+        Subscribe to all DevTools events
+
+        Args:
+            callback: Callable(method, params, session_id), invoked on the protocol thread
+        """
+        self.connection.add_listener(callback)
+
+    def execute(self, driver_command, params=None):
+        """Execute the WebDriver commands issued by ActionChains"""
+        if driver_command == Command.W3C_ACTIONS:
+            self._run(self._perform_actions(params["actions"]))
+            return {"value": None}
+        if driver_command == Command.W3C_CLEAR_ACTIONS:
+            return {"value": None}
+        raise WebDriverException(f"Command {driver_command} is not supported by the CDP backend")
+
+    def save_screenshot(self, filename):
+        """
+        Save a PNG screenshot of the viewport
+
+        Returns:
+            bool: True when the file was written
+        """
+        with open(filename, "wb") as f:
+            f.write(self.get_screenshot_as_png())
+        return True
+
+    def get_screenshot_as_png(self):
+        """Capture the viewport as PNG bytes"""
+        result = self._run(self.connection.send("Page.captureScreenshot", {"format": "png"}, self.session_id))
+        return base64.b64decode(result["data"])
+
+    def implicitly_wait(self, time_to_wait):
+        """Set how long element lookups wait for a match, in seconds"""
+        self.implicit_wait = time_to_wait
+
+    def set_page_load_timeout(self, time_to_wait):
+        """Set how long get() waits for the load event, in seconds"""
+        self.page_load_timeout = time_to_wait
+
+    def set_window_size(self, width, height, windowHandle="current"):
+        """Resize the browser window of the current tab"""
+        self._set_window_bounds({"width": width, "height": height, "windowState": "normal"})
+
+    def maximize_window(self):
+        """Maximize the browser window of the current tab"""
+        self._set_window_bounds({"windowState": "maximized"})
+
+    def _set_window_bounds(self, bounds):
+        async def _set():
+            window = await self.connection.send("Browser.getWindowForTarget", {"targetId": self.current_window_handle})
+            await self.connection.send("Browser.setWindowBounds", {"windowId": window["windowId"], "bounds": bounds})
+        try:
+            self._run(_set())
+        except CDPError as e:
+            # Headless shells may refuse window state changes; the viewport flag still applies
+            print(f"[!] Could not change window bounds: {e}")
+
+    def close(self):
+        """Close the current tab and detach its session"""
+        self._run(self._close_target(self.current_window_handle))
+
+    def quit(self):
+        """Close the browser, the connection and the background loop"""
+        async def _shutdown():
+            if self.connection:
+                try:
+                    await asyncio.wait_for(self.connection.send("Browser.close"), 5)
+                except Exception:
+                    pass
+                await self.connection.close()
+            if self.process and self.process.returncode is None:
+                try:
+                    await asyncio.wait_for(self.process.wait(), 5)
+                except asyncio.TimeoutError:
+                    self.process.kill()
+                    await self.process.wait()
+
+        try:
+            if self._loop.is_running():
+                self._run(_shutdown(), timeout=15)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+            if not self._loop.is_running():
+                self._loop.close()
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+
+    # Protocol helpers
+
+    def _evaluate(self, expression):
+        return self._run(self._evaluate_function("window", f"function() {{ return {expression}; }}", ()))
+
+    async def _evaluate_function(self, this, function, args):
+        arguments = ", ".join(json.dumps(a) for a in args)
+        result = await self.connection.send("Runtime.evaluate", {
+            "expression": f"({function}).call({this}, {arguments})",
+            "awaitPromise": True,
+        }, self.session_id)
+        return await self._unwrap(result)
+
+    async def _call_function(self, object_id, function, args, by_value, session_id=None):
+        arguments = [{"objectId": a.id} if isinstance(a, CDPElement) else {"value": a} for a in args]
+        result = await self.connection.send("Runtime.callFunctionOn", {
+            "objectId": object_id,
+            "functionDeclaration": function,
+            "arguments": arguments,
+            "returnByValue": by_value,
+            "awaitPromise": True,
+        }, session_id or self.session_id)
+        return await self._unwrap(result)
+
+    async def _unwrap(self, result):
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            text = details.get("exception", {}).get("description") or details.get("text")
+            raise WebDriverException(f"JavaScript error: {text}")
+        remote = result["result"]
+        if "value" in remote or remote["type"] == "undefined":
+            return remote.get("value")
+        if remote.get("subtype") == "null":
+            return None
+        if remote.get("subtype") == "node":
+            return CDPElement(self, remote["objectId"], self.session_id)
+        if remote.get("subtype") == "array":
+            properties = await self.connection.send("Runtime.getProperties", {
+                "objectId": remote["objectId"], "ownProperties": True}, self.session_id)
+            items = sorted((int(p["name"]), p["value"]) for p in properties["result"] if p["name"].isdigit())
+            return [await self._unwrap({"result": value}) for _, value in items]
+        if remote["type"] == "object":
+            by_value = await self.connection.send("Runtime.callFunctionOn", {
+                "objectId": remote["objectId"],
+                "functionDeclaration": "function() { return this; }",
+                "returnByValue": True,
+            }, self.session_id)
+            return by_value["result"].get("value")
+        return remote.get("description")
+
+    def _mouse_click(self, x, y):
+        base = {"x": x, "y": y, "button": "left", "clickCount": 1}
+        self.pipeline([
+            ("Input.dispatchMouseEvent", {"type": "mouseMoved", "x": x, "y": y}),
+            ("Input.dispatchMouseEvent", dict(base, type="mousePressed")),
+            ("Input.dispatchMouseEvent", dict(base, type="mouseReleased")),
+        ])
+
+    async def _perform_actions(self, sources):
+        pointer = {"x": 0, "y": 0}
+        for source in sources:
+            if source.get("type") != "pointer":
+                continue
+            for action in source["actions"]:
+                if action["type"] == "pointerMove":
+                    origin = action.get("origin")
+                    if isinstance(origin, CDPElement):
+                        center = await self._call_function(origin.id, ELEMENT_CENTER_JS, (), True, origin._session_id)
+                        pointer = {"x": center["x"] + action.get("x", 0), "y": center["y"] + action.get("y", 0)}
+                    elif origin == "pointer":
+                        pointer = {"x": pointer["x"] + action.get("x", 0), "y": pointer["y"] + action.get("y", 0)}
+                    else:
+                        pointer = {"x": action.get("x", 0), "y": action.get("y", 0)}
+                    await self.connection.send("Input.dispatchMouseEvent", dict(pointer, type="mouseMoved"),
+                                               self.session_id)
+                elif action["type"] in ("pointerDown", "pointerUp"):
+                    await self.connection.send("Input.dispatchMouseEvent", dict(
+                        pointer, button="left", clickCount=1,
+                        type="mousePressed" if action["type"] == "pointerDown" else "mouseReleased"), self.session_id)
+                elif action["type"] == "pause" and action.get("duration"):
+                    await asyncio.sleep(action["duration"] / 1000)
+
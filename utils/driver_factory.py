@@ -2,38 +2,139 @@
 WebDriver factory for creating browser instances
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from config.config import BROWSER, HEADLESS, IMPLICIT_WAIT, PAGE_LOAD_TIMEOUT
+from abc import ABC, abstractmethod
+
+from config.config import (
+    BROWSER, HEADLESS, IMPLICIT_WAIT, PAGE_LOAD_TIMEOUT, DRIVER_BACKEND, METRICS_ENABLED, EMULATION_PROFILE,
+    TRACE_ENABLED
+)
+from utils.emulation import get_profile
+from utils.performance_metrics import PERF_OBSERVER_JS, attach_recorder
+from utils.process_reaper import PROCESS_GROUP_KWARGS, get_reaper
+from utils.trace_recorder import attach_tracer
+
+
+class DriverBackend(ABC):
+    """Interface for the transports DriverFactory can create drivers with"""
+
+    name = None
+
+    @abstractmethod
+    def create_driver(self, browser_type, headless):
+        """
+        Create a driver exposing the WebDriver API used by the page objects
+
+        Args:
+            browser_type (str): Browser type (chrome)
+            headless (bool): Whether to run in headless mode
+
+        Returns:
+            Driver instance
+        """
+
+
+class WebDriverBackend(DriverBackend):
+    """Classic WebDriver over HTTP through chromedriver"""
+
+    name = "webdriver"
+
+    def create_driver(self, browser_type, headless):
+        """Create a Selenium WebDriver instance"""
+        if browser_type.lower() == "chrome":
+            return DriverFactory._create_chrome_driver(headless)
+        else:
+            raise ValueError(f"Unsupported browser type: {browser_type}")
+
+
+class CDPBackend(DriverBackend):
+    """Chrome DevTools Protocol over a WebSocket, no chromedriver involved"""
+
+    name = "cdp"
+
+    def create_driver(self, browser_type, headless):
+        """Launch Chrome and return a CDPDriver attached to it"""
+        from utils.cdp_driver import CDPDriver
+
+        if browser_type.lower() != "chrome":
+            raise ValueError(f"Unsupported browser type for {self.name} backend: {browser_type}")
+        driver = CDPDriver(headless=headless, window_size=(1920, 1080))
+        driver.implicitly_wait(IMPLICIT_WAIT)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        return driver
+
 
 class DriverFactory:
     """Factory class for creating WebDriver instances"""
-    
-    @staticmethod
-    def get_driver(browser_type=None, headless=None):
+
+    _backends = {backend.name: backend for backend in (WebDriverBackend(), CDPBackend())}
+
+    @classmethod
+    def register_backend(cls, backend):
+        """
+        Make a driver backend selectable by name
+
+        Args:
+            backend (DriverBackend): Backend instance
+        """
+        cls._backends[backend.name] = backend
+
+    @classmethod
+    def get_driver(cls, browser_type=None, headless=None, backend=None, profile=None):
         """
         Create and return a WebDriver instance
-        
+
         Args:
             browser_type (str): Browser type (chrome)
             headless (bool): Whether to run in headless mode
-            
+            backend (str): Driver backend name (webdriver, cdp)
+            profile (str): Emulation profile name (desktop, 3g-mobile, ...)
+
         Returns:
             WebDriver: Configured WebDriver instance
         """
         browser_type = browser_type or BROWSER
         headless = headless if headless is not None else HEADLESS
-        
-        if browser_type.lower() == "chrome":
-            return DriverFactory._create_chrome_driver(headless)
-        else:
-            raise ValueError(f"Unsupported browser type: {browser_type}")
-    
+        backend = backend or DRIVER_BACKEND
+        profile = get_profile(profile or EMULATION_PROFILE)
+
+        if backend not in cls._backends:
+            raise ValueError(f"Unsupported driver backend: {backend}")
+        driver = cls._backends[backend].create_driver(browser_type, headless)
+        get_reaper().track(driver)
+        profile.apply(driver)
+        if METRICS_ENABLED:
+            DriverFactory._enable_metrics(driver)
+        if TRACE_ENABLED:
+            DriverFactory._enable_trace(driver)
+        return driver
+
+    @staticmethod
+    def _enable_metrics(driver):
+        """Enable CDP Performance/Network domains and attach a metrics recorder"""
+        try:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": PERF_OBSERVER_JS})
+            attach_recorder(driver)
+        except Exception as e:
+            print(f"[!] Performance metrics unavailable: {e}")
+
+    @staticmethod
+    def _enable_trace(driver):
+        """Start the in-memory trace ring buffer dumped for failed tests"""
+        try:
+            attach_tracer(driver)
+        except Exception as e:
+            print(f"[!] Failure trace unavailable: {e}")
+
     @staticmethod
     def _create_chrome_driver(headless):
         """Create Chrome WebDriver"""
+        # Imported on first use so collection and browserless runs skip the Selenium Chrome stack
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        from selenium.webdriver.chrome.service import Service as ChromeService
+
         options = ChromeOptions()
         if headless:
             options.add_argument("--headless=new")
@@ -41,11 +142,13 @@ class DriverFactory:
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
 
         # Try to use system ChromeDriver first, then fallback to webdriver-manager
         try:
             # First try to use system ChromeDriver
-            driver = webdriver.Chrome(options=options)
+            service = ChromeService(popen_kw=dict(PROCESS_GROUP_KWARGS))
+            driver = webdriver.Chrome(service=service, options=options)
             DriverFactory._configure_driver(driver)
             driver.set_window_size(1920, 1080)
             return driver
@@ -53,6 +156,8 @@ class DriverFactory:
             print(f"System ChromeDriver not found, trying webdriver-manager: {system_error}")
             try:
                 # Use webdriver-manager as fallback
+                from webdriver_manager.chrome import ChromeDriverManager
+
                 driver_path = ChromeDriverManager().install()
                 # Ensure we get the correct executable path
                 if driver_path.endswith('/THIRD_PARTY_NOTICES.chromedriver'):
@@ -60,7 +165,7 @@ class DriverFactory:
                 elif not driver_path.endswith('.exe'):
                     driver_path = driver_path + '.exe'
                 
-                service = ChromeService(driver_path)
+                service = ChromeService(driver_path, popen_kw=dict(PROCESS_GROUP_KWARGS))
                 driver = webdriver.Chrome(service=service, options=options)
                 DriverFactory._configure_driver(driver)
                 driver.set_window_size(1920, 1080)
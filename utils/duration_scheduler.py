@@ -0,0 +1,248 @@
+"""
+Duration-aware test scheduling for pytest-xdist
+
+Per-test durations (setup + call + teardown) are kept in a small JSON store as
+exponentially decayed averages. With --duration-schedule the controller orders
+the collection longest-processing-time-first, hands each worker its LPT bin and,
+when a worker runs dry, steals the tail of the queue with the most predicted
+work left. Predicted and actual makespan are printed at the end of the run.
+
+Usage:
+    pytest -n 4 --duration-schedule
+"""
+
+import heapq
+import json
+import os
+import time
+
+import pytest
+from xdist.scheduler import WorkStealingScheduling
+from xdist.scheduler.worksteal import MIN_PENDING
+
+from config.config import DURATION_DECAY, DURATION_DEFAULT, ensure_dir
+
+
+class DurationStore:
+    """Exponentially decayed per-test durations persisted as JSON"""
+
+    def __init__(self, path, decay=DURATION_DECAY, default=DURATION_DEFAULT):
+        """
+        Initialize the store, loading existing history if present
+
+        Args:
+            path (Path): JSON file holding the history
+            decay (float): Weight of the newest run in the average (0-1]
+            default (float): Seconds assumed when nothing is known yet
+        """
+        self.path = path
+        self.decay = decay
+        self.default = default
+        self.tests = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.tests = json.load(f).get("tests", {})
+        except (OSError, ValueError) as e:
+            if os.path.exists(path):
+                print(f"[!] Ignoring unreadable duration store {path}: {e}")
+
+    def estimate(self, nodeid):
+        """
+        Predicted duration of a test
+
+        Args:
+            nodeid (str): Test node id
+
+        Returns:
+            float: Seconds; tests without history get the mean of known tests
+        """
+        entry = self.tests.get(nodeid)
+        if entry:
+            return entry["estimate"]
+        if self.tests:
+            return sum(entry["estimate"] for entry in self.tests.values()) / len(self.tests)
+        return self.default
+
+    def update(self, nodeid, duration):
+        """
+        Fold a measured duration into the history
+
+        Args:
+            nodeid (str): Test node id
+            duration (float): Measured seconds
+        """
+        entry = self.tests.get(nodeid)
+        if entry is None:
+            self.tests[nodeid] = {"estimate": duration, "runs": 1}
+        else:
+            entry["estimate"] = self.decay * duration + (1 - self.decay) * entry["estimate"]
+            entry["runs"] += 1
+
+    def save(self):
+        """Write the history atomically"""
+        ensure_dir(self.path.parent)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"tests": self.tests}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def lpt_partition(estimates, workers):
+    """
+    Partition tests across workers longest-processing-time-first
+
+    Args:
+        estimates (dict): Key -> predicted seconds
+        workers (int): Number of bins
+
+    Returns:
+        tuple: (bins, loads) where bins[i] lists keys longest first and loads[i] is their predicted sum
+    """
+    bins = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    heap = [(0.0, i) for i in range(workers)]
+    for key in sorted(estimates, key=lambda k: -estimates[k]):
+        load, i = heapq.heappop(heap)
+        bins[i].append(key)
+        loads[i] = load + estimates[key]
+        heapq.heappush(heap, (loads[i], i))
+    return bins, loads
+
+
+class DurationAwareScheduling(WorkStealingScheduling):
+    """Work-stealing scheduler with LPT initial placement and time-weighted stealing"""
+
+    def __init__(self, config, log=None, store=None):
+        super().__init__(config, log)
+        self.store = store
+        self.estimates = []
+        self.predicted_makespan = None
+        self.started = None
+        self.finished = None
+
+    def schedule(self):
+        """Place the collection on the workers by LPT, then balance by stealing"""
+        assert self.collection_is_completed
+        if self.collection is not None:
+            self.check_schedule()
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        if not self.collection:
+            return
+        self.estimates = [self.store.estimate(nodeid) for nodeid in self.collection]
+        self.started = time.monotonic()
+
+        nodes = [node for node in self.nodes if not node.shutting_down]
+        bins, loads = lpt_partition(dict(enumerate(self.estimates)), len(nodes))
+        self.predicted_makespan = max(loads)
+        for node, indices in zip(nodes, bins):
+            if indices:
+                self.node2pending[node].extend(indices)
+                node.send_runtest_some(indices)
+        self.check_schedule()
+
+    def mark_test_complete(self, node, item_index, duration=None):
+        """Record when the last test finished, for the makespan report"""
+        self.finished = time.monotonic()
+        super().mark_test_complete(node, item_index, duration)
+
+    def _remaining(self, pending):
+        """Predicted seconds of queued work, excluding the test currently running"""
+        return sum(self.estimates[i] for i in pending[1:])
+
+    def check_schedule(self):
+        """Feed idle workers from the pending pool, else steal from the most loaded queue"""
+        nodes_up = [(node, pending) for node, pending in self.node2pending.items() if not node.shutting_down]
+        idle_nodes = [node for node, pending in nodes_up if len(pending) < MIN_PENDING]
+        if not idle_nodes:
+            return
+
+        if self.pending:
+            # Tests handed back by a steal or a crashed worker: LPT them over the idle workers
+            bins, _ = lpt_partition({i: self.estimates[i] for i in self.pending}, len(idle_nodes))
+            self.pending = []
+            for node, indices in zip(idle_nodes, bins):
+                if indices:
+                    self.node2pending[node].extend(indices)
+                    node.send_runtest_some(indices)
+            idle_nodes = [node for node, pending in nodes_up if len(pending) < MIN_PENDING]
+            if not idle_nodes:
+                return
+
+        if self.steal_requested_from_node is not None:
+            return
+
+        victim, queue = max(nodes_up, key=lambda node_pending: self._remaining(node_pending[1]), default=(None, []))
+        # Take tests off the tail until about half of the victim's queued time is moved,
+        # always leaving it the running test and the next one
+        stealable = queue[MIN_PENDING:]
+        target = self._remaining(queue) / 2
+        stolen, moved = [], 0.0
+        for index in reversed(stealable):
+            if moved >= target:
+                break
+            stolen.insert(0, index)
+            moved += self.estimates[index]
+
+        if not stolen:
+            # Nothing left worth moving, let idle workers finish their last test
+            for node in idle_nodes:
+                node.shutdown()
+            return
+
+        victim.send_steal(stolen)
+        self.steal_requested_from_node = victim
+
+
+class DurationScheduler:
+    """Pytest plugin on the controller: records durations and provides the scheduler"""
+
+    def __init__(self, store, enabled=False):
+        """
+        Initialize the plugin
+
+        Args:
+            store (DurationStore): Duration history
+            enabled (bool): Replace xdist's scheduler with DurationAwareScheduling
+        """
+        self.store = store
+        self.enabled = enabled
+        self.scheduler = None
+        self.measured = {}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        """Hand xdist the duration-aware scheduler when enabled"""
+        if not self.enabled:
+            return None
+        self.scheduler = DurationAwareScheduling(config, log, store=self.store)
+        return self.scheduler
+
+    def pytest_runtest_logreport(self, report):
+        """Sum setup, call and teardown time per test"""
+        self.measured[report.nodeid] = self.measured.get(report.nodeid, 0.0) + report.duration
+        if report.when == "teardown":
+            self.store.update(report.nodeid, self.measured.pop(report.nodeid))
+
+    def pytest_sessionfinish(self, session):
+        """Persist the updated history"""
+        try:
+            self.store.save()
+        except OSError as e:
+            print(f"[!] Could not save duration store {self.store.path}: {e}")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Report predicted versus actual makespan"""
+        scheduler = self.scheduler
+        if scheduler is None or scheduler.predicted_makespan is None or scheduler.finished is None:
+            return
+        actual = scheduler.finished - scheduler.started
+        terminalreporter.write_sep("-", "duration schedule")
+        terminalreporter.write_line(
+            f"predicted makespan {scheduler.predicted_makespan:.1f}s, actual {actual:.1f}s "
+            f"over {len(scheduler.node2collection)} workers"
+        )
@@ -0,0 +1,159 @@
+"""
+Navigation-scoped cache of resolved element handles
+"""
+
+import itertools
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+DOM_CHANGED_BINDING = "__insiderDomChanged"
+
+# Run when an entry is stored on the CDP backend: watches the subtree holding
+# the nodes and reports the first element added or removed in it through a
+# DevTools binding, which drops the entry
+WATCH_JS = """
+const nodes = [].concat(arguments[0]);
+const token = arguments[1];
+const hasElement = (list) => Array.prototype.some.call(list, (node) => node.nodeType === 1);
+const observer = new MutationObserver((records) => {
+    if (!records.some((r) => hasElement(r.addedNodes) || hasElement(r.removedNodes))) return;
+    observer.disconnect();
+    window.%(binding)s(token);
+});
+observer.observe(nodes[0].parentElement || nodes[0], {childList: true, subtree: true});
+""" % {"binding": DOM_CHANGED_BINDING}
+
+
+class ElementCache:
+    """
+    Element handles keyed by (kind, locator, navigation generation)
+
+    The generation is bumped whenever the page state the handles were
+    resolved in may have changed: navigation, window switches and actions
+    that re-render the page, and on the CDP backend main frame navigation,
+    same-document route changes and new targets. Hits are answered on trust
+    and cost no round trips. On the CDP backend the subtree around each
+    stored handle is watched from the moment it is stored, and a change drops
+    the entry as it happens; on WebDriver a handle that went stale is
+    re-resolved by BasePage when it is used.
+    """
+
+    def __init__(self, driver):
+        """
+        Initialize the cache
+
+        Args:
+            driver: WebDriver instance the handles belong to
+        """
+        self.driver = driver
+        self.generation = 0
+        self.watch_dom = False
+        self.hits = 0
+        self.misses = 0
+        self.stale_retries = 0
+        self.invalidations = 0
+        self._entries = {}
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+        if hasattr(driver, "add_event_listener"):
+            self._watch_devtools(driver)
+
+    def _watch_devtools(self, driver):
+        try:
+            driver.execute_cdp_cmd("Runtime.addBinding", {"name": DOM_CHANGED_BINDING})
+            driver.add_event_listener(self._on_devtools_event)
+            self.watch_dom = True
+        except Exception as e:
+            print(f"[!] DOM mutation tracking unavailable: {e}")
+
+    def _on_devtools_event(self, method, params, session_id):
+        if method == "Runtime.bindingCalled" and params.get("name") == DOM_CHANGED_BINDING:
+            with self._lock:
+                for key, (_, token) in list(self._entries.items()):
+                    if token == params.get("payload"):
+                        del self._entries[key]
+        elif method == "Page.frameNavigated" and not params["frame"].get("parentId"):
+            self.invalidate()
+        elif method in ("Page.navigatedWithinDocument", "Target.targetCreated"):
+            self.invalidate()
+
+    def _lookup(self, kind, locator):
+        with self._lock:
+            entry = self._entries.get((kind, tuple(locator), self.generation))
+        return None if entry is None else entry[0]
+
+    def get(self, kind, locator):
+        """
+        Look up a handle resolved in the current generation
+
+        Args:
+            kind (str): "one" for find_element results, "all" for find_elements
+            locator: Element locator tuple (By, value)
+
+        Returns:
+            Cached element or list, or None on a miss
+        """
+        value = self._lookup(kind, locator)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def peek(self, kind, locator):
+        """Look up a handle without counting a hit or miss"""
+        return self._lookup(kind, locator)
+
+    def put(self, kind, locator, value):
+        """Store a handle for the current generation, watching its subtree where changes can be reported"""
+        generation = self.generation
+        token = f"{generation}-{next(self._tokens)}"
+        if self.watch_dom:
+            try:
+                self.driver.execute_script(WATCH_JS, value, token)
+            except WebDriverException:
+                # A change could not be reported, so the handle cannot be trusted either
+                return
+        with self._lock:
+            if generation == self.generation:
+                self._entries[(kind, tuple(locator), generation)] = (value, token)
+
+    def discard(self, kind, locator):
+        """Drop a handle that turned out to be stale"""
+        with self._lock:
+            self._entries.pop((kind, tuple(locator), self.generation), None)
+            self.stale_retries += 1
+
+    def invalidate(self):
+        """Start a new generation, dropping every cached handle"""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            self._entries.clear()
+
+    @property
+    def stats(self):
+        """Hit/miss counters as a dict"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_retries": self.stale_retries,
+            "invalidations": self.invalidations,
+            "generation": self.generation,
+        }
+
+
+def get_element_cache(driver):
+    """
+    Get the element cache shared by all page objects on a driver, creating it on first use
+
+    Returns:
+        ElementCache: Cache bound to the driver
+    """
+    cache = getattr(driver, "element_cache", None)
+    if cache is None:
+        cache = ElementCache(driver)
+        driver.element_cache = cache
+    return cache
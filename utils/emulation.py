@@ -0,0 +1,120 @@
+"""
+Network and CPU emulation profiles applied through the DevTools Protocol
+
+Profiles are applied when DriverFactory creates a driver. Chrome scopes
+emulation per target: the CDP backend attaches to every new tab while it is
+still paused and replays the profile before the tab loads anything, while on
+chromedriver BasePage re-applies it on each window switch, so there a window
+opened by the page loads unthrottled. covers_new_windows() tells the two apart
+so timings of such windows can be flagged.
+
+Usage:
+    pytest --emulation-profile=3g-mobile --emulation-profile=desktop
+"""
+
+
+class EmulationProfile:
+    """Named set of network, CPU and viewport overrides"""
+
+    def __init__(self, name, latency_ms=None, download_kbps=None, upload_kbps=None, cpu_slowdown=1,
+                 viewport=None):
+        """
+        Initialize the profile
+
+        Args:
+            name (str): Profile name used on the command line and in reports
+            latency_ms (float): Added round trip latency, None for no network throttling
+            download_kbps (float): Download throughput in kilobits per second
+            upload_kbps (float): Upload throughput in kilobits per second
+            cpu_slowdown (float): CPU throttling factor, 1 for none
+            viewport (tuple): (width, height) layout override, None to keep the window size
+        """
+        self.name = name
+        self.latency_ms = latency_ms
+        self.download_kbps = download_kbps
+        self.upload_kbps = upload_kbps
+        self.cpu_slowdown = cpu_slowdown
+        self.viewport = viewport
+
+    def commands(self):
+        """
+        CDP commands implementing the profile
+
+        Returns:
+            list: (method, params) tuples
+        """
+        commands = []
+        if self.latency_ms is not None:
+            commands.append(("Network.enable", {}))
+            commands.append(("Network.emulateNetworkConditions", {
+                "offline": False,
+                "latency": self.latency_ms,
+                # CDP expects bytes per second
+                "downloadThroughput": self.download_kbps * 1000 / 8,
+                "uploadThroughput": self.upload_kbps * 1000 / 8,
+            }))
+        if self.cpu_slowdown != 1:
+            commands.append(("Emulation.setCPUThrottlingRate", {"rate": self.cpu_slowdown}))
+        if self.viewport:
+            width, height = self.viewport
+            commands.append(("Emulation.setDeviceMetricsOverride", {
+                "width": width, "height": height, "deviceScaleFactor": 1, "mobile": False,
+            }))
+        return commands
+
+    def apply(self, driver):
+        """
+        Apply the profile to the driver's current window
+
+        Args:
+            driver: WebDriver or CDPDriver instance
+        """
+        for method, params in self.commands():
+            driver.execute_cdp_cmd(method, params)
+        driver.emulation_profile = self
+
+    def __repr__(self):
+        return f"EmulationProfile({self.name!r})"
+
+
+def covers_new_windows(driver):
+    """
+    Check whether windows opened by the page load under the driver's profile
+
+    Args:
+        driver: WebDriver or CDPDriver instance
+
+    Returns:
+        bool: True if new windows are throttled from their first request, or there is nothing to throttle
+    """
+    profile = getattr(driver, "emulation_profile", None)
+    return profile is None or not profile.commands() or getattr(driver, "emulates_new_targets", False)
+
+
+# Mobile profiles keep the desktop layout: a phone viewport collapses the navigation bar the page objects drive
+PROFILES = {profile.name: profile for profile in (
+    EmulationProfile("desktop"),
+    EmulationProfile("3g-mobile", latency_ms=300, download_kbps=1600, upload_kbps=750, cpu_slowdown=4),
+    EmulationProfile("slow-4g-laptop", latency_ms=150, download_kbps=4000, upload_kbps=3000, cpu_slowdown=2,
+                     viewport=(1366, 768)),
+    EmulationProfile("4x-cpu", cpu_slowdown=4),
+)}
+
+
+def get_profile(name):
+    """
+    Look up a profile by name
+
+    Args:
+        name (str): Profile name
+
+    Returns:
+        EmulationProfile: The profile
+
+    Raises:
+        ValueError: If no profile has that name
+    """
+    if name not in PROFILES:
+        raise ValueError(f"Unknown emulation profile: {name} (choose from {', '.join(PROFILES)})")
+    return PROFILES[name]
+
@@ -0,0 +1,108 @@
+"""
+Local HTTP server serving HTML fixtures for offline tests
+"""
+
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """Serves files from the fixture directory, with optional canned routes"""
+
+    def __init__(self, *args, routes=None, **kwargs):
+        self.routes = routes or {}
+        super().__init__(*args, **kwargs)
+
+    def _canned(self, send_body):
+        self.server.hits.append((self.command, self.path))
+        route = self.routes.get(self.path)
+        if route is None:
+            return False
+        status, body, *delay = route
+        if delay:
+            # Simulates a slow backend; the threaded server keeps other requests flowing
+            time.sleep(delay[0])
+        body = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+        return True
+
+    def do_GET(self):
+        if not self._canned(send_body=True):
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self._canned(send_body=False):
+            super().do_HEAD()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    Threaded HTTP server on an ephemeral localhost port
+
+    Usage:
+        with FixtureServer("tests/fixtures") as server:
+            engine.check(server.url("/home.html"), locators)
+    """
+
+    def __init__(self, directory, routes=None):
+        """
+        Initialize the server
+
+        Args:
+            directory (str): Directory whose files are served
+            routes (dict): Path -> (status, body) or (status, body, delay seconds) responses served instead of files
+        """
+        handler = partial(_FixtureHandler, directory=str(directory), routes=routes)
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.hits = []
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+
+    @property
+    def hits(self):
+        """(method, path) of every request received, in arrival order"""
+        return self.httpd.hits
+
+    @property
+    def base_url(self):
+        """Root URL of the server"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        """
+        Build an absolute URL for a path on the server
+
+        Args:
+            path (str): Path starting with "/"
+
+        Returns:
+            str: Absolute URL
+        """
+        return f"{self.base_url}{path}"
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and release its port"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,165 @@
+"""
+Target health preflight and a circuit breaker shared by all test workers
+
+Before the first test that needs the live site, the Insider pages are probed
+concurrently with a tight timeout. The verdict is written to a small JSON file
+guarded by a file lock, keyed by the pytest session, so every xdist worker of
+a run reuses it instead of probing again while concurrent runs keep their own.
+Tests short-circuit with the reason while the breaker is open, and a page
+that fails to load within the page load timeout trips it too. The verdict expires after PREFLIGHT_TTL seconds, after
+which the next test probes again, so a run recovers once the site is back.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks on Windows: workers may probe concurrently, which is harmless
+    fcntl = None
+
+from config.config import (
+    BASE_URL, CAREERS_URL, QA_CAREERS_URL, PREFLIGHT_TIMEOUT, PREFLIGHT_TTL, ensure_dir
+)
+from pages.base_page import PageLoadTimeout
+
+PREFLIGHT_URLS = (BASE_URL, CAREERS_URL, QA_CAREERS_URL)
+
+
+def probe(urls=PREFLIGHT_URLS, timeout=PREFLIGHT_TIMEOUT):
+    """
+    Check all target pages concurrently
+
+    Args:
+        urls (tuple): Pages to probe
+        timeout (float): Total timeout per request in seconds
+
+    Returns:
+        list: LinkCheckResult per URL, in input order
+    """
+    # aiohttp is only needed once a live test runs
+    from utils.link_checker import check_links
+
+    return check_links(list(urls), concurrency=len(urls), timeout=timeout)
+
+
+class CircuitBreaker:
+    """Health verdict for the target site, shared through a locked file"""
+
+    def __init__(self, path, urls=PREFLIGHT_URLS, timeout=PREFLIGHT_TIMEOUT, ttl=PREFLIGHT_TTL):
+        """
+        Initialize the breaker
+
+        Args:
+            path (Path): JSON file holding the verdict
+            urls (tuple): Pages probed by the preflight
+            timeout (float): Probe timeout per request in seconds
+            ttl (float): Seconds a verdict is trusted before probing again
+        """
+        self.path = path
+        self.urls = urls
+        self.timeout = timeout
+        self.ttl = ttl
+
+    @contextmanager
+    def _locked(self):
+        ensure_dir(self.path.parent)
+        with open(self.path.with_suffix(".lock"), "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                verdicts = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(verdicts, dict):
+            return {}
+        return {session: verdict for session, verdict in verdicts.items() if isinstance(verdict, dict)}
+
+    def _write(self, verdicts):
+        # Verdicts of finished sessions are dropped once they would have expired anyway
+        now = time.time()
+        verdicts = {session: verdict for session, verdict in verdicts.items()
+                    if now - verdict.get("checked_at", 0) < self.ttl}
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(verdicts, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def check(self, session=""):
+        """
+        Return the session's current verdict, probing the site if none is fresh
+
+        Args:
+            session (str): Id of the pytest session, shared by its xdist workers
+
+        Returns:
+            dict: {"open": bool, "reason": str, "checked_at": float, "results": list}
+        """
+        # Held during the probe, so concurrent workers wait for one verdict instead of probing too
+        with self._locked():
+            verdicts = self._read()
+            verdict = verdicts.get(session)
+            if verdict and time.time() - verdict["checked_at"] < self.ttl:
+                return verdict
+            verdicts[session] = verdict = self._verdict(probe(self.urls, self.timeout))
+            self._write(verdicts)
+            return verdict
+
+    def trip(self, reason, session=""):
+        """
+        Open the breaker without probing, e.g. after a live test timed out
+
+        Args:
+            reason (str): Why the site is considered unhealthy
+            session (str): Id of the pytest session, shared by its xdist workers
+        """
+        with self._locked():
+            verdicts = self._read()
+            verdicts[session] = {"open": True, "reason": f"Target unhealthy: {reason}",
+                                 "checked_at": time.time(), "results": []}
+            self._write(verdicts)
+
+    def record_failure(self, test_name, error, session=""):
+        """
+        Trip the breaker if a live test failed because a page did not load
+
+        Element waits timing out point at the test (a broken locator or slow
+        client rendering), not at the site, and leave the breaker alone.
+
+        Args:
+            test_name (str): Name of the failed test
+            error (Exception): Exception the test failed with
+            session (str): Id of the pytest session, shared by its xdist workers
+
+        Returns:
+            bool: True if the breaker was tripped
+        """
+        if not isinstance(error, PageLoadTimeout):
+            return False
+        self.trip(f"{test_name} failed: {error.msg}", session)
+        return True
+
+    @staticmethod
+    def _verdict(results):
+        failed = [result for result in results if not result.ok]
+        reason = "; ".join(
+            f"{result.url} {result.error or f'HTTP {result.status}'} after {result.elapsed:.1f}s" for result in failed
+        )
+        return {
+            "open": bool(failed),
+            "reason": f"Target unhealthy: {reason}" if failed else "",
+            "checked_at": time.time(),
+            "results": [{"url": result.url, "status": result.status, "error": result.error,
+                         "elapsed": round(result.elapsed, 3)} for result in results],
+        }
@@ -0,0 +1,157 @@
+"""
+Fixed-memory latency histograms for long-running monitoring
+"""
+
+import math
+import threading
+import time
+from array import array
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram with log-linear buckets
+
+    Values are recorded in microseconds. Every power-of-two range is split
+    into linear sub-buckets, so percentiles keep a bounded relative error
+    (set by significant_digits) and memory does not grow with sample count.
+    """
+
+    def __init__(self, max_value_ms=3_600_000, significant_digits=2):
+        """
+        Initialize the histogram
+
+        Args:
+            max_value_ms (int): Largest trackable latency, larger values are clamped
+            significant_digits (int): Decimal digits of precision kept per value
+        """
+        self.max_value = max_value_ms * 1000
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_half = 1 << (self.sub_bucket_bits - 1)
+        top_bucket = max(0, self.max_value.bit_length() - self.sub_bucket_bits)
+        self.counts = array("q", [0]) * ((top_bucket + 2) * self.sub_bucket_half)
+        self.total_count = 0
+        self.min_value = None
+        self.max_recorded = 0
+        self.sum = 0
+
+    def _index(self, value):
+        bucket = max(0, value.bit_length() - self.sub_bucket_bits)
+        return bucket * self.sub_bucket_half + (value >> bucket)
+
+    def _upper_bound(self, index):
+        bucket = max(0, index // self.sub_bucket_half - 1)
+        sub_bucket = index - bucket * self.sub_bucket_half
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def record(self, value_ms, count=1):
+        """
+        Record a latency
+
+        Args:
+            value_ms (float): Latency in milliseconds
+            count (int): Number of occurrences
+        """
+        value = min(max(int(value_ms * 1000), 0), self.max_value)
+        self.counts[self._index(value)] += count
+        self.total_count += count
+        self.sum += value * count
+        self.max_recorded = max(self.max_recorded, value)
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+
+    def merge(self, other):
+        """Add the counts of a histogram with the same layout into this one"""
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total_count += other.total_count
+        self.sum += other.sum
+        self.max_recorded = max(self.max_recorded, other.max_recorded)
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+
+    def reset(self):
+        """Clear all recorded values"""
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.total_count = 0
+        self.sum = 0
+        self.max_recorded = 0
+        self.min_value = None
+
+    def percentile(self, percentile):
+        """
+        Get the latency at a percentile
+
+        Args:
+            percentile (float): Percentile between 0 and 100
+
+        Returns:
+            float: Latency in milliseconds, or None if nothing was recorded
+        """
+        if not self.total_count:
+            return None
+        target = max(1, math.ceil(self.total_count * percentile / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper_bound(index), self.max_recorded) / 1000
+        return self.max_recorded / 1000
+
+    def mean(self):
+        """Mean latency in milliseconds, or None if nothing was recorded"""
+        return self.sum / self.total_count / 1000 if self.total_count else None
+
+
+class RollingHistogram:
+    """
+    Latency histogram over a sliding time window
+
+    The window is split into a fixed ring of slices; the oldest slice is
+    cleared and reused as time advances, so memory stays constant.
+    """
+
+    def __init__(self, window_seconds=3600, slices=12, **histogram_kwargs):
+        """
+        Initialize the rolling histogram
+
+        Args:
+            window_seconds (int): Length of the window
+            slices (int): Number of slices the window is divided into
+            **histogram_kwargs: Passed to each LatencyHistogram
+        """
+        self.slice_seconds = window_seconds / slices
+        self.slices = [LatencyHistogram(**histogram_kwargs) for _ in range(slices)]
+        self._histogram_kwargs = histogram_kwargs
+        self._current = 0
+        self._slice_started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _rotate(self, now):
+        elapsed = int((now - self._slice_started) // self.slice_seconds)
+        for _ in range(min(elapsed, len(self.slices))):
+            self._current = (self._current + 1) % len(self.slices)
+            self.slices[self._current].reset()
+        if elapsed:
+            self._slice_started += elapsed * self.slice_seconds
+
+    def record(self, value_ms, now=None):
+        """Record a latency in milliseconds"""
+        with self._lock:
+            self._rotate(time.monotonic() if now is None else now)
+            self.slices[self._current].record(value_ms)
+
+    def snapshot(self, now=None):
+        """
+        Merge the slices currently inside the window
+
+        Returns:
+            LatencyHistogram: Combined histogram
+        """
+        combined = LatencyHistogram(**self._histogram_kwargs)
+        with self._lock:
+            self._rotate(time.monotonic() if now is None else now)
+            for histogram in self.slices:
+                combined.merge(histogram)
+        return combined
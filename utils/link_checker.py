@@ -0,0 +1,119 @@
+"""
+Concurrent HTTP link checker for verifying job application links
+"""
+
+import asyncio
+import time
+from urllib.parse import urljoin
+
+import aiohttp
+
+from config.config import LINK_CHECK_CONCURRENCY, LINK_CHECK_TIMEOUT, LINK_CHECK_MAX_REDIRECTS
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class LinkCheckResult:
+    """Outcome of checking a single URL"""
+
+    def __init__(self, url):
+        """
+        Initialize the result
+
+        Args:
+            url (str): URL that was checked
+        """
+        self.url = url
+        self.final_url = url
+        self.status = None
+        self.method = "HEAD"
+        self.redirects = []
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        """True if the final response was successful"""
+        return self.error is None and self.status is not None and self.status < 400
+
+    def __repr__(self):
+        return (f"LinkCheckResult(url={self.url!r}, status={self.status}, final_url={self.final_url!r}, "
+                f"method={self.method}, redirects={len(self.redirects)}, error={self.error!r})")
+
+
+async def _trace(session, url, method, max_redirects, result):
+    """Follow redirects manually so every hop is recorded"""
+    current = url
+    for _ in range(max_redirects + 1):
+        async with session.request(method, current, allow_redirects=False) as response:
+            if response.status in REDIRECT_STATUSES and "Location" in response.headers:
+                location = urljoin(current, response.headers["Location"])
+                result.redirects.append((response.status, current, location))
+                current = location
+                continue
+            result.status = response.status
+            result.final_url = current
+            return
+    raise aiohttp.ClientError(f"More than {max_redirects} redirects from {url}")
+
+
+async def check_link(session, url, semaphore, max_redirects=LINK_CHECK_MAX_REDIRECTS):
+    """
+    Check a URL with HEAD, falling back to GET when HEAD is rejected
+
+    Args:
+        session: aiohttp ClientSession shared by all checks
+        url (str): URL to check
+        semaphore: asyncio.Semaphore bounding concurrent requests
+        max_redirects (int): Maximum redirect hops to follow
+
+    Returns:
+        LinkCheckResult: Check outcome
+    """
+    result = LinkCheckResult(url)
+    started = time.perf_counter()
+    async with semaphore:
+        try:
+            await _trace(session, url, "HEAD", max_redirects, result)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            result.error = f"HEAD failed: {e!r}"
+        # Some servers refuse or mishandle HEAD, so confirm failures with GET
+        if not result.ok:
+            result.method = "GET"
+            result.redirects = []
+            result.error = None
+            try:
+                await _trace(session, url, "GET", max_redirects, result)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                result.error = f"GET failed: {e!r}"
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def check_links_async(urls, concurrency=LINK_CHECK_CONCURRENCY, timeout=LINK_CHECK_TIMEOUT):
+    """
+    Check many URLs concurrently over pooled connections
+
+    Args:
+        urls (list): URLs to check
+        concurrency (int): Maximum number of requests in flight
+        timeout (float): Total timeout per request in seconds
+
+    Returns:
+        list: LinkCheckResult for each URL, in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        return await asyncio.gather(*(check_link(session, url, semaphore) for url in urls))
+
+
+def check_links(urls, concurrency=LINK_CHECK_CONCURRENCY, timeout=LINK_CHECK_TIMEOUT):
+    """
+    Blocking wrapper around check_links_async for use from tests
+
+    Returns:
+        list: LinkCheckResult for each URL, in input order
+    """
+    return asyncio.run(check_links_async(urls, concurrency, timeout))
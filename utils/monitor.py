@@ -0,0 +1,392 @@
+"""
+Synthetic monitoring daemon for the Insider careers funnel
+
+Keeps warm browser sessions and runs the HomePage -> CareersPage ->
+QACareersPage -> LeverApplicationPage flow on a schedule, recording step
+latencies into rolling histograms, serving them on a local metrics
+endpoint and alerting locally when an SLO is breached.
+
+Usage:
+    python -m utils.monitor --interval 300 --workers 2 --port 9464
+"""
+
+import argparse
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.config import (
+    BROWSER,
+    HEADLESS,
+    DRIVER_BACKEND,
+    TEST_LOCATION,
+    TEST_DEPARTMENT,
+    REPORT_DIR,
+    MONITOR_INTERVAL,
+    MONITOR_WORKERS,
+    MONITOR_METRICS_PORT,
+    MONITOR_WINDOW_SECONDS,
+    MONITOR_WINDOW_SLICES,
+    MONITOR_SLO_P95_MS,
+    MONITOR_MAX_ERROR_RATE,
+)
+from pages.home_page import HomePage
+from pages.careers_page import CareersPage
+from pages.qa_careers_page import QACareersPage
+from pages.lever_application_page import LeverApplicationPage
+from utils.driver_factory import DriverFactory
+from utils.emulation import covers_new_windows
+from utils.histogram import RollingHistogram
+from utils.process_reaper import get_reaper
+from utils.steps import StepFailed
+
+FLOW_STEPS = ("home_load", "careers_navigation", "careers_sections", "qa_jobs_filter", "lever_redirect")
+# Steps timing a window the page opens, which chromedriver cannot throttle before it loads
+NEW_WINDOW_STEPS = ("lever_redirect",)
+QUANTILES = (50, 90, 95, 99)
+
+
+class CareersFlow:
+    """The careers funnel as a sequence of timed steps on one warm driver"""
+
+    def __init__(self, driver):
+        """
+        Initialize the flow
+
+        Args:
+            driver: WebDriver instance reused across runs
+        """
+        self.driver = driver
+        self.cookies_accepted = False
+
+    @contextmanager
+    def _step(self, name, timings):
+        started = time.perf_counter()
+        yield
+        timings[name] = (time.perf_counter() - started) * 1000
+
+    def run(self):
+        """
+        Run the flow once
+
+        Returns:
+            dict: Step name -> latency in milliseconds for the completed steps
+
+        Raises:
+            StepFailed: If a step's verification fails (timings so far are attached)
+        """
+        timings = {}
+        try:
+            self._run(timings)
+        except Exception as e:
+            e.timings = timings
+            raise
+        finally:
+            self._reset()
+        return timings
+
+    def _run(self, timings):
+        home_page = HomePage(self.driver)
+        with self._step("home_load", timings):
+            home_page.goto_home_page()
+            home_page.wait_for_page_load()
+            if not home_page.is_home_page_opened():
+                raise StepFailed("home_load: Insider home page is not opened")
+        if not self.cookies_accepted:
+            try:
+                home_page.accept_cookie()
+            except Exception:
+                pass
+            self.cookies_accepted = True
+
+        careers_page = CareersPage(self.driver)
+        with self._step("careers_navigation", timings):
+            if not home_page.navigate_to_careers():
+                raise StepFailed("careers_navigation: failed to navigate to careers page")
+            careers_page.wait_for_page_load()
+            if not careers_page.is_careers_page_opened():
+                raise StepFailed("careers_navigation: careers page is not opened")
+
+        with self._step("careers_sections", timings):
+            if not careers_page.are_all_sections_visible():
+                raise StepFailed("careers_sections: not all sections are visible")
+
+        qa_careers_page = QACareersPage(self.driver)
+        with self._step("qa_jobs_filter", timings):
+            qa_careers_page.goto_careers_page()
+            qa_careers_page.wait_for_page_load()
+            qa_careers_page.click_see_all_qa_jobs()
+            qa_careers_page.wait_for_page_load()
+            qa_careers_page.apply_filters(TEST_LOCATION, TEST_DEPARTMENT)
+            if not qa_careers_page.is_job_list_present():
+                raise StepFailed("qa_jobs_filter: job list is not present after filtering")
+
+        with self._step("lever_redirect", timings):
+            first_job = qa_careers_page.get_first_job_item()
+            qa_careers_page.hover_over_application_card(first_job)
+            qa_careers_page.click_view_role_button(first_job)
+            if not LeverApplicationPage(self.driver).verify_lever_redirection():
+                raise StepFailed("lever_redirect: redirection to Lever application form failed")
+
+    def _reset(self):
+        """Close windows opened by the flow so the next run starts from one tab"""
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+        except Exception as e:
+            print(f"[!] Error resetting monitor driver: {e}")
+
+
+class Monitor:
+    """Runs the careers flow on warm drivers and tracks SLOs"""
+
+    def __init__(self, interval=MONITOR_INTERVAL, workers=MONITOR_WORKERS, backend=DRIVER_BACKEND,
+                 slo_p95_ms=None, max_error_rate=MONITOR_MAX_ERROR_RATE, alert_file=None, profile=None):
+        """
+        Initialize the monitor
+
+        Args:
+            interval (float): Seconds between the starts of consecutive runs per worker
+            workers (int): Number of warm drivers running the flow in parallel
+            backend (str): Driver backend name
+            slo_p95_ms (dict): Step name (or "flow") -> p95 latency objective in milliseconds
+            max_error_rate (float): Highest acceptable failure ratio inside the window
+            alert_file (Path): JSON Lines file alerts are appended to
+            profile (str): Emulation profile the drivers run under
+
+        Raises:
+            ValueError: If an SLO names neither a flow step nor "flow"
+        """
+        self.interval = interval
+        self.workers = workers
+        self.backend = backend
+        self.profile = profile
+        # An empty dict turns latency SLOs off, only None falls back to the configured ones
+        self.slo_p95_ms = MONITOR_SLO_P95_MS if slo_p95_ms is None else slo_p95_ms
+        unknown = set(self.slo_p95_ms) - set(FLOW_STEPS + ("flow",))
+        if unknown:
+            raise ValueError(f"Unknown SLO step: {', '.join(sorted(unknown))} "
+                             f"(choose from {', '.join(FLOW_STEPS + ('flow',))})")
+        self.max_error_rate = max_error_rate
+        self.alert_file = alert_file or REPORT_DIR / "monitor_alerts.jsonl"
+        self.histograms = {name: RollingHistogram(MONITOR_WINDOW_SECONDS, MONITOR_WINDOW_SLICES)
+                           for name in FLOW_STEPS + ("flow",)}
+        # Failures and runs are tracked as histograms too, so they share the same window
+        self.outcomes = {"success": RollingHistogram(MONITOR_WINDOW_SECONDS, MONITOR_WINDOW_SLICES),
+                         "failure": RollingHistogram(MONITOR_WINDOW_SECONDS, MONITOR_WINDOW_SLICES)}
+        self.failures_by_step = {name: 0 for name in FLOW_STEPS}
+        self.breaches = set()
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def record_run(self, timings, error=None):
+        """
+        Record the outcome of one flow run and evaluate SLOs
+
+        Args:
+            timings (dict): Step name -> latency in milliseconds
+            error (Exception): Failure raised by the run, if any
+        """
+        for name, latency in timings.items():
+            self.histograms[name].record(latency)
+        total = sum(timings.values())
+        if error is None:
+            self.histograms["flow"].record(total)
+            self.outcomes["success"].record(total)
+        else:
+            failed_step = next((name for name in FLOW_STEPS if name not in timings), FLOW_STEPS[-1])
+            with self._lock:
+                self.failures_by_step[failed_step] += 1
+            self.outcomes["failure"].record(total)
+            print(f"[!] Monitor run failed at {failed_step}: {error}")
+        self.check_slos()
+
+    def check_slos(self):
+        """Raise an alert when an SLO starts being breached and when it recovers"""
+        current = {}
+        for name, objective in self.slo_p95_ms.items():
+            p95 = self.histograms[name].snapshot().percentile(95)
+            if p95 is not None:
+                current[f"{name}_p95"] = (p95 > objective, f"{name} p95 {p95:.0f}ms (objective {objective}ms)")
+        successes = self.outcomes["success"].snapshot().total_count
+        failures = self.outcomes["failure"].snapshot().total_count
+        if successes + failures:
+            error_rate = failures / (successes + failures)
+            current["error_rate"] = (error_rate > self.max_error_rate,
+                                     f"error rate {error_rate:.1%} (objective {self.max_error_rate:.1%})")
+
+        with self._lock:
+            for key, (breached, detail) in current.items():
+                if breached and key not in self.breaches:
+                    self.breaches.add(key)
+                    self.alert("breach", key, detail)
+                elif not breached and key in self.breaches:
+                    self.breaches.discard(key)
+                    self.alert("recovered", key, detail)
+
+    def alert(self, state, slo, detail):
+        """
+        Emit a local alert
+
+        Args:
+            state (str): "breach" or "recovered"
+            slo (str): SLO key
+            detail (str): Human readable measurement
+        """
+        print(f"[!] SLO {state}: {detail}")
+        self.alert_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.alert_file, "a") as f:
+            f.write(json.dumps({"timestamp": time.time(), "state": state, "slo": slo, "detail": detail}) + "\n")
+
+    def render_metrics(self):
+        """
+        Render current metrics in Prometheus text format
+
+        Returns:
+            str: Metrics exposition
+        """
+        lines = [
+            "# HELP insider_flow_step_latency_ms Careers flow step latency over the rolling window",
+            "# TYPE insider_flow_step_latency_ms summary",
+        ]
+        for name, rolling in self.histograms.items():
+            histogram = rolling.snapshot()
+            for quantile in QUANTILES:
+                value = histogram.percentile(quantile)
+                if value is not None:
+                    lines.append(f'insider_flow_step_latency_ms{{step="{name}",quantile="{quantile / 100}"}} {value}')
+            lines.append(f'insider_flow_step_latency_ms_count{{step="{name}"}} {histogram.total_count}')
+            lines.append(f'insider_flow_step_latency_ms_sum{{step="{name}"}} {histogram.sum / 1000}')
+        lines.append("# TYPE insider_flow_runs gauge")
+        for outcome, rolling in self.outcomes.items():
+            lines.append(f'insider_flow_runs{{outcome="{outcome}"}} {rolling.snapshot().total_count}')
+        lines.append("# TYPE insider_flow_failures_total counter")
+        with self._lock:
+            for name, count in self.failures_by_step.items():
+                lines.append(f'insider_flow_failures_total{{step="{name}"}} {count}')
+            breaches = sorted(self.breaches)
+        lines.append("# TYPE insider_slo_breached gauge")
+        for key in breaches:
+            lines.append(f'insider_slo_breached{{slo="{key}"}} 1')
+        return "\n".join(lines) + "\n"
+
+    def serve_metrics(self, port=MONITOR_METRICS_PORT):
+        """
+        Serve /metrics and /healthz on localhost in a background thread
+
+        Returns:
+            ThreadingHTTPServer: Running server
+        """
+        monitor = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = monitor.render_metrics().encode()
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/healthz":
+                    body = json.dumps({"breaches": sorted(monitor.breaches)}).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="monitor-metrics", daemon=True).start()
+        return server
+
+    def _worker(self, index, iterations):
+        driver = None
+        flow = None
+        runs = 0
+        next_run = time.monotonic()
+        while not self.stop_event.is_set() and (iterations is None or runs < iterations):
+            try:
+                if driver is None:
+                    driver = DriverFactory.get_driver(BROWSER, HEADLESS, self.backend, self.profile)
+                    flow = CareersFlow(driver)
+                    if not covers_new_windows(driver):
+                        print(f"[!] The {self.backend} backend cannot throttle windows the page opens, "
+                              f"{', '.join(NEW_WINDOW_STEPS)} is measured without the emulation profile")
+                timings = flow.run()
+                self.record_run(timings)
+            except Exception as e:
+                self.record_run(getattr(e, "timings", {}), e)
+                if not isinstance(e, StepFailed) and driver is not None:
+                    # The session itself may be broken, start a fresh one next time
+                    get_reaper().quit_later(driver)
+                    driver = None
+            runs += 1
+            next_run += self.interval
+            self.stop_event.wait(max(0, next_run - time.monotonic()))
+        if driver is not None:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"[!] Error closing driver: {e}")
+
+    def run(self, iterations=None):
+        """
+        Run the workers until stopped or each has completed the given number of runs
+
+        Args:
+            iterations (int): Runs per worker, None to run forever
+        """
+        threads = [threading.Thread(target=self._worker, args=(index, iterations), name=f"monitor-worker-{index}")
+                   for index in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(1)
+        except KeyboardInterrupt:
+            print("Stopping monitor...")
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Synthetic monitoring of the Insider careers flow")
+    parser.add_argument("--interval", type=float, default=MONITOR_INTERVAL, help="Seconds between runs per worker")
+    parser.add_argument("--workers", type=int, default=MONITOR_WORKERS, help="Number of warm drivers")
+    parser.add_argument("--port", type=int, default=MONITOR_METRICS_PORT, help="Local metrics endpoint port")
+    parser.add_argument("--backend", default=DRIVER_BACKEND, help="Driver backend: webdriver or cdp")
+    parser.add_argument("--profile", default=None, help="Emulation profile: desktop, 3g-mobile, slow-4g-laptop, 4x-cpu")
+    parser.add_argument("--iterations", type=int, default=None, help="Stop after this many runs per worker")
+    args = parser.parse_args(argv)
+
+    monitor = Monitor(interval=args.interval, workers=args.workers, backend=args.backend, profile=args.profile)
+    server = monitor.serve_metrics(args.port)
+    print(f"Serving metrics on http://127.0.0.1:{args.port}/metrics")
+    try:
+        monitor.run(args.iterations)
+    finally:
+        server.shutdown()
+        stats = get_reaper().reap()
+        if stats["killed"]:
+            print(f"Killed {stats['killed']} leftover browser processes, "
+                  f"reclaimed {stats['reclaimed_bytes'] / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Per-page browser performance metrics covering the page object actions taken on each page
+
+Actions are timed locally and cost no round trips. The in-page observer
+accumulates LCP and long tasks meanwhile, and the page is read once (navigation
+timing, Performance.getMetrics and a log drain) when BasePage leaves it by
+navigating or switching windows, or when the samples are collected for the
+report. Actions that navigate by clicking are attributed to the page they land on.
+"""
+
+import functools
+import json
+import time
+from collections import deque
+
+from config.config import METRICS_BUFFER_SIZE
+
+# Installed on every new document so LCP and long tasks observed before the
+# first metrics read are not lost
+PERF_OBSERVER_JS = """
+window.__insiderPerf = {lcp: 0, longTaskCount: 0, longTaskTime: 0};
+try {
+    new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) window.__insiderPerf.lcp = entry.renderTime || entry.loadTime;
+    }).observe({type: "largest-contentful-paint", buffered: true});
+    new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) {
+            window.__insiderPerf.longTaskCount += 1;
+            window.__insiderPerf.longTaskTime += entry.duration;
+        }
+    }).observe({type: "longtask", buffered: true});
+} catch (e) {}
+"""
+
+COLLECT_METRICS_JS = """
+const nav = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+const perf = window.__insiderPerf || {};
+let transferSize = nav ? nav.transferSize : 0;
+for (const entry of resources) transferSize += entry.transferSize;
+return {
+    url: location.href,
+    ttfb: nav ? nav.responseStart : null,
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav ? nav.loadEventEnd : null,
+    lcp: perf.lcp || null,
+    long_task_count: perf.longTaskCount || 0,
+    long_task_time: perf.longTaskTime || 0,
+    resource_count: resources.length,
+    transfer_size: transferSize
+};
+"""
+
+class LogTap:
+    """Shares destructive get_log() drains between every consumer of a driver's logs"""
+
+    def __init__(self, driver):
+        """
+        Initialize the tap
+
+        Args:
+            driver: WebDriver instance with goog:loggingPrefs enabled
+        """
+        self.driver = driver
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        """
+        Receive every drained batch
+
+        Args:
+            callback: Callable(log_type, entries)
+        """
+        self.subscribers.append(callback)
+
+    def drain(self, log_type):
+        """
+        Drain a log and hand the entries to all subscribers
+
+        Args:
+            log_type (str): "performance" or "browser"
+
+        Returns:
+            list: Entries received since the previous drain
+        """
+        entries = self.driver.get_log(log_type)
+        for callback in list(self.subscribers):
+            callback(log_type, entries)
+        return entries
+
+
+def get_log_tap(driver):
+    """
+    Get the log tap of a driver, creating it on first use
+
+    Returns:
+        LogTap: Tap bound to the driver
+    """
+    tap = getattr(driver, "log_tap", None)
+    if tap is None:
+        tap = LogTap(driver)
+        driver.log_tap = tap
+    return tap
+
+
+class MetricsRecorder:
+    """Ring buffer of per-page metrics samples, each listing the actions taken on the page"""
+
+    def __init__(self, driver, size=METRICS_BUFFER_SIZE):
+        """
+        Initialize the recorder
+
+        Args:
+            driver: WebDriver instance with performance logging enabled
+            size (int): Maximum number of samples kept
+        """
+        self.driver = driver
+        self.samples = deque(maxlen=size)
+        self.in_action = False
+        self.pending = []
+        self._requests = 0
+        # Other consumers may drain the log between samples, so count every batch
+        get_log_tap(driver).subscribe(self._on_log)
+
+    def _on_log(self, log_type, entries):
+        if log_type == "performance":
+            self._requests += sum('"Network.requestWillBeSent"' in entry["message"] for entry in entries)
+
+    def _count_requests(self):
+        """Drain the performance log and count network requests issued since the previous sample"""
+        try:
+            get_log_tap(self.driver).drain("performance")
+        except Exception:
+            return None
+        count, self._requests = self._requests, 0
+        return count
+
+    def record(self, action, duration, page=None, error=None):
+        """
+        Record a finished action on the current page, without touching the browser
+
+        Args:
+            action (str): Action name, e.g. "click_element"
+            duration (float): Wall time of the action in seconds
+            page (str): Page object class the action ran on
+            error (Exception): Exception raised by the action, if any
+        """
+        self.pending.append({
+            "action": action,
+            "page": page,
+            "timestamp": time.time(),
+            "duration_ms": round(duration * 1000, 1),
+            "error": repr(error) if error else None,
+        })
+
+    def read_page(self):
+        """Read the current page's metrics and file the actions recorded since the previous read under it"""
+        if not self.pending:
+            return
+        started = time.perf_counter()
+        sample = {"actions": self.pending}
+        self.pending = []
+        try:
+            sample.update(self.driver.execute_script(COLLECT_METRICS_JS) or {})
+        except Exception as e:
+            sample["collect_error"] = repr(e)
+        try:
+            metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+            metrics = {metric["name"]: metric["value"] for metric in metrics}
+            sample["js_heap_used"] = metrics.get("JSHeapUsedSize")
+            sample["script_duration"] = metrics.get("ScriptDuration")
+        except Exception as e:
+            sample["collect_error"] = repr(e)
+        sample["request_count"] = self._count_requests()
+        sample["collect_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.samples.append(sample)
+
+    def snapshot(self):
+        """
+        Read the current page if it has unread actions, then copy the samples in the buffer
+
+        Returns:
+            list: Samples, oldest first
+        """
+        self.read_page()
+        return list(self.samples)
+
+    def to_json(self):
+        """Serialize the buffer for attaching to a test report"""
+        return json.dumps(self.snapshot(), indent=2)
+
+
+def attach_recorder(driver, size=METRICS_BUFFER_SIZE):
+    """
+    Start recording page object action metrics for a driver
+
+    Returns:
+        MetricsRecorder: Recorder bound to the driver
+    """
+    recorder = MetricsRecorder(driver, size)
+    driver.metrics_recorder = recorder
+    return recorder
+
+
+def get_recorder(driver):
+    """
+    Get the recorder attached to a driver
+
+    Returns:
+        MetricsRecorder: Attached recorder, or None if metrics are not enabled
+    """
+    return getattr(driver, "metrics_recorder", None)
+
+
+def measured(func):
+    """Decorator timing a BasePage action for the metrics of the page it ran on"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        recorder = get_recorder(self.driver)
+        # Nested measured calls are sampled once, by the outermost action
+        if recorder is None or recorder.in_action:
+            return func(self, *args, **kwargs)
+        recorder.in_action = True
+        started = time.perf_counter()
+        error = None
+        try:
+            return func(self, *args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            recorder.in_action = False
+            recorder.record(func.__name__, time.perf_counter() - started, type(self).__name__, error)
+    return wrapper
@@ -0,0 +1,238 @@
+"""
+Background driver teardown and orphaned browser process reaper
+
+Drivers are quit on a background thread so the next test can start while Chrome
+shuts down. Every driver created by DriverFactory is tracked by the PID of the
+process it spawned (chromedriver or Chrome itself), started in its own process
+group. Whatever is still alive after quit, at session end or on SIGTERM/SIGHUP
+is killed together with its process group, and the memory it held is reported.
+"""
+
+import os
+import queue
+import signal
+import threading
+import time
+
+import psutil
+
+from config.config import REAPER_KILL_GRACE, REAPER_QUIT_TIMEOUT
+
+# Popen keyword arguments putting a spawned browser stack in its own process group
+PROCESS_GROUP_KWARGS = {"start_new_session": True} if os.name == "posix" else {}
+
+_reaper = None
+
+
+def driver_pid(driver):
+    """
+    PID of the process a driver spawned
+
+    Args:
+        driver: WebDriver (chromedriver service) or CDPDriver (Chrome process)
+
+    Returns:
+        int: PID, or None if the driver did not spawn one
+    """
+    process = getattr(getattr(driver, "service", None), "process", None) or getattr(driver, "process", None)
+    return getattr(process, "pid", None)
+
+
+def _alive(proc):
+    try:
+        return proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def _wait_gone(procs, timeout):
+    """Wait until processes exit or turn into zombies, return the ones still alive"""
+    deadline = time.monotonic() + timeout
+    alive = [proc for proc in procs if _alive(proc)]
+    while alive and time.monotonic() < deadline:
+        time.sleep(0.05)
+        alive = [proc for proc in alive if _alive(proc)]
+    return alive
+
+
+class ProcessReaper:
+    """Quits drivers in the background and kills the processes they leave behind"""
+
+    def __init__(self, quit_timeout=REAPER_QUIT_TIMEOUT, kill_grace=REAPER_KILL_GRACE):
+        """
+        Initialize the reaper
+
+        Args:
+            quit_timeout (float): Seconds reap() waits for queued quits before killing
+            kill_grace (float): Seconds between SIGTERM and SIGKILL
+        """
+        self.quit_timeout = quit_timeout
+        self.kill_grace = kill_grace
+        self.stats = {"quits": 0, "quit_errors": 0, "killed": 0, "reclaimed_bytes": 0}
+        self._tracked = {}
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def track(self, driver):
+        """
+        Remember the process tree root of a new driver
+
+        Args:
+            driver: Driver instance returned by a backend
+        """
+        pid = driver_pid(driver)
+        if pid is None:
+            return
+        try:
+            # psutil.Process remembers the create time, so a recycled PID is never mistaken for ours
+            with self._lock:
+                self._tracked[pid] = psutil.Process(pid)
+        except psutil.NoSuchProcess:
+            pass
+
+    def quit_later(self, driver):
+        """
+        Hand a driver to the background thread and return immediately
+
+        Args:
+            driver: Driver to quit
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="driver-reaper", daemon=True)
+                self._thread.start()
+        self._queue.put(driver)
+
+    def _run(self):
+        while True:
+            driver = self._queue.get()
+            try:
+                if driver is None:
+                    return
+                self._quit(driver)
+            finally:
+                self._queue.task_done()
+
+    def _quit(self, driver):
+        pid = driver_pid(driver)
+        with self._lock:
+            root = self._tracked.get(pid)
+        # Chrome is reparented once chromedriver exits, so take the tree before quitting
+        tree = self._tree(root) if root else []
+        try:
+            driver.quit()
+            self.stats["quits"] += 1
+        except Exception as e:
+            self.stats["quit_errors"] += 1
+            print(f"[!] Error closing driver: {e}")
+        if root:
+            self._kill(root, tree)
+            with self._lock:
+                self._tracked.pop(pid, None)
+
+    @staticmethod
+    def _tree(root):
+        try:
+            return [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+
+    def _kill(self, root, tree):
+        """Kill the survivors of a tree and the rest of its process group"""
+        survivors = {proc.pid: proc for proc in tree}
+        if PROCESS_GROUP_KWARGS and root.pid != os.getpgrp():
+            # Orphans whose parent already died are only reachable through the group
+            for proc in psutil.process_iter():
+                try:
+                    if os.getpgid(proc.pid) == root.pid:
+                        survivors.setdefault(proc.pid, proc)
+                except (ProcessLookupError, PermissionError):
+                    continue
+        survivors.pop(os.getpid(), None)
+        # Zombies hold no memory and only wait for their parent to collect them
+        survivors = {pid: proc for pid, proc in survivors.items() if _alive(proc)}
+        if not survivors:
+            return
+
+        reclaimed = 0
+        for proc in survivors.values():
+            try:
+                reclaimed += proc.memory_info().rss
+                proc.terminate()
+            except psutil.NoSuchProcess:
+                pass
+        # Orphans reparented to a non-reaping init stay zombies, so psutil.wait_procs would not see them exit
+        for proc in _wait_gone(survivors.values(), self.kill_grace):
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+        self.stats["killed"] += len(survivors)
+        self.stats["reclaimed_bytes"] += reclaimed
+
+    def reap(self, timeout=None):
+        """
+        Wait for queued quits, then kill everything still tracked
+
+        Args:
+            timeout (float): Seconds to wait for queued quits, defaults to quit_timeout
+
+        Returns:
+            dict: Cumulative stats (quits, quit_errors, killed, reclaimed_bytes)
+        """
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(self.quit_timeout if timeout is None else timeout)
+        with self._lock:
+            tracked = list(self._tracked.values())
+            self._tracked.clear()
+        for root in tracked:
+            self._kill(root, self._tree(root))
+        return dict(self.stats)
+
+    def merge(self, stats):
+        """
+        Add stats reported by another process (e.g. an xdist worker)
+
+        Args:
+            stats (dict): Stats returned by reap()
+        """
+        for name, value in stats.items():
+            self.stats[name] = self.stats.get(name, 0) + value
+
+    def install_signal_handlers(self, signals=(signal.SIGTERM, getattr(signal, "SIGHUP", None))):
+        """
+        Reap before the process dies of a termination signal
+
+        Args:
+            signals (tuple): Signals to handle; must be called from the main thread
+        """
+        for signum in filter(None, signals):
+            previous = signal.getsignal(signum)
+
+            def handler(signum, frame, previous=previous):
+                self.reap(timeout=self.kill_grace)
+                if callable(previous):
+                    previous(signum, frame)
+                else:
+                    signal.signal(signum, previous or signal.SIG_DFL)
+                    os.kill(os.getpid(), signum)
+
+            signal.signal(signum, handler)
+
+
+def get_reaper():
+    """
+    Process-wide reaper, created on first use
+
+    Returns:
+        ProcessReaper: Shared reaper instance
+    """
+    global _reaper
+    if _reaper is None:
+        _reaper = ProcessReaper()
+        if threading.current_thread() is threading.main_thread():
+            _reaper.install_signal_handlers()
+    return _reaper
@@ -3,10 +3,8 @@ Utility functions for taking screenshots
 """
 
 from datetime import datetime
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from config.config import SCREENSHOT_DIR
+from config.config import SCREENSHOT_DIR, ensure_dir
 
 def take_screenshot(driver, test_name):
     """
@@ -21,7 +19,7 @@ def take_screenshot(driver, test_name):
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"{test_name}_{timestamp}.png"
-    filepath = SCREENSHOT_DIR / filename
+    filepath = ensure_dir(SCREENSHOT_DIR) / filename
     
     try:
         driver.save_screenshot(str(filepath))
@@ -47,6 +45,9 @@ def wait_for_element(driver, locator, timeout=10):
     Raises:
         TimeoutException: If element is not found within timeout
     """
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     try:
         element = WebDriverWait(driver, timeout).until(
             EC.presence_of_element_located(locator)
@@ -71,6 +72,9 @@ def wait_for_element_clickable(driver, locator, timeout=10):
     Raises:
         TimeoutException: If element is not clickable within timeout
     """
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     try:
         element = WebDriverWait(driver, timeout).until(
             EC.element_to_be_clickable(locator)
@@ -0,0 +1,145 @@
+"""
+Browserless structural checks against server-rendered HTML
+
+Fetches pages over a pooled HTTP client, parses them with lxml and evaluates
+the page objects' (By, value) locators against the parsed tree. Checks that
+only assert markup structure can run this way at high concurrency; anything
+depending on JavaScript or layout still needs a browser.
+"""
+
+import asyncio
+import time
+
+import aiohttp
+import lxml.etree
+import lxml.html
+
+from config.config import STATIC_CHECK_CONCURRENCY, STATIC_CHECK_TIMEOUT
+from pages.locators import By
+
+
+def find_static_elements(tree, locator):
+    """
+    Evaluate a Selenium locator against a parsed document
+
+    Args:
+        tree: lxml.html element (document root)
+        locator: Element locator tuple (By, value)
+
+    Returns:
+        list: Matching lxml elements
+    """
+    by, value = locator
+    if by == By.XPATH:
+        return tree.xpath(value)
+    if by == By.CSS_SELECTOR:
+        return tree.cssselect(value)
+    if by == By.ID:
+        return tree.xpath("//*[@id=$value]", value=value)
+    if by == By.CLASS_NAME:
+        # Same translation Selenium applies before sending the locator to the browser
+        return tree.cssselect(f".{value}")
+    if by == By.NAME:
+        return tree.xpath("//*[@name=$value]", value=value)
+    if by == By.TAG_NAME:
+        return tree.cssselect(value)
+    if by == By.LINK_TEXT:
+        return tree.xpath("//a[normalize-space(.)=$value]", value=value)
+    if by == By.PARTIAL_LINK_TEXT:
+        return tree.xpath("//a[contains(., $value)]", value=value)
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+class StaticCheckResult:
+    """Outcome of evaluating structural locators against one page"""
+
+    def __init__(self, url):
+        """
+        Initialize the result
+
+        Args:
+            url (str): Page URL
+        """
+        self.url = url
+        self.status = None
+        self.found = {}
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        """True if the page was fetched and every locator matched"""
+        return self.error is None and bool(self.found) and all(self.found.values())
+
+    @property
+    def missing(self):
+        """Names of locators that did not match"""
+        return [name for name, found in self.found.items() if not found]
+
+    def __repr__(self):
+        return f"StaticCheckResult(url={self.url!r}, status={self.status}, missing={self.missing}, error={self.error!r})"
+
+
+class StaticDOMEngine:
+    """Evaluates locator checks against fetched HTML with a shared connection pool"""
+
+    def __init__(self, concurrency=STATIC_CHECK_CONCURRENCY, timeout=STATIC_CHECK_TIMEOUT):
+        """
+        Initialize the engine
+
+        Args:
+            concurrency (int): Maximum number of requests in flight
+            timeout (float): Total timeout per request in seconds
+        """
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    async def _check(self, session, semaphore, url, locators):
+        result = StaticCheckResult(url)
+        started = time.perf_counter()
+        try:
+            async with semaphore:
+                async with session.get(url) as response:
+                    result.status = response.status
+                    body = await response.read()
+            if result.status >= 400:
+                result.error = f"HTTP {result.status}"
+            else:
+                tree = lxml.html.fromstring(body)
+                result.found = {name: bool(find_static_elements(tree, locator)) for name, locator in locators.items()}
+        except (aiohttp.ClientError, asyncio.TimeoutError, lxml.etree.ParserError) as e:
+            result.error = repr(e)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    async def check_many_async(self, checks):
+        """
+        Run several page checks concurrently
+
+        Args:
+            checks (list): (url, {name: locator}) tuples
+
+        Returns:
+            list: StaticCheckResult per check, in input order
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        client_timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+            return await asyncio.gather(*(self._check(session, semaphore, url, locators) for url, locators in checks))
+
+    def check_many(self, checks):
+        """Blocking wrapper around check_many_async"""
+        return asyncio.run(self.check_many_async(checks))
+
+    def check_pages(self, pages):
+        """
+        Check the STRUCTURAL_LOCATORS declared by page object classes
+
+        Args:
+            pages (list): (page object class, url) tuples
+
+        Returns:
+            list: StaticCheckResult per page, in input order
+        """
+        return self.check_many([(url, page_class.STRUCTURAL_LOCATORS) for page_class, url in pages])
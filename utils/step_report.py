@@ -0,0 +1,70 @@
+"""
+Terminal summaries of the per-step properties attached to test reports
+
+Kept free of Selenium imports so conftest can register them without loading
+the driver stack.
+"""
+
+from statistics import median
+
+
+class StepTimingReport:
+    """Pytest plugin summarising "step_timings" test properties per profile"""
+
+    def __init__(self):
+        self.timings = {}
+        self.unthrottled = set()
+
+    def pytest_runtest_logreport(self, report):
+        """Collect step timings attached by the call phase"""
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == "step_timings":
+                steps = self.timings.setdefault(value["profile"], {})
+                for step, ms in value["steps"].items():
+                    steps.setdefault(step, []).append(ms)
+                self.unthrottled.update((value["profile"], step) for step in value.get("unthrottled", ()))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Print median step latency per profile"""
+        if not self.timings:
+            return
+        steps = list(dict.fromkeys(step for profile in self.timings.values() for step in profile))
+        terminalreporter.write_sep("-", "step timings per emulation profile (median ms)")
+        terminalreporter.write_line(f"{'profile':<16}" + "".join(f"{step:>20}" for step in steps))
+        for profile, samples in self.timings.items():
+            cells = "".join(self._cell(profile, step, samples) for step in steps)
+            terminalreporter.write_line(f"{profile:<16}{cells}")
+        if self.unthrottled:
+            terminalreporter.write_line("* measured in a window the page opened, which loaded without the profile")
+
+    def _cell(self, profile, step, samples):
+        if step not in samples:
+            return f"{'-':>20}"
+        flag = "*" if (profile, step) in self.unthrottled else ""
+        return f"{median(samples[step]):.0f}{flag}".rjust(20)
+
+
+class StepRetryReport:
+    """Pytest plugin listing steps that needed retries"""
+
+    def __init__(self):
+        self.flaky = []
+
+    def pytest_runtest_logreport(self, report):
+        """Collect "step_retries" properties attached by the call phase"""
+        if report.when != "call":
+            return
+        for name, value in report.user_properties:
+            if name == "step_retries":
+                self.flaky.extend((report.nodeid, step, stats) for step, stats in value.items() if stats["retries"])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Print retried steps so flaky ones become visible"""
+        if not self.flaky:
+            return
+        terminalreporter.write_sep("-", "retried steps")
+        for nodeid, step, stats in self.flaky:
+            outcome = "passed" if stats["passed"] else "failed"
+            terminalreporter.write_line(f"{nodeid} :: {step}: {stats['retries']} retries, {outcome}")
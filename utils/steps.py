@@ -0,0 +1,132 @@
+"""
+Checkpointed flow steps with retries that resume from the failed step
+
+A StepFlow runs the steps of a page object flow one by one on the same driver,
+recording a checkpoint (URL and open windows) before each. When a step fails
+with a transient error it is retried from its checkpoint instead of rerunning
+the whole test: windows it opened are closed and, if the page itself changed,
+the checkpoint URL is reloaded and only the steps taken on that page are
+replayed. Steps must therefore be idempotent and resolve their own elements.
+"""
+
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from config.config import STEP_RETRY_BUDGET, STEP_RETRY_DELAY
+from pages.base_page import BasePage
+
+
+class StepFailed(Exception):
+    """A flow step completed but its verification failed"""
+
+
+# Failures worth retrying; anything else is a bug in the test and fails at once
+RETRYABLE_ERRORS = (StepFailed, WebDriverException)
+
+
+class Checkpoint:
+    """Browser state a step starts from"""
+
+    def __init__(self, driver):
+        """
+        Capture the current window and URL
+
+        Args:
+            driver: WebDriver instance
+        """
+        self.handle = driver.current_window_handle
+        self.handles = set(driver.window_handles)
+        self.url = driver.current_url
+
+
+class StepFlow:
+    """Runs named steps on one driver with a shared retry budget"""
+
+    def __init__(self, driver, retry_budget=STEP_RETRY_BUDGET, retry_delay=STEP_RETRY_DELAY):
+        """
+        Initialize the flow
+
+        Args:
+            driver: WebDriver instance
+            retry_budget (int): Retries allowed across all steps of the flow
+            retry_delay (float): Seconds to wait before a retry
+        """
+        self.driver = driver
+        self.retry_budget = retry_budget
+        self.retry_delay = retry_delay
+        self.history = []
+        self.stats = {}
+
+    def run(self, name, action, check=None, message=None):
+        """
+        Run a step, retrying it from its checkpoint on transient failures
+
+        Args:
+            name (str): Step name used in reports
+            action: Callable performing the step, its return value is returned
+            check: Optional callable receiving the result, falsy means the step failed
+            message (str): Failure message when the check does not pass
+
+        Returns:
+            Result of the action
+
+        Raises:
+            StepFailed: If the check still fails once the retry budget is spent
+        """
+        step = (name, action, check, message or f"{name} failed")
+        self.stats.setdefault(name, {"attempts": 0, "retries": 0, "passed": False})
+        self.history.append((step, Checkpoint(self.driver)))
+        retrying = False
+        while True:
+            try:
+                if retrying:
+                    self._restore(len(self.history) - 1)
+                result = self._attempt(step)
+                self.stats[name]["passed"] = True
+                return result
+            except RETRYABLE_ERRORS as e:
+                if self.retry_budget <= 0:
+                    raise
+                self.retry_budget -= 1
+                self.stats[name]["retries"] += 1
+                print(f"[!] Step {name} failed ({e}), retrying from checkpoint")
+                time.sleep(self.retry_delay)
+                retrying = True
+
+    def _attempt(self, step):
+        name, action, check, message = step
+        self.stats[name]["attempts"] += 1
+        result = action()
+        if check is not None and not check(result):
+            raise StepFailed(message)
+        return result
+
+    def _restore(self, index):
+        """Return to the checkpoint of history[index], replaying same-page steps if the page was lost"""
+        checkpoint = self.history[index][1]
+        for handle in set(self.driver.window_handles) - checkpoint.handles:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        # Through BasePage so cached elements are dropped and emulation follows the window
+        BasePage(self.driver).switch_to_window(checkpoint.handle)
+        if self.driver.current_url == checkpoint.url:
+            return
+
+        # Client-side state built by earlier steps on this page is gone with the reload
+        first = index
+        while first > 0 and self.history[first - 1][1].url == checkpoint.url:
+            first -= 1
+        BasePage(self.driver).open(checkpoint.url)
+        for step, _ in self.history[first:index]:
+            self._attempt(step)
+
+    def report(self):
+        """
+        Per-step attempt and retry counts
+
+        Returns:
+            dict: Step name -> {"attempts", "retries", "passed"}
+        """
+        return {name: dict(stats) for name, stats in self.stats.items()}
+
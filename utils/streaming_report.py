@@ -0,0 +1,211 @@
+"""
+Streaming JSON Lines test reporting for long soak runs
+
+Each test report is appended to a JSON Lines file as soon as it is produced,
+with screenshots and other artifacts referenced by path. HTML reports and
+cross-run aggregates are rendered later by reading the streams line by line,
+so memory stays flat no matter how many iterations were recorded.
+
+Usage:
+    pytest --jsonl-report=reports/results.jsonl
+    python -m utils.streaming_report render reports/*.jsonl -o reports/report.html
+    python -m utils.streaming_report summary reports/*.jsonl
+"""
+
+import argparse
+import html
+import json
+import os
+import time
+import uuid
+
+from config.config import STREAM_REPORT_MAX_LONGREPR
+from utils.histogram import LatencyHistogram
+
+ARTIFACT_PROPERTIES = ("screenshot", "trace")
+
+
+class StreamingReporter:
+    """Pytest plugin appending one JSON line per test report"""
+
+    def __init__(self, path, run_id=None):
+        """
+        Initialize the reporter
+
+        Args:
+            path (str): JSON Lines file to append to
+            run_id (str): Identifier shared by all records of this session
+        """
+        self.path = path
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", buffering=1, encoding="utf-8")
+
+    def pytest_runtest_logreport(self, report):
+        """Write the call phase of every test, plus setup/teardown when they did not pass"""
+        if report.when != "call" and report.passed:
+            return
+        properties = dict(report.user_properties)
+        record = {
+            "run_id": self.run_id,
+            "nodeid": report.nodeid,
+            "when": report.when,
+            "outcome": report.outcome,
+            "duration": round(report.duration, 3),
+            "timestamp": time.time(),
+            "artifacts": {name: properties.pop(name) for name in ARTIFACT_PROPERTIES if name in properties},
+            "properties": properties,
+        }
+        if report.failed and report.longrepr:
+            record["longrepr"] = str(report.longrepr)[-STREAM_REPORT_MAX_LONGREPR:]
+        self._file.write(json.dumps(record, default=str) + "\n")
+
+    def pytest_sessionfinish(self, session):
+        """Close the stream"""
+        self._file.close()
+
+
+def read_records(paths):
+    """
+    Iterate over records in one or more JSON Lines files
+
+    Args:
+        paths (list): Stream file paths
+
+    Yields:
+        dict: One record at a time; truncated trailing lines are skipped
+    """
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+class ResultAggregate:
+    """Running outcome counts and duration histogram for one test"""
+
+    def __init__(self):
+        self.outcomes = {"passed": 0, "failed": 0, "skipped": 0}
+        self.durations = LatencyHistogram()
+        self._last_outcome = None
+
+    def add(self, record):
+        """Fold a record into the aggregate, counting one run per test execution"""
+        if record["when"] == "teardown" and self._last_outcome is not None:
+            # The execution was already counted from its call or failed setup, a broken teardown only fails it
+            if self._last_outcome != "failed":
+                self.outcomes[self._last_outcome] -= 1
+                self.outcomes["failed"] += 1
+                self._last_outcome = "failed"
+            return
+        self.outcomes[record["outcome"]] = self.outcomes.get(record["outcome"], 0) + 1
+        self._last_outcome = record["outcome"]
+        if record["when"] == "call":
+            self.durations.record(record["duration"] * 1000)
+
+    @property
+    def runs(self):
+        """Number of test executions folded in"""
+        return sum(self.outcomes.values())
+
+
+def aggregate(paths):
+    """
+    Aggregate outcomes and durations per test across streams
+
+    Memory grows with the number of distinct tests, not with iterations.
+
+    Args:
+        paths (list): Stream file paths
+
+    Returns:
+        tuple: (dict nodeid -> ResultAggregate, set of run ids)
+    """
+    tests = {}
+    run_ids = set()
+    for record in read_records(paths):
+        run_ids.add(record.get("run_id"))
+        tests.setdefault(record["nodeid"], ResultAggregate()).add(record)
+    return tests, run_ids
+
+
+def _format_ms(value):
+    return "-" if value is None else f"{value / 1000:.2f}s"
+
+
+def render_html(paths, output, failures_only=False):
+    """
+    Render an HTML report from streams, writing rows as they are read
+
+    Args:
+        paths (list): Stream file paths
+        output (str): HTML file to write
+        failures_only (bool): Only list records that did not pass
+    """
+    tests, run_ids = aggregate(paths)
+    base_dir = os.path.dirname(os.path.abspath(output))
+    with open(output, "w", encoding="utf-8") as out:
+        out.write("<!DOCTYPE html><html><head><meta charset='utf-8'><title>Insider Test Report</title>"
+                  "<style>body{font-family:sans-serif}table{border-collapse:collapse}"
+                  "td,th{border:1px solid #ccc;padding:4px 8px;text-align:left}"
+                  ".passed{color:#2a7}.failed{color:#c33}.skipped{color:#a80}pre{white-space:pre-wrap}</style>"
+                  "</head><body><h1>Insider Test Report</h1>")
+        out.write(f"<p>{len(run_ids)} run(s), {sum(t.runs for t in tests.values())} result(s)</p>")
+
+        out.write("<h2>Summary</h2><table><tr><th>Test</th><th>Runs</th><th>Passed</th><th>Failed</th>"
+                  "<th>Skipped</th><th>p50</th><th>p95</th><th>Max</th></tr>")
+        for nodeid, test in sorted(tests.items()):
+            out.write(f"<tr><td>{html.escape(nodeid)}</td><td>{test.runs}</td>"
+                      f"<td class='passed'>{test.outcomes['passed']}</td>"
+                      f"<td class='failed'>{test.outcomes['failed']}</td>"
+                      f"<td class='skipped'>{test.outcomes['skipped']}</td>"
+                      f"<td>{_format_ms(test.durations.percentile(50))}</td>"
+                      f"<td>{_format_ms(test.durations.percentile(95))}</td>"
+                      f"<td>{_format_ms(test.durations.percentile(100))}</td></tr>")
+        out.write("</table>")
+
+        out.write("<h2>Results</h2><table><tr><th>Time</th><th>Run</th><th>Test</th><th>Phase</th>"
+                  "<th>Outcome</th><th>Duration</th><th>Details</th></tr>")
+        for record in read_records(paths):
+            if failures_only and record["outcome"] == "passed":
+                continue
+            details = "".join(
+                f"<a href='{html.escape(os.path.relpath(os.path.abspath(path), base_dir))}'>{html.escape(name)}</a> "
+                for name, path in record.get("artifacts", {}).items())
+            if record.get("longrepr"):
+                details += f"<details><summary>traceback</summary><pre>{html.escape(record['longrepr'])}</pre></details>"
+            out.write(f"<tr><td>{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record['timestamp']))}</td>"
+                      f"<td>{html.escape(str(record.get('run_id')))}</td><td>{html.escape(record['nodeid'])}</td>"
+                      f"<td>{record['when']}</td><td class='{record['outcome']}'>{record['outcome']}</td>"
+                      f"<td>{record['duration']:.2f}s</td><td>{details}</td></tr>\n")
+        out.write("</table></body></html>\n")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Render or summarize streamed test results")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    render = subparsers.add_parser("render", help="Render an HTML report")
+    render.add_argument("streams", nargs="+", help="JSON Lines result files")
+    render.add_argument("-o", "--output", default="reports/report.html", help="HTML file to write")
+    render.add_argument("--failures-only", action="store_true", help="Only list results that did not pass")
+    summary = subparsers.add_parser("summary", help="Print per-test aggregates")
+    summary.add_argument("streams", nargs="+", help="JSON Lines result files")
+    args = parser.parse_args(argv)
+
+    if args.command == "render":
+        render_html(args.streams, args.output, args.failures_only)
+        print(f"Report written: {args.output}")
+    else:
+        tests, run_ids = aggregate(args.streams)
+        print(f"{len(run_ids)} run(s)")
+        for nodeid, test in sorted(tests.items()):
+            print(f"{nodeid}: {test.runs} runs, {test.outcomes['failed']} failed, "
+                  f"p95 {_format_ms(test.durations.percentile(95))}")
+
+
+if __name__ == "__main__":
+    main()
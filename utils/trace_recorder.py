@@ -0,0 +1,258 @@
+"""
+Always-on trace ring buffer written to disk only for failed tests
+
+Keeps the driver's recent command log, console messages, network events and
+low frame rate screenshots in fixed-size in-memory buffers. Nothing touches
+the disk until dump() is called, which writes a compressed zip holding
+trace.json and the JPEG frames.
+
+The CDP backend streams frames with Page.startScreencast, throttled at the
+source: Chrome only encodes every Nth frame and sends the next one once the
+previous is acked, and acks are held back until a frame is due. chromedriver cannot
+deliver DevTools events and runs one command per session at a time, so on the
+WebDriver backend everything happens on the test thread: logs are drained when
+a navigation leaves a page and when the trace is dumped, and dump() captures the
+frame at the moment of failure. Frames after every page-changing command cost a
+screenshot round trip each and are opt-in (TRACE_WEBDRIVER_FRAMES).
+"""
+
+import asyncio
+import base64
+import json
+import re
+import time
+import zipfile
+from collections import deque
+
+from config.config import (
+    TRACE_BUFFER_SIZE, TRACE_MAX_FRAMES, TRACE_FPS, TRACE_FRAME_QUALITY, TRACE_DIR, TRACE_WEBDRIVER_FRAMES,
+    ensure_dir
+)
+from utils.performance_metrics import get_log_tap
+
+NETWORK_EVENTS = ("Network.requestWillBeSent", "Network.responseReceived", "Network.loadingFailed",
+                  "Page.frameNavigated", "Page.loadEventFired")
+# Log polling and frame acks done by the recorders themselves are left out of the command log
+UNTRACED_COMMANDS = ("getLog", "Page.screencastFrameAck")
+# Chrome's compositor frame rate, which Page.startScreencast's everyNthFrame counts in
+COMPOSITOR_FPS = 60
+# WebDriver commands that change what the page shows, followed by a frame when WebDriver frames are on
+FRAME_COMMANDS = ("get", "clickElement", "sendKeysToElement", "actions", "goBack", "goForward", "refresh",
+                  "switchToWindow")
+MAX_PARAMS_CHARS = 300
+MAX_MESSAGE_CHARS = 1000
+
+
+class TraceRecorder:
+    """Ring buffers of commands, console/network events and screencast frames for one driver"""
+
+    def __init__(self, driver, size=TRACE_BUFFER_SIZE, max_frames=TRACE_MAX_FRAMES, fps=TRACE_FPS,
+                 quality=TRACE_FRAME_QUALITY, webdriver_frames=TRACE_WEBDRIVER_FRAMES):
+        """
+        Initialize the recorder
+
+        Args:
+            driver: WebDriver or CDPDriver instance
+            size (int): Maximum number of command and event entries kept
+            max_frames (int): Maximum number of frames kept
+            fps (float): Frames captured per second at most
+            quality (int): JPEG quality of captured frames (0-100)
+            webdriver_frames (bool): Capture a frame after page-changing WebDriver commands
+        """
+        self.driver = driver
+        self.entries = deque(maxlen=size)
+        self.frames = deque(maxlen=max_frames)
+        self.fps = fps
+        self.interval = 1 / fps
+        self.quality = quality
+        self.webdriver_frames = webdriver_frames
+        self.stopped = False
+        self._last_frame = 0.0
+        self._untraced_execute = None
+
+    def start(self):
+        """Hook the command path and the log tap, and start capturing frames"""
+        get_log_tap(self.driver).subscribe(self._on_log)
+        if hasattr(self.driver, "add_event_listener"):
+            self._wrap_protocol()
+            self.driver.add_event_listener(self._on_event)
+            self.driver.execute_cdp_cmd("Page.startScreencast", {
+                "format": "jpeg", "quality": self.quality, "maxWidth": 960, "maxHeight": 540,
+                "everyNthFrame": max(1, round(COMPOSITOR_FPS / self.fps)),
+            })
+        else:
+            self._wrap_execute()
+        return self
+
+    def stop(self):
+        """Stop capturing frames"""
+        self.stopped = True
+
+    def _command(self, name, params, started, error):
+        self.entries.append({
+            "t": started,
+            "kind": "command",
+            "name": name,
+            "params": json.dumps(params, default=str)[:MAX_PARAMS_CHARS] if params else None,
+            "ms": round((time.time() - started) * 1000, 1),
+            "error": repr(error)[:MAX_MESSAGE_CHARS] if error else None,
+        })
+
+    def _wrap_execute(self):
+        """Record every WebDriver command sent over HTTP"""
+        execute = self.driver.execute
+
+        def traced_execute(driver_command, params=None):
+            if driver_command == "quit":
+                self.stop()
+            elif driver_command == "get":
+                # Keeps chromedriver's log buffers short, one drain per page
+                self.flush()
+            started = time.time()
+            error = None
+            try:
+                return execute(driver_command, params)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                if driver_command not in UNTRACED_COMMANDS:
+                    self._command(driver_command, params, started, error)
+                if self.webdriver_frames and driver_command in FRAME_COMMANDS and error is None:
+                    self._capture_frame()
+
+        self.driver.execute = traced_execute
+        self._untraced_execute = execute
+
+    def _wrap_protocol(self):
+        """Record every DevTools command the CDP backend sends, awaited or pipelined"""
+        connection = self.driver.connection
+        send_nowait = connection.send_nowait
+
+        # send() and pipeline() both go through send_nowait(), so each command is recorded once
+        def traced_send_nowait(method, params=None, session_id=None):
+            started = time.time()
+            future = send_nowait(method, params, session_id)
+            if method not in UNTRACED_COMMANDS:
+                future.add_done_callback(lambda done: self._command(
+                    method, params, started, None if done.cancelled() else done.exception()))
+            return future
+
+        connection.send_nowait = traced_send_nowait
+
+    def _on_log(self, log_type, entries):
+        """Keep console messages and the network/page events of drained log batches"""
+        for entry in entries:
+            if log_type == "browser":
+                self.entries.append({"t": entry["timestamp"] / 1000, "kind": "console", "level": entry["level"],
+                                     "message": entry["message"][:MAX_MESSAGE_CHARS]})
+                continue
+            message = json.loads(entry["message"])["message"]
+            if message["method"] in NETWORK_EVENTS:
+                self.entries.append(self._network_entry(entry["timestamp"] / 1000, message["method"],
+                                                        message["params"]))
+
+    @staticmethod
+    def _network_entry(timestamp, method, params):
+        response = params.get("response", {})
+        url = params.get("request", {}).get("url") or response.get("url") or params.get("frame", {}).get("url")
+        return {
+            "t": timestamp,
+            "kind": "network",
+            "method": method,
+            "request_id": params.get("requestId"),
+            "url": url[:MAX_PARAMS_CHARS] if url else None,
+            "status": response.get("status"),
+            "error": params.get("errorText"),
+        }
+
+    def _add_frame(self, data, force=False):
+        now = time.time()
+        if not force and now - self._last_frame < self.interval:
+            return
+        self._last_frame = now
+        self.frames.append((now, data))
+
+    def _on_event(self, method, params, session_id):
+        """Screencast frames from the CDP backend, acked once the next frame is due"""
+        if method != "Page.screencastFrame":
+            return
+        self._add_frame(params["data"])
+        delay = max(0.0, self._last_frame + self.interval - time.time())
+        asyncio.get_running_loop().call_later(delay, self._ack_frame, params["sessionId"], session_id)
+
+    def _ack_frame(self, frame_session, session_id):
+        ack = self.driver.connection.send_nowait("Page.screencastFrameAck", {"sessionId": frame_session}, session_id)
+        ack.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+    def _capture_frame(self, force=False):
+        """Screenshot for chromedriver, which cannot stream screencast events, taken on the calling thread"""
+        if self._untraced_execute is None or self.stopped:
+            return
+        if not force and time.time() - self._last_frame < self.interval:
+            return
+        try:
+            result = self._untraced_execute("executeCdpCommand", {
+                "cmd": "Page.captureScreenshot", "params": {"format": "jpeg", "quality": self.quality},
+            })
+        except Exception:
+            # Window closing or navigation in progress, the trace goes without this frame
+            return
+        self._add_frame(result["value"]["data"], force)
+
+    def flush(self):
+        """Pull the log entries still buffered by the driver into the ring buffer"""
+        tap = get_log_tap(self.driver)
+        for log_type in ("performance", "browser"):
+            try:
+                tap.drain(log_type)
+            except Exception:
+                pass
+
+    def dump(self, name):
+        """
+        Write the buffers to a compressed trace file
+
+        Args:
+            name (str): Test name used in the file name
+
+        Returns:
+            str: Path of the trace zip
+        """
+        self.flush()
+        self._capture_frame(force=True)
+        safe_name = re.sub(r"[^\w.-]", "_", name)
+        path = ensure_dir(TRACE_DIR) / f"{safe_name}_{time.strftime('%Y%m%d_%H%M%S')}.zip"
+        frames = list(self.frames)
+        trace = {
+            "entries": sorted(self.entries, key=lambda entry: entry["t"]),
+            "frames": [{"t": t, "file": f"frames/{index:04d}.jpg"} for index, (t, _) in enumerate(frames)],
+        }
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("trace.json", json.dumps(trace, indent=1))
+            for index, (_, data) in enumerate(frames):
+                # JPEG does not compress further
+                archive.writestr(f"frames/{index:04d}.jpg", base64.b64decode(data), compress_type=zipfile.ZIP_STORED)
+        return str(path)
+
+
+def attach_tracer(driver):
+    """
+    Start tracing a driver
+
+    Returns:
+        TraceRecorder: Recorder bound to the driver
+    """
+    tracer = TraceRecorder(driver).start()
+    driver.trace_recorder = tracer
+    return tracer
+
+
+def get_tracer(driver):
+    """
+    Get the trace recorder attached to a driver
+
+    Returns:
+        TraceRecorder: Attached recorder, or None if tracing is not enabled
+    """
+    return getattr(driver, "trace_recorder", None)